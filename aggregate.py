@@ -0,0 +1,181 @@
+"""
+Aggregate Module - Columnar payroll aggregation for weekly/monthly reports
+"""
+import numpy as np
+from datetime import date
+from operator import attrgetter
+from timelog_store import TimeLogTable
+
+DAILY_BREAKDOWN_HEADER = ['Employee ID', 'Employee Name', 'Date', 'Shifts',
+                          'Hours Worked', 'ETC']
+EMPLOYEE_STATS_HEADER = ['Employee ID', 'Employee Name', 'Shifts', 'Average Hours',
+                         'Median Hours', 'P90 Hours', 'Max Hours', 'Average ETC']
+SHOP_SUMMARY_HEADER = ['Shop', 'Employees', 'Shifts', 'Total Hours', 'Total ETC',
+                       'Average Hours per Shift']
+
+
+class PayrollAggregator:
+    """Time logs loaded into NumPy columns for group-by aggregation
+    
+    Columns: employee index, day number, seconds worked, hourly rate and
+    ETC. Group sums use np.bincount (per employee) and np.add.reduceat over
+    rows sorted by (employee, day).
+    
+    Pass a TimeLogTable (as history() returns): its columns are copied
+    straight into NumPy. Other iterables of TimeLogs are accepted for
+    sources such as CSV rows, but reading every object's attributes costs
+    more than the plain per-log loop does for one aggregate, so that path
+    only pays off when several reports share one load.
+    """
+    
+    def __init__(self, time_logs):
+        if isinstance(time_logs, TimeLogTable):
+            self._load_table(time_logs)
+            return
+        
+        time_logs = list(time_logs)
+        count = len(time_logs)
+        
+        # Intern employee IDs so each one gets a dense index
+        positions = {}
+        emp_index = [positions.setdefault(emp_id, len(positions))
+                     for emp_id in map(attrgetter('emp_id'), time_logs)]
+        self.emp_ids = list(positions)
+        names = {}
+        for log in time_logs:
+            names.setdefault(log.emp_id, log.emp_name)
+            if len(names) == len(positions):
+                break
+        self.emp_names = [names[emp_id] for emp_id in self.emp_ids]
+        
+        self.emp_index = np.fromiter(emp_index, np.int32, count)
+        self.day = np.fromiter(map(attrgetter('day'), time_logs), np.int64, count)
+        self.seconds = np.fromiter(map(attrgetter('hours_worked'), time_logs), np.float64, count) * 3600
+        self.rate = np.fromiter(map(attrgetter('hourly_rate'), time_logs), np.float64, count)
+        self.etc = np.fromiter(map(attrgetter('etc'), time_logs), np.float64, count)
+    
+    @classmethod
+    def from_columns(cls, person, people, day, seconds, rate, etc):
+        """Build from NumPy columns; `person` indexes (emp_id, emp_name) pairs in `people`"""
+        aggregator = cls.__new__(cls)
+        aggregator._index_people(person, people)
+        aggregator.day = day
+        aggregator.seconds = seconds
+        aggregator.rate = rate
+        aggregator.etc = etc
+        return aggregator
+    
+    def _load_table(self, table):
+        """Copy columns straight out of a TimeLogTable's arrays"""
+        self._index_people(self._column(table.person), table.people)
+        self.day = self._column(table.day).astype(np.int64)
+        self.seconds = self._column(table.hours_worked) * 3600
+        self.rate = self._column(table.hourly_rate).copy()
+        self.etc = self._column(table.etc).copy()
+    
+    def _index_people(self, person, people):
+        """Map person indexes to dense employee indexes (one per employee ID)"""
+        positions = {}
+        self.emp_names = []
+        person_emp = np.zeros(len(people), dtype=np.int32)
+        for p in np.unique(person).tolist():
+            emp_id, emp_name = people[p]
+            if emp_id not in positions:
+                positions[emp_id] = len(positions)
+                self.emp_names.append(emp_name)
+            person_emp[p] = positions[emp_id]
+        
+        self.emp_ids = list(positions)
+        self.emp_index = person_emp[person]
+    
+    @staticmethod
+    def _column(values):
+        """NumPy view of an array.array column"""
+        return np.frombuffer(values, dtype=np.dtype(values.typecode)) if len(values) else \
+            np.empty(0, dtype=np.dtype(values.typecode))
+    
+    def __len__(self):
+        return len(self.emp_index)
+    
+    def employee_totals(self):
+        """Return {emp_id: {'name', 'total_hours', 'total_etc', 'days_worked'}}"""
+        size = len(self.emp_ids)
+        hours = np.bincount(self.emp_index, weights=self.seconds, minlength=size) / 3600
+        etc = np.bincount(self.emp_index, weights=self.etc, minlength=size)
+        shifts = np.bincount(self.emp_index, minlength=size)
+        
+        return {emp_id: {'name': self.emp_names[i],
+                         'total_hours': float(hours[i]),
+                         'total_etc': float(etc[i]),
+                         'days_worked': int(shifts[i])}
+                for i, emp_id in enumerate(self.emp_ids)}
+    
+    def daily_breakdown_rows(self):
+        """Per-employee, per-day shift count, hours and ETC"""
+        if not len(self):
+            return []
+        order = np.lexsort((self.day, self.emp_index))
+        emp_sorted = self.emp_index[order]
+        day_sorted = self.day[order]
+        
+        starts = self._group_starts(emp_sorted, day_sorted)
+        hours = np.round(np.add.reduceat(self.seconds[order], starts) / 3600, 2)
+        etc = np.round(np.add.reduceat(self.etc[order], starts), 2)
+        shifts = np.diff(np.append(starts, len(order)))
+        
+        day_labels = {day: date.fromordinal(day).isoformat()
+                      for day in np.unique(day_sorted).tolist()}
+        return [[self.emp_ids[emp], self.emp_names[emp], day_labels[day], count, hour, pay]
+                for emp, day, count, hour, pay in zip(emp_sorted[starts].tolist(),
+                                                      day_sorted[starts].tolist(),
+                                                      shifts.tolist(), hours.tolist(),
+                                                      etc.tolist())]
+    
+    def employee_stats_rows(self):
+        """Per-employee shift-length averages and percentiles"""
+        if not len(self):
+            return []
+        hours = self.seconds / 3600
+        order = np.lexsort((hours, self.emp_index))
+        emp_sorted = self.emp_index[order]
+        hours_sorted = hours[order]
+        
+        starts = self._group_starts(emp_sorted)
+        counts = np.diff(np.append(starts, len(order)))
+        average = np.add.reduceat(hours_sorted, starts) / counts
+        average_etc = np.add.reduceat(self.etc[order], starts) / counts
+        median = self._sorted_percentile(hours_sorted, starts, counts, 50)
+        p90 = self._sorted_percentile(hours_sorted, starts, counts, 90)
+        maximum = hours_sorted[starts + counts - 1]
+        
+        columns = [np.round(column, 2).tolist()
+                   for column in (average, median, p90, maximum, average_etc)]
+        return [[self.emp_ids[emp], self.emp_names[emp], count, *values]
+                for emp, count, *values in zip(emp_sorted[starts].tolist(),
+                                               counts.tolist(), *columns)]
+    
+    def shop_rows(self, shop="Coffee Shop"):
+        """Single rollup row for the whole shop"""
+        shifts = len(self)
+        total_hours = float(self.seconds.sum()) / 3600
+        return [[shop, len(self.emp_ids), shifts, round(total_hours, 2),
+                 round(float(self.etc.sum()), 2),
+                 round(total_hours / shifts, 2) if shifts else 0.0]]
+    
+    @staticmethod
+    def _sorted_percentile(values, starts, counts, percentile):
+        """Linear-interpolated percentile of each sorted group, like np.percentile"""
+        position = (counts - 1) * (percentile / 100)
+        lower = np.floor(position).astype(np.int64)
+        upper = np.minimum(lower + 1, counts - 1)
+        low_values = values[starts + lower]
+        return low_values + (values[starts + upper] - low_values) * (position - lower)
+    
+    @staticmethod
+    def _group_starts(*sorted_keys):
+        """Indices where any of the (already sorted) key columns changes value"""
+        changed = np.zeros(len(sorted_keys[0]), dtype=bool)
+        changed[0] = True
+        for key in sorted_keys:
+            changed[1:] |= key[1:] != key[:-1]
+        return np.flatnonzero(changed)
\ No newline at end of file
@@ -5,10 +5,22 @@ Coffee Shop Timekeeping and Payroll System
 To run: python app.py
 """
 
-from gui_app import TimekeepingGUI
+import argparse
+import metrics
+import sessions
+from gui_app import TimekeepingGUI, default_manager
 
 def main():
     """Main function to start the application"""
+    parser = argparse.ArgumentParser(description="Coffee Shop Timekeeping & Payroll System")
+    parser.add_argument('--server', help="punch service URL, e.g. http://127.0.0.1:8765")
+    parser.add_argument('--change-feed', metavar='FILE',
+                        help="publish punches and employee adds to this change log")
+    sessions.add_session_arguments(parser)
+    metrics.add_arguments(parser)
+    args = parser.parse_args()
+    registry, exporters = metrics.start_exporters(args)
+    
     print("=" * 50)
     print("Coffee Shop Timekeeping & Payroll System")
     print("=" * 50)
@@ -18,8 +30,23 @@ def main():
     print("\nNote: Add employees through Admin Panel first")
     print("=" * 50)
     
-    app = TimekeepingGUI()
+    change_feed = None
+    if args.server:
+        from client import ServiceClient
+        print(f"Using punch service at {args.server}")
+        app = TimekeepingGUI(ServiceClient(args.server), metrics=registry)
+    else:
+        manager = default_manager()
+        if args.change_feed:
+            from changes import ChangeFeed
+            change_feed = ChangeFeed(args.change_feed).attach(manager)
+        app = TimekeepingGUI(manager, metrics=registry,
+                             scheduler=sessions.session_scheduler(manager, args))
     app.run()
+    if change_feed is not None:
+        change_feed.close()
+    for exporter in exporters:
+        exporter.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
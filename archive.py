@@ -0,0 +1,222 @@
+"""
+Archive Module - Fixed-width binary archive of closed time logs, read through mmap
+
+To build: python archive.py --db payroll.db
+          python archive.py --csv daily_report.csv
+          python archive.py --reports reports
+"""
+import argparse
+import json
+import os
+from datetime import date, datetime, time
+import numpy as np
+from aggregate import PayrollAggregator
+from timelog import TimeLog
+from timelog_store import date_key
+
+ARCHIVE_MAGIC = b'TLARCH01'
+# One record per closed time log, little-endian and packed: 28 bytes
+ARCHIVE_DTYPE = np.dtype([('time_in', '<i8'), ('time_out', '<i8'),
+                          ('emp', '<i4'), ('rate', '<f8')])
+
+
+def midnight(day):
+    """Epoch seconds of local midnight starting a day number"""
+    return int(datetime.combine(date.fromordinal(day), time.min).timestamp())
+
+
+class TimeLogArchive:
+    """Append-only binary archive of closed time logs, ordered by time in
+    
+    Records hold epoch time in/out (int64), an index into the people side
+    file (int32) and the hourly rate (float64); hours and ETC are derived
+    from them exactly, with no string parsing. `<path>.people.json` lists
+    the (emp_id, emp_name) pair for each index. Reads memory-map the file,
+    and a date range is found by binary search on time in, so range scans
+    are zero-copy views.
+    """
+    
+    def __init__(self, path="timelogs.archive"):
+        self.path = path
+        self.people_path = path + ".people.json"
+        self.people = []
+        self._person_index = {}
+        if os.path.isfile(self.people_path):
+            with open(self.people_path, 'r', encoding='utf-8') as f:
+                self.people = [tuple(pair) for pair in json.load(f)]
+            self._person_index = {pair: i for i, pair in enumerate(self.people)}
+    
+    def __len__(self):
+        if not os.path.isfile(self.path):
+            return 0
+        return (os.path.getsize(self.path) - len(ARCHIVE_MAGIC)) // ARCHIVE_DTYPE.itemsize
+    
+    def append(self, time_logs):
+        """Add closed time logs, keeping the archive in time-in order
+        
+        Logs that start before the archive ends (a shift that closed after a
+        later one started) are merged into the tail, which is rewritten from
+        the first record after them.
+        """
+        time_logs = sorted(time_logs, key=lambda log: log.time_in_ts)
+        if not time_logs:
+            return 0
+        
+        existing = self.records()
+        start = len(existing)
+        if start and time_logs[0].time_in_ts < existing['time_in'][-1]:
+            start = int(np.searchsorted(existing['time_in'], time_logs[0].time_in_ts, 'right'))
+        tail = np.array(existing[start:])
+        
+        people_count = len(self.people)
+        records = np.empty(len(time_logs), dtype=ARCHIVE_DTYPE)
+        records['time_in'] = [log.time_in_ts for log in time_logs]
+        records['time_out'] = [log.time_out_ts for log in time_logs]
+        records['emp'] = [self._person(log.emp_id, log.emp_name) for log in time_logs]
+        records['rate'] = [log.hourly_rate for log in time_logs]
+        del existing  # Release the map before changing the file
+        count = len(records)
+        if len(tail):
+            records = np.concatenate([tail, records])
+            records = records[np.argsort(records['time_in'], kind='stable')]
+        
+        if len(self.people) != people_count:
+            self._save_people()
+        if not os.path.isfile(self.path):
+            with open(self.path, 'wb') as f:
+                f.write(ARCHIVE_MAGIC)
+        with open(self.path, 'r+b') as f:
+            f.seek(len(ARCHIVE_MAGIC) + start * ARCHIVE_DTYPE.itemsize)
+            f.write(records.tobytes())
+        return count
+    
+    def contains(self, time_logs):
+        """Whether each time log (by employee and time in) is already archived"""
+        records = self.records()
+        times = records['time_in']
+        found = []
+        for time_log in time_logs:
+            lo = np.searchsorted(times, time_log.time_in_ts, 'left')
+            hi = np.searchsorted(times, time_log.time_in_ts, 'right')
+            found.append(any(self.people[person][0] == time_log.emp_id
+                             for person in records['emp'][lo:hi].tolist()))
+        return found
+    
+    def records(self):
+        """All records as a read-only memory map"""
+        count = len(self)
+        if count <= 0:
+            return np.empty(0, dtype=ARCHIVE_DTYPE)
+        with open(self.path, 'rb') as f:
+            if f.read(len(ARCHIVE_MAGIC)) != ARCHIVE_MAGIC:
+                raise ValueError(f"{self.path} is not a time log archive")
+        return np.memmap(self.path, dtype=ARCHIVE_DTYPE, mode='r',
+                         offset=len(ARCHIVE_MAGIC), shape=(count,))
+    
+    def scan(self, start=None, end=None):
+        """Records dated between start and end (inclusive), as a view of the map"""
+        records = self.records()
+        times = records['time_in']
+        lo = 0 if start is None else np.searchsorted(times, midnight(date_key(start)), 'left')
+        hi = len(records) if end is None else \
+            np.searchsorted(times, midnight(date_key(end) + 1), 'left')
+        return records[lo:hi]
+    
+    def days(self, records):
+        """Local day number of each record's time in"""
+        if not len(records):
+            return np.empty(0, dtype=np.int64)
+        times = records['time_in']
+        first = datetime.fromtimestamp(int(times[0])).toordinal()
+        last = datetime.fromtimestamp(int(times[-1])).toordinal()
+        # Local midnights of every day in range, so DST changes are respected
+        starts = np.array([midnight(day) for day in range(first, last + 2)], dtype=np.int64)
+        return np.searchsorted(starts, times, 'right') - 1 + first
+    
+    def aggregator(self, start=None, end=None):
+        """PayrollAggregator over the records dated between start and end"""
+        records = self.scan(start, end)
+        seconds = (records['time_out'] - records['time_in']).astype(np.float64)
+        rate = np.ascontiguousarray(records['rate'])
+        return PayrollAggregator.from_columns(np.ascontiguousarray(records['emp']), self.people,
+                                              self.days(records), seconds, rate,
+                                              seconds / 3600 * rate)
+    
+    def time_logs(self, start=None, end=None):
+        """Yield the TimeLogs dated between start and end"""
+        records = self.scan(start, end)
+        for record, day in zip(records.tolist(), self.days(records).tolist()):
+            time_in, time_out, person, rate = record
+            emp_id, emp_name = self.people[person]
+            hours = (time_out - time_in) / 3600
+            yield TimeLog.from_epoch(emp_id, emp_name, rate, day, time_in, time_out,
+                                     hours, hours * rate)
+    
+    def _person(self, emp_id, emp_name):
+        """Index of an (emp_id, emp_name) pair, adding it if new"""
+        pair = (emp_id, emp_name)
+        index = self._person_index.get(pair)
+        if index is None:
+            index = self._person_index[pair] = len(self.people)
+            self.people.append(pair)
+        return index
+    
+    def _save_people(self):
+        with open(self.people_path + ".tmp", 'w', encoding='utf-8') as f:
+            json.dump(self.people, f)
+        os.replace(self.people_path + ".tmp", self.people_path)
+
+
+def csv_time_logs(rows):
+    """Parse daily report rows into TimeLogs (times are only minute-precise)"""
+    for row in rows:
+        if row:
+            yield TimeLog.from_csv_row(row)
+
+
+def main():
+    """Build or extend an archive from SQLite, daily report CSVs or report partitions"""
+    parser = argparse.ArgumentParser(description="Build a binary time log archive")
+    parser.add_argument('--archive', default="timelogs.archive")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--db', help="SQLite database written by SQLiteStorage")
+    source.add_argument('--csv', nargs='+', help="daily report CSV files")
+    source.add_argument('--reports', help="daily report partition directory")
+    args = parser.parse_args()
+    
+    archive = TimeLogArchive(args.archive)
+    records = archive.records()
+    # Logs starting after the end of the archive are new, so a rebuild is incremental;
+    # earlier ones may still be new, as logs are only archived once they close
+    after = int(records['time_in'][-1]) if len(records) else None
+    del records
+    
+    if args.db:
+        from storage import SQLiteStorage
+        storage = SQLiteStorage(args.db)
+        time_logs = storage.load_time_logs()
+        storage.close()
+    elif args.csv:
+        import csv
+        time_logs = []
+        for filename in args.csv:
+            with open(filename, 'r', newline='') as f:
+                reader = csv.reader(f)
+                next(reader, None)  # Skip header
+                time_logs.extend(csv_time_logs(reader))
+    else:
+        from reports import PartitionedDailyReport
+        report = PartitionedDailyReport(args.reports, legacy_filename=None)
+        time_logs = list(csv_time_logs(report.read_range()))
+    
+    if after is not None:
+        earlier = [log for log in time_logs if log.time_in_ts <= after]
+        time_logs = [log for log in time_logs if log.time_in_ts > after]
+        time_logs += [log for log, archived in zip(earlier, archive.contains(earlier))
+                      if not archived]
+    count = archive.append(time_logs)
+    print(f"Archived {count} time logs to {args.archive} ({len(archive)} total)")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
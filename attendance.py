@@ -0,0 +1,95 @@
+"""
+Attendance Module - Who is timed in right now, kept current from a SystemManager's changes
+"""
+import queue
+import time
+from collections import OrderedDict
+from datetime import date
+
+COMPLETED_LIMIT = 500  # Finished shifts kept on the board, most recent last
+
+
+class AttendanceBoard:
+    """Active and finished sessions of the day, updated by diffs instead of reloads
+    
+    The board follows the manager with add_listener(); the listener only
+    queues each change, since it runs on whichever thread punched. The
+    display thread calls changes() to apply the queued events and get back
+    the diffs to draw: ('in', log) for a new session, ('out', log) when it
+    moves to the finished list and ('drop', log) when a finished shift
+    falls off (the oldest past COMPLETED_LIMIT, or yesterday's at midnight).
+    """
+    
+    def __init__(self, manager, completed_limit=COMPLETED_LIMIT):
+        self.manager = manager
+        self.completed_limit = completed_limit
+        self.active = {}                # emp_id -> open TimeLog
+        self.completed = OrderedDict()  # (emp_id, time_in_ts, time_out_ts) -> closed TimeLog
+        self.day = date.today()
+        self._events = queue.SimpleQueue()
+        
+        # Listen before taking the snapshot, so no punch falls between the two;
+        # events that the snapshot already shows are skipped by changes()
+        manager.add_listener(self._on_change)
+        for time_log in sorted(list(manager.active_sessions.values()), key=lambda log: log.time_in_ts):
+            self.active[time_log.emp_id] = time_log
+        for time_log in sorted(manager.history(self.day), key=lambda log: log.time_out_ts):
+            self.completed[self.key(time_log)] = time_log
+        # A session timed out while the snapshot was taken is already finished
+        self.active = {emp_id: time_log for emp_id, time_log in self.active.items()
+                       if time_log.time_out_ts is None}
+        self._trim([])
+    
+    def changes(self):
+        """Apply the changes queued since the last call; returns the diffs to draw"""
+        diffs = []
+        today = date.today()
+        if today != self.day:
+            self.day = today
+            for key, time_log in list(self.completed.items()):
+                if time_log.day != today.toordinal():
+                    del self.completed[key]
+                    diffs.append(('drop', time_log))
+        
+        while True:
+            try:
+                event_type, time_log = self._events.get_nowait()
+            except queue.Empty:
+                break
+            key = self.key(time_log)
+            if event_type == 'time_in':
+                # Skip sessions the snapshot already shows, open or (by now) finished
+                if self.active.get(time_log.emp_id) is time_log or key in self.completed:
+                    continue
+                self.active[time_log.emp_id] = time_log
+                diffs.append(('in', time_log))
+            elif key not in self.completed:
+                if self.active.get(time_log.emp_id) is time_log:
+                    del self.active[time_log.emp_id]
+                self.completed[key] = time_log
+                diffs.append(('out', time_log))
+        self._trim(diffs)
+        return diffs
+    
+    @staticmethod
+    def key(time_log):
+        """Identifies a finished shift across the snapshot and the change events"""
+        return time_log.emp_id, time_log.time_in_ts, time_log.time_out_ts
+    
+    def running_hours(self, time_log, now=None):
+        """Hours an open session has run so far"""
+        now = time.time() if now is None else now
+        return max(0.0, (now - time_log.time_in_ts) / 3600)
+    
+    def close(self):
+        """Stop following the manager"""
+        self.manager.remove_listener(self._on_change)
+    
+    def _trim(self, diffs):
+        while len(self.completed) > self.completed_limit:
+            _, time_log = self.completed.popitem(last=False)
+            diffs.append(('drop', time_log))
+    
+    def _on_change(self, event_type, item):
+        if event_type in ('time_in', 'time_out'):
+            self._events.put((event_type, item))
\ No newline at end of file
@@ -0,0 +1,876 @@
+"""
+Benchmark Module - Performance checks for the payroll system
+
+To run: python benchmark.py aggregation --count 1000000
+        python benchmark.py memory --count 1000000
+        python benchmark.py service --count 20000
+        python benchmark.py stress --count 20000
+        python benchmark.py login --count 20000
+        python benchmark.py roster --count 100000
+        python benchmark.py archive --count 1000000
+        python benchmark.py payroll --count 10000
+        python benchmark.py manager --employees 200 --days 730 --json results.jsonl
+        python benchmark.py metrics --count 50000
+        python benchmark.py gui --count 200
+        python benchmark.py branches --count 8 --employees 200 --days 30
+        python benchmark.py payslips --count 5000
+        python benchmark.py report_cache --count 200
+
+Each benchmark has its own default --count. With --json, one JSON line per
+benchmark run (results plus parameters, version and platform) is appended
+to the file, or written to stdout for "-", for tracking across versions.
+"""
+import argparse
+import asyncio
+import gc
+import inspect
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from credentials import hash_pin
+from models import Employee, InvalidCredentialsError, TooManyAttemptsError
+from timelog import TimeLog
+from timelog_store import TimeLogStore, TimeLogTable
+
+
+def synthetic_time_logs(count, employees=500, days=365, seed=0):
+    """Generate closed time logs spread evenly over `days` days"""
+    rng = random.Random(seed)
+    first_day = datetime(2026, 1, 1, 6, 0)
+    first_ordinal = first_day.toordinal()
+    first_ts = int(first_day.timestamp())
+    
+    # Logs share their employee's ID and name strings, as they do in SystemManager
+    emp_ids = [str(emp) for emp in range(employees)]
+    names = [f"Employee {emp}" for emp in range(employees)]
+    rates = [60.0 + emp % 5 * 10 for emp in range(employees)]
+    
+    time_logs = []
+    for i in range(count):
+        d = i * days // count
+        time_in = first_ts + d * 86400 + rng.randrange(0, 12 * 60) * 60
+        worked = rng.randrange(4 * 3600, 10 * 3600)
+        emp = i % employees
+        hours = worked / 3600
+        time_logs.append(TimeLog.from_epoch(emp_ids[emp], names[emp], rates[emp], first_ordinal + d,
+                                            time_in, time_in + worked, hours, hours * rates[emp]))
+    return time_logs
+
+
+def sum_employee_totals(time_logs):
+    """Monthly totals with the original per-log dict loop (the baseline)"""
+    employee_totals = {}
+    for log in time_logs:
+        if log.emp_id not in employee_totals:
+            employee_totals[log.emp_id] = {
+                'name': log.emp_name,
+                'total_hours': 0,
+                'total_etc': 0,
+                'days_worked': 0
+            }
+        employee_totals[log.emp_id]['total_hours'] += log.hours_worked
+        employee_totals[log.emp_id]['total_etc'] += log.etc
+        employee_totals[log.emp_id]['days_worked'] += 1
+    return employee_totals
+
+
+def add_employees(manager, emp_ids, pin="1234"):
+    """Register employees sharing one PIN hash, so setup costs one KDF instead of one each"""
+    pin_hash = hash_pin(pin)
+    for emp_id in emp_ids:
+        employee = Employee(emp_id, f"Employee {emp_id}", pin_hash, 60.0)
+        manager.storage.save_employee(employee)
+        manager.employees[emp_id] = employee
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a list of numbers"""
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+def timed(func, *args):
+    """Run func once and return (result, seconds)"""
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def bench_aggregation(count=1_000_000):
+    """Compare the per-log dict loop with the NumPy aggregation engine, load included
+    
+    The engine is fed a TimeLogTable, as the reports do; loading it from
+    TimeLog objects is timed too, and is slower than the loop on its own.
+    """
+    from aggregate import PayrollAggregator
+    
+    time_logs = synthetic_time_logs(count)
+    loop_totals, loop_seconds = timed(sum_employee_totals, time_logs)
+    _, load_seconds = timed(PayrollAggregator, time_logs)
+    table = TimeLogStore(time_logs).query()
+    aggregator, table_load_seconds = timed(PayrollAggregator, table)
+    engine_totals, totals_seconds = timed(aggregator.employee_totals)
+    _, breakdown_seconds = timed(aggregator.daily_breakdown_rows)
+    _, stats_seconds = timed(aggregator.employee_stats_rows)
+    
+    if loop_totals.keys() != engine_totals.keys():
+        raise RuntimeError("the engine's employees differ from the loop's")
+    return {
+        'logs': count,
+        'loop_totals_seconds': loop_seconds,
+        'engine_object_load_seconds': load_seconds,
+        'engine_table_load_seconds': table_load_seconds,
+        'engine_totals_seconds': totals_seconds,
+        'engine_daily_breakdown_seconds': breakdown_seconds,
+        'engine_employee_stats_seconds': stats_seconds,
+        'totals_speedup': loop_seconds / (table_load_seconds + totals_seconds),
+        'object_totals_speedup': loop_seconds / (load_seconds + totals_seconds),
+    }
+
+
+class LegacyTimeLog:
+    """Time log laid out like the original class: a __dict__, a date string
+    and two datetime objects"""
+    
+    def __init__(self, time_log):
+        self.emp_id = time_log.emp_id
+        self.emp_name = time_log.emp_name
+        self.hourly_rate = time_log.hourly_rate
+        self.date = time_log.date
+        self.time_in = time_log.time_in
+        self.time_out = time_log.time_out
+        self.hours_worked = time_log.hours_worked
+        self.etc = time_log.etc
+
+
+def measure_memory(build):
+    """Return bytes allocated by build() that are still alive afterwards"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return after - before
+
+
+def bench_memory(count=1_000_000):
+    """Compare memory held by legacy objects, slotted TimeLogs and a TimeLogTable"""
+    def legacy():
+        return [LegacyTimeLog(log) for log in synthetic_time_logs(count)]
+    
+    def slotted():
+        return synthetic_time_logs(count)
+    
+    def table():
+        result = TimeLogTable()
+        for log in synthetic_time_logs(count):
+            result.append(log)
+        return result
+    
+    legacy_bytes = measure_memory(legacy)
+    slotted_bytes = measure_memory(slotted)
+    table_bytes = measure_memory(table)
+    return {
+        'logs': count,
+        'legacy_mb': legacy_bytes / 2**20,
+        'slotted_mb': slotted_bytes / 2**20,
+        'table_mb': table_bytes / 2**20,
+        'legacy_bytes_per_log': legacy_bytes / count,
+        'slotted_bytes_per_log': slotted_bytes / count,
+        'table_bytes_per_log': table_bytes / count,
+    }
+
+
+def bench_service(count=20_000, terminals=50):
+    """Punches per second through the HTTP service, with journal and SQLite on disk"""
+    from journal import Journal
+    from manager import SystemManager
+    from service import PunchService
+    from storage import SQLiteStorage
+    
+    workdir = tempfile.mkdtemp()
+    cwd = os.getcwd()
+    os.chdir(workdir)  # The manager writes its daily report into the working directory
+    manager = SystemManager(SQLiteStorage("bench.db"), Journal("bench.journal", wait_for_sync=False))
+    add_employees(manager, [str(i) for i in range(terminals)])
+    service = PunchService(manager)
+    
+    async def post(reader, writer, path, payload, token=None):
+        body = json.dumps(payload).encode()
+        authorization = f"Authorization: Bearer {token}\r\n" if token else ""
+        writer.write(f"POST {path} HTTP/1.1\r\nHost: bench\r\n{authorization}"
+                     f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+        head = await reader.readuntil(b'\r\n\r\n')
+        length = int(head.split(b'Content-Length: ')[1].split(b'\r\n')[0])
+        reply = json.loads(await reader.readexactly(length))
+        if not reply['ok']:
+            raise RuntimeError(f"{path} failed for employee {payload['emp_id']}: {reply}")
+        return reply
+    
+    async def log_in(port, emp_id):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        reply = await post(reader, writer, '/login', {'emp_id': emp_id, 'pin': "1234"})
+        return reader, writer, reply['token']
+    
+    async def terminal(connection, emp_id, punches):
+        reader, writer, token = connection
+        for i in range(punches):
+            path = '/time-in' if i % 2 == 0 else '/time-out'
+            await post(reader, writer, path, {'emp_id': emp_id}, token)
+        writer.close()
+    
+    async def run():
+        server = await service.serve("127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        # Logins hash PINs; only the punches are timed
+        connections = await asyncio.gather(*(log_in(port, str(i)) for i in range(terminals)))
+        start = time.perf_counter()
+        await asyncio.gather(*(terminal(connection, str(i), count // terminals)
+                               for i, connection in enumerate(connections)))
+        elapsed = time.perf_counter() - start
+        server.close()
+        await server.wait_closed()
+        return elapsed
+    
+    try:
+        elapsed = asyncio.run(run())
+    finally:
+        manager.close()
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+    punches = count // terminals * terminals
+    return {
+        'punches': punches,
+        'terminals': terminals,
+        'seconds': elapsed,
+        'punches_per_second': punches / elapsed,
+    }
+
+
+def bench_stress(count=20_000, threads=32):
+    """Hammer one SystemManager with random punches from many threads, then check
+    that no employee was timed in twice and no closed log was lost"""
+    from journal import Journal
+    from manager import SystemManager
+    from storage import SQLiteStorage
+    
+    workdir = tempfile.mkdtemp()
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    manager = SystemManager(SQLiteStorage("stress.db"), Journal("stress.journal", wait_for_sync=False))
+    # Fewer employees than threads, so punches for one employee race each other
+    emp_ids = [str(i) for i in range(max(threads // 4, 1))]
+    add_employees(manager, emp_ids)
+    
+    def worker(seed):
+        rng = random.Random(seed)
+        accepted = {emp_id: [0, 0] for emp_id in emp_ids}  # [time ins, time outs]
+        for _ in range(count // threads):
+            emp_id = rng.choice(emp_ids)
+            if rng.random() < 0.5:
+                accepted[emp_id][0] += manager.time_in_employee(emp_id)[0]
+            else:
+                accepted[emp_id][1] += manager.time_out_employee(emp_id)[0]
+        return accepted
+    
+    try:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(threads) as pool:
+            results = list(pool.map(worker, range(threads)))
+        elapsed = time.perf_counter() - start
+        manager.writer.flush()
+        
+        time_ins = {emp_id: sum(r[emp_id][0] for r in results) for emp_id in emp_ids}
+        time_outs = {emp_id: sum(r[emp_id][1] for r in results) for emp_id in emp_ids}
+        closed = sum(time_outs.values())
+        # Checked explicitly rather than with assert, which python -O skips
+        failures = [f"employee {emp_id}: {time_ins[emp_id]} time ins, {time_outs[emp_id]} time outs"
+                    for emp_id in emp_ids
+                    if time_ins[emp_id] - time_outs[emp_id] != (emp_id in manager.active_sessions)]
+        if len(manager.time_logs) != closed:
+            failures.append("closed logs missing from history")
+        if sum(data['days_worked'] for data in manager.live_employee_totals().values()) != closed:
+            failures.append("closed logs missing from running totals")
+        if len(manager.storage.load_time_logs()) != closed:
+            failures.append("closed logs missing from storage")
+        if {log.emp_id for log in manager.storage.load_active_sessions()} != set(manager.active_sessions):
+            failures.append("stored sessions differ from active sessions")
+        if manager.daily_report.row_count() != closed:
+            failures.append("closed logs missing from daily report")
+        if failures:
+            raise RuntimeError("; ".join(failures))
+    finally:
+        manager.close()
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+    
+    punches = count // threads * threads
+    return {
+        'punches': punches,
+        'threads': threads,
+        'employees': len(emp_ids),
+        'closed_logs': closed,
+        'seconds': elapsed,
+        'punches_per_second': punches / elapsed,
+    }
+
+
+def bench_login(count=20_000, employees=20, threads=20):
+    """Login latency under a shift-change burst: first logins pay the PIN KDF,
+    repeat logins hit the verified-credential cache, and a PIN-guessing burst
+    is cut off by the rate limiter"""
+    from manager import SystemManager
+    
+    manager = SystemManager()
+    emp_ids = [str(i) for i in range(employees)]
+    add_employees(manager, emp_ids)
+    
+    def login(emp_id, pin="1234"):
+        start = time.perf_counter()
+        try:
+            manager.verify_employee_login(emp_id, pin)
+            outcome = 'ok'
+        except InvalidCredentialsError:
+            outcome = 'invalid'
+        except TooManyAttemptsError:
+            outcome = 'limited'
+        return outcome, time.perf_counter() - start
+    
+    def burst(emp_list, pin="1234"):
+        with ThreadPoolExecutor(threads) as pool:
+            return list(pool.map(lambda emp_id: login(emp_id, pin), emp_list))
+    
+    try:
+        cold = burst(emp_ids)
+        warm = burst([emp_ids[i % employees] for i in range(count)])
+        guesses = burst([emp_ids[0]] * 50, pin="0000")
+    finally:
+        manager.close()
+    
+    cold_seconds = [seconds for _, seconds in cold]
+    warm_seconds = [seconds for _, seconds in warm]
+    failed = sum(outcome != 'ok' for outcome, _ in cold + warm)
+    if failed:
+        raise RuntimeError(f"{failed} logins with the right PIN failed")
+    return {
+        'employees': employees,
+        'threads': threads,
+        'cold_logins': len(cold),
+        'cold_p50_ms': percentile(cold_seconds, 0.5) * 1000,
+        'cold_p99_ms': percentile(cold_seconds, 0.99) * 1000,
+        'cached_logins': len(warm),
+        'cached_p50_ms': percentile(warm_seconds, 0.5) * 1000,
+        'cached_p99_ms': percentile(warm_seconds, 0.99) * 1000,
+        'guesses': len(guesses),
+        'guesses_checked': sum(outcome == 'invalid' for outcome, _ in guesses),
+        'guesses_rate_limited': sum(outcome == 'limited' for outcome, _ in guesses),
+    }
+
+
+def bench_roster(count=100_000, plaintext=20):
+    """Bulk import and export of a roster of hashed PINs (as written by an export), then
+    a roster of plaintext PINs, timing a punch made while its PINs are being hashed"""
+    from manager import SystemManager
+    from roster import ROSTER_HEADER
+    from storage import SQLiteStorage
+    
+    workdir = tempfile.mkdtemp()
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    pin_hash = hash_pin("1234")
+    with open("roster.csv", 'w', newline='') as f:
+        f.write(",".join(ROSTER_HEADER) + "\n")
+        for i in range(count):
+            f.write(f"E{i},Employee {i},{pin_hash},{60 + i % 5 * 10}\n")
+        f.write("E0,Duplicate,1234,60\n,No ID,1234,60\nX1,Bad Rate,1234,abc\n")
+    with open("plaintext.csv", 'w', newline='') as f:
+        f.write(",".join(ROSTER_HEADER) + "\n")
+        for i in range(plaintext):
+            f.write(f"P{i},Plaintext {i},{1000 + i},60\n")
+    
+    manager = SystemManager(SQLiteStorage("roster.db"))
+    try:
+        tracemalloc.start()
+        result, import_seconds = timed(manager.import_employees, "roster.csv")
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        _, export_seconds = timed(manager.export_employees, "export.jsonl")
+        stored = len(manager.storage.load_employees())
+        
+        with ThreadPoolExecutor(1) as pool:
+            start = time.perf_counter()
+            importing = pool.submit(manager.import_employees, "plaintext.csv")
+            time.sleep(0.1)  # Let the hashing start
+            _, punch_seconds = timed(manager.time_in_employee, "E0")
+            plaintext_result = importing.result()
+            plaintext_seconds = time.perf_counter() - start
+        plaintext_stored = len(manager.storage.load_employees()) - stored
+    finally:
+        manager.close()
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+    
+    if not len(result.imported) == stored == count or len(result.errors) != 3:
+        raise RuntimeError(f"imported {len(result.imported)} and stored {stored} of {count} "
+                           f"employees with {len(result.errors)} rows rejected (expected 3)")
+    if not len(plaintext_result.imported) == plaintext_stored == plaintext:
+        raise RuntimeError(f"imported {len(plaintext_result.imported)} and stored "
+                           f"{plaintext_stored} of {plaintext} plaintext-PIN employees")
+    return {
+        'rows': result.rows,
+        'imported': len(result.imported),
+        'rejected': len(result.errors),
+        'import_seconds': import_seconds,
+        'import_rows_per_second': result.rows / import_seconds,
+        'import_peak_mb': peak / 2**20,
+        'export_seconds': export_seconds,
+        'plaintext_rows': plaintext,
+        'plaintext_import_seconds': plaintext_seconds,
+        'punch_during_import_seconds': punch_seconds,
+    }
+
+
+def bench_archive(count=1_000_000):
+    """Monthly totals from a daily report CSV versus the memory-mapped binary archive"""
+    import csv
+    from aggregate import PayrollAggregator
+    from archive import TimeLogArchive, csv_time_logs
+    from reports import DAILY_REPORT_HEADER
+    
+    workdir = tempfile.mkdtemp()
+    try:
+        time_logs = synthetic_time_logs(count)
+        csv_path = os.path.join(workdir, "daily_report.csv")
+        with open(csv_path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(DAILY_REPORT_HEADER)
+            writer.writerows(log.to_csv_row() for log in time_logs)
+        archive = TimeLogArchive(os.path.join(workdir, "timelogs.archive"))
+        _, build_seconds = timed(archive.append, time_logs)
+        first, last = time_logs[0].date, time_logs[-1].date
+        month_start = time_logs[len(time_logs) // 2].date
+        month_end = (datetime.fromisoformat(month_start) + timedelta(days=29)).date()
+        del time_logs
+        
+        def from_csv():
+            with open(csv_path, 'r', newline='') as f:
+                reader = csv.reader(f)
+                next(reader)
+                return PayrollAggregator(csv_time_logs(reader)).employee_totals()
+        
+        csv_totals, csv_seconds = timed(from_csv)
+        archive_totals, archive_seconds = timed(lambda: archive.aggregator(first, last).employee_totals())
+        _, month_seconds = timed(lambda: archive.aggregator(month_start, month_end).employee_totals())
+        
+        if csv_totals.keys() != archive_totals.keys():
+            raise RuntimeError("the archive's employees differ from the CSV's")
+        return {
+            'logs': count,
+            'csv_mb': os.path.getsize(csv_path) / 2**20,
+            'archive_mb': os.path.getsize(archive.path) / 2**20,
+            'archive_build_seconds': build_seconds,
+            'csv_totals_seconds': csv_seconds,
+            'archive_totals_seconds': archive_seconds,
+            'archive_month_totals_seconds': month_seconds,
+            'speedup': csv_seconds / archive_seconds,
+        }
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def bench_payroll(count=10_000, days=15):
+    """Semi-monthly payroll for `count` employees working six days in seven"""
+    from payroll import PayrollRules
+    
+    rng = random.Random(0)
+    first_day = datetime(2026, 10, 16)
+    rules = PayrollRules(holidays={'2026-10-31': 'special'})
+    time_logs = TimeLogTable()
+    for d in range(days):
+        midnight = int((first_day + timedelta(days=d)).timestamp())
+        for emp in range(count):
+            if (emp + d) % 7 == 0:
+                continue  # Day off
+            # Shifts start between 06:00 and 22:00 and last 6-12 hours
+            time_in = midnight + rng.randrange(6 * 3600, 22 * 3600, 900)
+            worked = rng.randrange(6 * 3600, 12 * 3600, 900)
+            time_logs.append(TimeLog.from_epoch(str(emp), f"Employee {emp}", 60.0,
+                                                first_day.toordinal() + d, time_in,
+                                                time_in + worked, worked / 3600, worked / 60))
+    
+    compiled, compile_seconds = timed(rules.compile, first_day.date(), datetime(2026, 10, 31).date())
+    rows, run_seconds = timed(compiled.report_rows, time_logs)
+    return {
+        'employees': count,
+        'shifts': len(time_logs),
+        'compile_seconds': compile_seconds,
+        'payroll_seconds': run_seconds,
+        'shifts_per_second': len(time_logs) / run_seconds,
+        'employees_paid': len(rows),
+        'overtime_hours': round(sum(row[5] for row in rows), 2),
+        'night_hours': round(sum(row[6] for row in rows), 2),
+    }
+
+
+def bench_metrics(count=50_000, employees=100):
+    """Punch throughput of a plain SystemManager against an instrumented one"""
+    from manager import SystemManager
+    from metrics import Metrics, instrument
+    from storage import SQLiteStorage
+    
+    workdir = tempfile.mkdtemp()
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    emp_ids = [str(i) for i in range(employees)]
+    results = {}
+    try:
+        for name, metrics in (('plain', None), ('instrumented', Metrics())):
+            manager = SystemManager(SQLiteStorage(f"{name}.db"))
+            add_employees(manager, emp_ids)
+            if metrics is not None:
+                instrument(manager, metrics)
+            def punches():
+                for i in range(count // 2):
+                    emp_id = emp_ids[i % employees]
+                    manager.time_in_employee(emp_id)
+                    manager.time_out_employee(emp_id)
+                manager.writer.flush()
+            _, seconds = timed(punches)
+            results[f'{name}_punches_per_second'] = count // 2 * 2 / seconds
+            manager.close()
+        results['overhead_percent'] = (results['plain_punches_per_second']
+                                       / results['instrumented_punches_per_second'] - 1) * 100
+        results['recorded_punches'] = metrics.counter('punches_total')
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+def bench_gui(count=200):
+    """Cold start and screen switch latency of the Tk GUI (needs a display)"""
+    from storage import SQLiteStorage
+    
+    workdir = tempfile.mkdtemp()
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        start = time.perf_counter()
+        from gui_app import TimekeepingGUI
+        from manager import SystemManager
+        results = {'import_seconds': time.perf_counter() - start}
+        gui = TimekeepingGUI(SystemManager(SQLiteStorage("gui.db")))
+        gui.root.update()
+        results['cold_start_seconds'] = time.perf_counter() - start
+        
+        add_employees(gui.manager, ["1"])
+        screens = [gui.show_employee_login, gui.show_admin_login, gui.show_admin_panel,
+                   gui.show_employee_panel, gui.show_login_screen]
+        first, cached = [], []
+        for i in range(count):
+            gui.current_user = gui.manager.employees["1"]
+            switch = screens[i % len(screens)]
+            _, seconds = timed(lambda: (switch(), gui.root.update()))
+            (first if i < len(screens) else cached).append(seconds)
+        results['first_switch_max_seconds'] = max(first)
+        results['cached_switch_p50_seconds'] = percentile(cached, 0.5)
+        results['cached_switch_p99_seconds'] = percentile(cached, 0.99)
+        gui.root.destroy()
+        gui.report_jobs.close()
+        gui.manager.close()
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+def bench_branches(count=8, employees=200, days=30, shift_mix=None, seed=0):
+    """Company report over `count` branches: map-reduce over branch databases against
+    loading every branch's history into one process"""
+    from branches import ShardedManager, merge_employee_totals
+    from workload import synthetic_history, synthetic_roster
+    from storage import SQLiteStorage
+    from timelog_store import report_window_start
+    
+    workdir = tempfile.mkdtemp()
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    paths = {}
+    shifts = 0
+    for branch in range(count):
+        roster, profiles = synthetic_roster(employees, seed + branch, shift_mix=shift_mix)
+        # Employee IDs are unique across the company
+        for employee in roster:
+            employee.emp_id = f"B{branch}-{employee.emp_id}"
+        profiles = {f"B{branch}-{emp_id}": profile for emp_id, profile in profiles.items()}
+        history = synthetic_history(roster, profiles, days, seed=seed + branch)
+        storage = SQLiteStorage(f"branch{branch}.db")
+        storage.save_employees([roster])
+        shifts += storage.save_time_logs(history)
+        storage.close()
+        paths[f"branch{branch}"] = f"branch{branch}.db"
+    
+    sharded = ShardedManager.from_databases(paths, journals=False)
+    results = {'branches': count, 'shifts': shifts}
+    try:
+        start = report_window_start(days)
+        def serial():
+            return merge_employee_totals(
+                (branch, manager.history(start).employee_totals())
+                for branch, manager in sharded.branches.items())
+        serial_totals, results['serial_seconds'] = timed(serial)
+        sharded.company_employee_totals(start)  # Start the worker processes
+        sharded_totals, results['sharded_seconds'] = timed(sharded.company_employee_totals, start)
+        results['speedup'] = results['serial_seconds'] / results['sharded_seconds']
+        if serial_totals.keys() != sharded_totals.keys():
+            raise RuntimeError("sharded totals have different employees from the serial ones")
+        if not all(abs(serial_totals[emp_id]['total_etc'] - data['total_etc']) < 0.01
+                   for emp_id, data in sharded_totals.items()):
+            raise RuntimeError("sharded totals differ from the serial ones")
+        _, results['company_report_seconds'] = timed(sharded.generate_monthly_report)
+    finally:
+        sharded.close()
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+def bench_manager(count=20_000, employees=200, days=730, shift_mix=None, seed=0):
+    """SystemManager at scale: history load, punch throughput, daily report appends,
+    report latency and daily report page loads over a synthetic roster and history"""
+    from journal import Journal
+    from manager import SystemManager
+    from storage import SQLiteStorage
+    from workload import synthetic_history, synthetic_roster
+    
+    roster, profiles = synthetic_roster(employees, seed, shift_mix=shift_mix)
+    history = synthetic_history(roster, profiles, days, seed=seed)
+    workdir = tempfile.mkdtemp()
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    storage = SQLiteStorage("bench.db")
+    storage.save_employees([roster])
+    storage.save_time_logs(history)
+    manager = SystemManager(storage, Journal("bench.journal", wait_for_sync=False))
+    results = {'employees': employees, 'days': days, 'history_logs': len(history)}
+    
+    try:
+        _, results['history_load_seconds'] = timed(lambda: (manager.time_logs, manager.running_totals))
+        
+        # Every employee times in, then out, until `count` punches are made
+        emp_ids = [employee.emp_id for employee in roster]
+        def punches():
+            for i in range(count // 2):
+                emp_id = emp_ids[i % employees]
+                manager.time_in_employee(emp_id)
+                manager.time_out_employee(emp_id)
+            manager.writer.flush()
+        _, seconds = timed(punches)
+        results['punches_per_second'] = count // 2 * 2 / seconds
+        
+        def appends():
+            for time_log in history[-count:]:
+                manager.save_daily_report(time_log)
+            manager.writer.flush()
+        _, seconds = timed(appends)
+        results['daily_report_appends_per_second'] = min(count, len(history)) / seconds
+        
+        for name in ('weekly', 'monthly', 'summary', 'payroll'):
+            report = getattr(manager, f"generate_{name}_report" if name != 'summary'
+                             else "generate_summary_reports")
+            (success, message), seconds = timed(report)
+            if not success:
+                raise RuntimeError(f"{name} report failed: {message}")
+            results[f'{name}_report_seconds'] = seconds
+        
+        # Page loads over the whole history, as the Daily Report view does
+        for time_log in history:
+            manager.save_daily_report(time_log)
+        manager.writer.flush()
+        rows = manager.daily_report.row_count()
+        results['daily_report_rows'] = rows
+        _, results['daily_report_first_page_seconds'] = timed(manager.get_daily_report_data, 0, 200)
+        _, results['daily_report_middle_page_seconds'] = timed(manager.get_daily_report_data,
+                                                                rows // 2, 200)
+        _, results['daily_report_date_page_seconds'] = timed(
+            manager.get_daily_report_data, 0, 200, history[len(history) // 2].date)
+    finally:
+        manager.close()
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+def bench_payslips(count=5_000, days=15, shift_mix=None, seed=0):
+    """Payslips in every format for `count` employees over a pay period, zipped with a manifest"""
+    from manager import SystemManager
+    from storage import SQLiteStorage
+    from workload import synthetic_history, synthetic_roster
+    
+    workdir = tempfile.mkdtemp()
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        roster, profiles = synthetic_roster(count, seed, shift_mix=shift_mix)
+        end = date.today()
+        storage = SQLiteStorage("payslips.db")
+        storage.save_employees([roster])
+        shifts = storage.save_time_logs(synthetic_history(roster, profiles, days, end, seed))
+        storage.close()
+        
+        manager = SystemManager(SQLiteStorage("payslips.db"))
+        start = end - timedelta(days=days)
+        manager.history()  # Load history outside the timing
+        (success, message), seconds = timed(manager.generate_payslips, start, end, "payslips.zip")
+        manager.close()
+        if not success:
+            raise RuntimeError(f"payslips failed: {message}")
+        return {
+            'employees': count,
+            'shifts': shifts,
+            'workers': os.cpu_count(),
+            'message': message,
+            'seconds': seconds,
+            'payslips_per_second': count / seconds,
+            'zip_bytes': os.path.getsize("payslips.zip"),
+        }
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def bench_report_cache(count=200, employees=200, days=30, shift_mix=None, seed=0):
+    """Repeated weekly and monthly report requests, with a time out closing every tenth request"""
+    from manager import SystemManager
+    from storage import SQLiteStorage
+    from workload import synthetic_history, synthetic_roster
+    
+    workdir = tempfile.mkdtemp()
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        roster, profiles = synthetic_roster(employees, seed, shift_mix=shift_mix)
+        storage = SQLiteStorage("cache.db")
+        storage.save_employees([roster])
+        storage.save_time_logs(synthetic_history(roster, profiles, days, seed=seed))
+        storage.close()
+        
+        manager = SystemManager(SQLiteStorage("cache.db"))
+        manager.history()  # Load history outside the timing
+        built, cached = [], []
+        for i in range(count):
+            if i % 10 == 9:
+                emp_id = roster[i % len(roster)].emp_id
+                manager.time_in_employee(emp_id)
+                manager.time_out_employee(emp_id)
+            generate = manager.generate_weekly_report if i % 2 else manager.generate_monthly_report
+            misses = manager.report_cache.misses
+            _, seconds = timed(generate)
+            (built if manager.report_cache.misses > misses else cached).append(seconds)
+        stats = manager.report_cache.stats()
+        manager.close()
+        return {
+            'requests': count,
+            'built': len(built),
+            'cached': len(cached),
+            'built_p50_seconds': percentile(built, 0.5),
+            'cached_p50_seconds': percentile(cached, 0.5),
+            'seconds_saved': percentile(built, 0.5) * len(cached) - sum(cached),
+            **{f"cache_{key}": value for key, value in stats.items()},
+        }
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+BENCHMARKS = {
+    'aggregation': bench_aggregation,
+    'memory': bench_memory,
+    'service': bench_service,
+    'stress': bench_stress,
+    'login': bench_login,
+    'roster': bench_roster,
+    'archive': bench_archive,
+    'payroll': bench_payroll,
+    'manager': bench_manager,
+    'metrics': bench_metrics,
+    'gui': bench_gui,
+    'branches': bench_branches,
+    'payslips': bench_payslips,
+    'report_cache': bench_report_cache,
+}
+
+
+def run_metadata():
+    """Where and on what version a benchmark ran"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        commit = ''
+    return {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'commit': commit or None,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+    }
+
+
+def main():
+    """Run the selected benchmarks, printing results and optionally recording them as JSON"""
+    parser = argparse.ArgumentParser(description="Payroll system benchmarks")
+    parser.add_argument('benchmarks', nargs='+', choices=sorted(BENCHMARKS), metavar='benchmark',
+                        help=", ".join(sorted(BENCHMARKS)))
+    parser.add_argument('--count', type=int,
+                        help="number of time logs, punches or rows (each benchmark has a default)")
+    parser.add_argument('--employees', type=int, help="synthetic roster size")
+    parser.add_argument('--days', type=int, help="days of synthetic history")
+    parser.add_argument('--shift-mix', help="shift profile weights, e.g. opening=0.5,closing=0.5")
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--json', metavar='FILE', help="append results as JSON lines ('-' for stdout)")
+    args = parser.parse_args()
+    
+    options = {'count': args.count, 'employees': args.employees, 'days': args.days,
+               'seed': args.seed, 'shift_mix': None}
+    if args.shift_mix:
+        from workload import parse_shift_mix
+        options['shift_mix'] = parse_shift_mix(args.shift_mix)
+    
+    for name in args.benchmarks:
+        bench = BENCHMARKS[name]
+        accepted = inspect.signature(bench).parameters
+        parameters = {key: value for key, value in options.items()
+                      if value is not None and key in accepted}
+        try:
+            results = bench(**parameters)
+        except RuntimeError as error:
+            sys.exit(f"[{name}] failed: {error}")  # Exit status 1
+        
+        if args.json:
+            line = json.dumps({'benchmark': name, 'parameters': parameters,
+                               **run_metadata(), 'results': results})
+            if args.json == '-':
+                print(line)
+                continue
+            with open(args.json, 'a') as f:
+                f.write(line + "\n")
+        
+        print(f"[{name}]")
+        for key, value in results.items():
+            print(f"{key:32} {value:.4f}" if isinstance(value, float) else f"{key:32} {value}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,195 @@
+"""
+Branches Module - One SystemManager per coffee shop behind a single facade
+"""
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from manager import SystemManager, report_checkpoint
+from models import EmployeeNotFoundError
+from storage import SQLiteStorage
+from timelog_store import report_window_start
+from writer import OutputWriter
+
+COMPANY_REPORT_HEADER = ['Employee ID', 'Employee Name', 'Branches', 'Days Worked',
+                         'Total Hours', 'Total ETC']
+
+
+def shard_employee_totals(path, start, end):
+    """Partial employee totals read straight from one branch database (runs in a worker process)"""
+    storage = SQLiteStorage(path)
+    try:
+        return storage.employee_totals(start, end)
+    finally:
+        storage.close()
+
+
+def merge_employee_totals(partials):
+    """Reduce (branch, employee_totals) pairs into company-wide totals per employee"""
+    merged = {}
+    for branch, totals in partials:
+        for emp_id, data in totals.items():
+            company = merged.get(emp_id)
+            if company is None:
+                company = merged[emp_id] = {'name': data['name'], 'total_hours': 0.0,
+                                            'total_etc': 0.0, 'days_worked': 0, 'branches': []}
+            company['total_hours'] += data['total_hours']
+            company['total_etc'] += data['total_etc']
+            company['days_worked'] += data['days_worked']
+            company['branches'].append(branch)
+    return merged
+
+
+class ShardedManager:
+    """Routes employee operations to per-branch SystemManagers and consolidates their reports
+    
+    Employee IDs are unique across the company, so a plain ID is routed to
+    the branch that registered it; "branch/emp_id" names the branch
+    outright. Company reports map each branch to partial employee totals,
+    in a process pool for branches stored in SQLite (each worker reads its
+    branch database directly), then merge them into one report.
+    """
+    
+    def __init__(self, branches):
+        self.branches = dict(branches)  # branch name -> SystemManager
+        self.writer = OutputWriter()
+        self._directory = None  # emp_id -> branch name
+        self._directory_lock = threading.Lock()
+        self._pool = None
+        self._pool_lock = threading.Lock()
+    
+    @classmethod
+    def from_databases(cls, paths, journals=True):
+        """Open one SQLite-backed manager per branch from {branch: database path}"""
+        from journal import Journal
+        from reports import PartitionedDailyReport
+        branches = {}
+        for branch, path in paths.items():
+            base = os.path.splitext(path)[0]
+            branches[branch] = SystemManager(
+                SQLiteStorage(path), Journal(base + ".journal") if journals else None,
+                PartitionedDailyReport(base + "_reports", legacy_filename=None))
+        return cls(branches)
+    
+    @property
+    def directory(self):
+        """Branch of every registered employee ID"""
+        if self._directory is None:
+            with self._directory_lock:
+                if self._directory is None:
+                    self._directory = {emp_id: branch
+                                       for branch, manager in self.branches.items()
+                                       for emp_id in manager.employees}
+        return self._directory
+    
+    def route(self, emp_id):
+        """Return (branch manager, emp_id) for a plain or "branch/emp_id" ID"""
+        branch, _, local_id = emp_id.partition('/')
+        if branch not in self.branches or not local_id:
+            branch, local_id = self.directory.get(emp_id), emp_id
+        if branch not in self.branches:
+            raise EmployeeNotFoundError("Employee ID not found!")
+        return self.branches[branch], local_id
+    
+    def close(self):
+        """Close every branch manager and the aggregation pool"""
+        if self._pool is not None:
+            self._pool.shutdown()
+        self.writer.close()
+        for manager in self.branches.values():
+            manager.close()
+    
+    def verify_employee_login(self, emp_id, pin):
+        """Verify employee credentials at the employee's branch"""
+        manager, emp_id = self.route(emp_id)
+        return manager.verify_employee_login(emp_id, pin)
+    
+    def add_employee(self, emp_id, name, pin, hourly_rate, branch=None):
+        """Add a new employee to a branch"""
+        if branch is None:
+            branch, _, emp_id = emp_id.partition('/')
+        if branch not in self.branches:
+            return False, f"Unknown branch: {branch}!"
+        
+        directory = self.directory
+        with self._directory_lock:
+            if emp_id in directory:
+                return False, f"Employee ID already exists at {directory[emp_id]}!"
+            success, message = self.branches[branch].add_employee(emp_id, name, pin, hourly_rate)
+            if success:
+                directory[emp_id] = branch
+        return success, message
+    
+    def time_in_employee(self, emp_id):
+        """Record employee time in at the employee's branch"""
+        manager, emp_id = self.route(emp_id)
+        return manager.time_in_employee(emp_id)
+    
+    def time_out_employee(self, emp_id):
+        """Record employee time out at the employee's branch"""
+        manager, emp_id = self.route(emp_id)
+        return manager.time_out_employee(emp_id)
+    
+    def get_employee_summary(self, emp_id):
+        """Get current employee summary"""
+        manager, emp_id = self.route(emp_id)
+        return manager.get_employee_summary(emp_id)
+    
+    def get_all_employees(self):
+        """Get list of all employees in every branch"""
+        return [employee for manager in self.branches.values()
+                for employee in manager.get_all_employees()]
+    
+    def get_live_totals(self):
+        """Get running totals per employee, tagged with their branch"""
+        return [dict(row, branch=branch) for branch, manager in self.branches.items()
+                for row in manager.get_live_totals()]
+    
+    def company_employee_totals(self, start, end=None, progress=None, cancel=None):
+        """Company-wide employee totals for logs dated start..end, merged from every branch"""
+        partials = []
+        futures = {}
+        for branch, manager in self.branches.items():
+            path = getattr(manager.storage, 'path', None)
+            if path is not None:
+                with self._pool_lock:
+                    if self._pool is None:
+                        self._pool = ProcessPoolExecutor(min(len(self.branches), os.cpu_count() or 1))
+                futures[self._pool.submit(shard_employee_totals, path, start, end)] = branch
+            else:
+                # No database file to hand to a worker; sum the branch's history here
+                partials.append((branch, manager.history(start, end).employee_totals()))
+        
+        try:
+            for future in as_completed(futures):
+                partials.append((futures[future], future.result()))
+                report_checkpoint(progress, cancel, 0.8 * len(partials) / len(self.branches))
+        finally:
+            for future in futures:
+                future.cancel()
+        
+        # Merge in branch order so the Branches column does not depend on finishing order
+        order = list(self.branches)
+        partials.sort(key=lambda partial: order.index(partial[0]))
+        return merge_employee_totals(partials)
+    
+    def generate_company_report(self, days, filename, progress=None, cancel=None):
+        """Write company-wide totals over the last `days` days (progress and cancel as for reports)"""
+        totals = self.company_employee_totals(report_window_start(days), None, progress, cancel)
+        if not totals:
+            return False, "No time logs available!"
+        
+        rows = [[emp_id, data['name'], " ".join(data['branches']), data['days_worked'],
+                 round(data['total_hours'], 2), round(data['total_etc'], 2)]
+                for emp_id, data in sorted(totals.items())]
+        self.writer.run(SystemManager._write_csv, filename, COMPANY_REPORT_HEADER, rows,
+                        progress, cancel, 0.8, 1.0)
+        report_checkpoint(progress, None, 1.0)
+        return True, f"Company report for {len(self.branches)} branches saved to {filename}"
+    
+    def generate_weekly_report(self, progress=None, cancel=None):
+        """Generate the consolidated weekly report"""
+        return self.generate_company_report(7, "company_weekly_report.csv", progress, cancel)
+    
+    def generate_monthly_report(self, progress=None, cancel=None):
+        """Generate the consolidated monthly report"""
+        return self.generate_company_report(30, "company_monthly_report.csv", progress, cancel)
\ No newline at end of file
@@ -0,0 +1,222 @@
+"""
+Changes Module - Sequenced change feed of punches and employee adds for downstream consumers
+
+To tail: python changes.py --consumer accounting --follow
+"""
+import argparse
+import asyncio
+import json
+import os
+import threading
+import time
+
+POLL_SECONDS = 0.5  # How often a read-only feed checks for lines from the writing process
+TAIL_BYTES = 65536  # End of the log read on open, for the last seq and events a replay may repeat
+
+
+class ChangeFeed:
+    """Append-only JSON-lines log of SystemManager changes, each with a sequence number
+    
+    Attach it to a manager and every time in, time out and employee add is
+    written as one line: {"seq", "type", "at", ...fields}. Sequence numbers
+    increase by one per event and carry on across restarts. Consumers keep
+    a (seq, byte position) offset, so catching up reads only new events.
+    A feed opened with writable=False only reads, e.g. in a consumer
+    process tailing the log that a running manager writes.
+    
+    The feed is attached write-ahead: each event is written and fsynced
+    before the manager stores the change, so a crash cannot lose one. When
+    the manager replays its journal after a crash, events already at the
+    end of the log are recognised and not written twice.
+    """
+    
+    def __init__(self, path="changes.log", writable=True):
+        self.path = path
+        self.writable = writable
+        self._lock = threading.Lock()
+        self._appended = threading.Condition(self._lock)
+        self._closed = False
+        self._last_seq, self._replayable = self._read_tail()
+        self._file = open(path, 'a', encoding='utf-8') if writable else None
+    
+    @property
+    def last_seq(self):
+        """Sequence number of the most recent event (0 when the feed is empty)"""
+        return self._last_seq
+    
+    def attach(self, manager):
+        """Publish a manager's changes to this feed"""
+        manager.add_listener(self.publish, write_ahead=True)
+        return self
+    
+    def publish(self, event_type, item):
+        """Append a time log or employee change durably; returns its sequence number
+        
+        Returns None for a change that was logged before a crash and is now
+        being replayed from the manager's journal.
+        """
+        event = {'type': event_type, 'at': time.time(), **self.event_fields(event_type, item)}
+        with self._lock:
+            key = self.event_key(event)
+            if key in self._replayable:
+                self._replayable.discard(key)
+                return None
+            seq = event['seq'] = self._last_seq + 1
+            self._file.write(json.dumps(event, separators=(',', ':')) + '\n')
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._last_seq = seq
+            self._appended.notify_all()
+        return seq
+    
+    @staticmethod
+    def event_fields(event_type, item):
+        """Plain fields of the changed TimeLog or Employee (never the PIN)"""
+        if event_type == 'employee_added':
+            return {'emp_id': item.emp_id, 'name': item.name, 'hourly_rate': item.hourly_rate}
+        fields = {'emp_id': item.emp_id, 'emp_name': item.emp_name,
+                  'hourly_rate': item.hourly_rate, 'date': item.date, 'time_in': item.time_in_ts}
+        if event_type == 'time_out':
+            fields.update(time_out=item.time_out_ts, hours_worked=item.hours_worked, etc=item.etc)
+        return fields
+    
+    @staticmethod
+    def event_key(event):
+        """What identifies an event's change, whenever and however often it is published"""
+        return event['type'], event['emp_id'], event.get('time_in'), event.get('time_out')
+    
+    def read(self, position=0):
+        """Yield (event, next position) for each complete line from byte `position` on"""
+        if not os.path.isfile(self.path):
+            return
+        with open(self.path, 'rb') as f:
+            f.seek(position)
+            for line in f:
+                if not line.endswith(b'\n'):
+                    return  # Still being written
+                position += len(line)
+                yield json.loads(line), position
+    
+    def wait(self, seq, timeout=None):
+        """Block until an event after `seq` is published; returns False on timeout or close
+        
+        A read-only feed cannot be notified, so it checks the end of the log
+        every poll interval instead.
+        """
+        if not self.writable:
+            deadline = None if timeout is None else time.monotonic() + timeout
+            while not self._closed:
+                if self._read_tail()[0] > seq:
+                    return True
+                remaining = POLL_SECONDS if deadline is None else deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                time.sleep(min(remaining, POLL_SECONDS))
+            return False
+        with self._lock:
+            return self._appended.wait_for(lambda: self._last_seq > seq or self._closed,
+                                           timeout) and not self._closed
+    
+    def consumer(self, name):
+        """A named consumer resuming from its committed offset"""
+        return FeedConsumer(self, name)
+    
+    def close(self):
+        """Close the log and wake any waiting consumers"""
+        with self._lock:
+            if self._file is not None and not self._closed:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+                self._file.close()
+            self._closed = True
+            self._appended.notify_all()
+    
+    def _read_tail(self):
+        """Sequence number of the last complete line, and the keys of the events near it"""
+        if not os.path.isfile(self.path):
+            return 0, set()
+        with open(self.path, 'rb+' if self.writable else 'rb') as f:
+            size = f.seek(0, os.SEEK_END)
+            start = max(size - TAIL_BYTES, 0)
+            f.seek(start)
+            lines = f.read().split(b'\n')
+            if lines[-1] and self.writable:
+                # A torn final line from a crash; drop it so the next event starts clean
+                f.truncate(size - len(lines[-1]))
+            if start:
+                lines = lines[1:]  # Starts mid-line
+            events = [json.loads(line) for line in lines[:-1] if line]
+            last_seq = events[-1]['seq'] if events else 0
+            if not self.writable:
+                return last_seq, set()
+            return last_seq, {self.event_key(event) for event in events}
+
+
+class FeedConsumer:
+    """Reads a ChangeFeed from its last committed offset
+    
+    Iterating yields the events published since the offset and stops at
+    the end of the feed; follow() and `async for` keep waiting for new
+    ones. commit() saves the offset so the next run resumes after it.
+    """
+    
+    def __init__(self, feed, name):
+        self.feed = feed
+        self.name = name
+        self.offset_path = f"{feed.path}.{name}.offset"
+        self.seq, self.position = 0, 0
+        if os.path.isfile(self.offset_path):
+            with open(self.offset_path) as f:
+                self.seq, self.position = json.load(f)
+    
+    def __iter__(self):
+        for event, position in self.feed.read(self.position):
+            self.seq, self.position = event['seq'], position
+            yield event
+    
+    def follow(self, timeout=None):
+        """Yield events as they are published, until the feed closes or `timeout` passes idle"""
+        while True:
+            yield from self
+            if not self.feed.wait(self.seq, timeout):
+                return
+    
+    async def __aiter__(self):
+        while True:
+            for event in self:
+                yield event
+            # Short waits, so a cancelled consumer does not hold a thread for long
+            while not await asyncio.to_thread(self.feed.wait, self.seq, 1.0):
+                if self.feed._closed:
+                    return
+    
+    def commit(self):
+        """Persist the offset of the last event read (one file per consumer)"""
+        temp_path = self.offset_path + ".tmp"
+        with open(temp_path, 'w') as f:
+            json.dump([self.seq, self.position], f)
+        os.replace(temp_path, self.offset_path)
+
+
+def main():
+    """Print a consumer's new events as JSON lines and commit its offset"""
+    parser = argparse.ArgumentParser(description="Tail the timekeeping change feed")
+    parser.add_argument('--log', default="changes.log")
+    parser.add_argument('--consumer', required=True, help="consumer name the offset is saved under")
+    parser.add_argument('--follow', action='store_true', help="keep waiting for new events")
+    args = parser.parse_args()
+    
+    feed = ChangeFeed(args.log, writable=False)
+    consumer = feed.consumer(args.consumer)
+    try:
+        for event in (consumer.follow() if args.follow else consumer):
+            print(json.dumps(event), flush=True)
+            consumer.commit()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        feed.close()
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
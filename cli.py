@@ -0,0 +1,240 @@
+"""
+CLI Module - Headless command line for reports, imports and stats (never imports tkinter)
+
+To run: python cli.py report daily --start 2024-01-01 --end 2024-01-31 > january.csv
+        python cli.py report totals --days 7 -o weekly_totals.csv
+        python cli.py report payroll --start 2024-01-01 --end 2024-01-15
+        python cli.py generate weekly
+        python cli.py generate payslips --start 2024-01-01 --end 2024-01-15 -o january_a.zip
+        python cli.py import employees roster.csv
+        python cli.py import timelogs daily_report.csv
+        python cli.py export employees roster.jsonl
+        python cli.py stats --days 30 --json
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+from datetime import date
+from manager import SystemManager
+from payslips import PAYSLIP_FORMATS
+from reports import DAILY_REPORT_HEADER, PartitionedDailyReport
+from storage import SQLiteStorage
+from timelog_store import report_window_start
+
+TOTALS_HEADER = ['Employee ID', 'Employee Name', 'Days Worked', 'Total Hours', 'Total ETC']
+REPORTS = ('daily', 'totals', 'payroll', 'breakdown', 'stats', 'shop')
+GENERATED_REPORTS = ('weekly', 'monthly', 'summary', 'payroll', 'payslips')
+
+
+def open_manager(args, create=False):
+    """SystemManager over the database, without the kiosk's journal (which it must not compact)
+    
+    The daily report partitions are opened read-only: the kiosk owns them
+    and its manifest, and no command here appends rows.
+    """
+    if not create and not os.path.isfile(args.db):
+        raise SystemExit(f"No database at {args.db}")
+    return SystemManager(SQLiteStorage(args.db),
+                         daily_report=PartitionedDailyReport(args.reports, legacy_filename=None,
+                                                             read_only=True))
+
+
+def date_range(args):
+    """(start, end) from --start/--end, or --days counting back from today"""
+    start = args.start
+    if args.days is not None:
+        start = report_window_start(args.days)
+    return start, args.end
+
+
+def report_rows(manager, kind, start, end, emp_id=None):
+    """Return (header, rows) for a report over logs dated start..end"""
+    if kind == 'payroll':
+        from payroll import PAYROLL_REPORT_HEADER, pay_period
+        if start is None and end is None:
+            start, end = pay_period()
+        elif end is None:
+            end = date.today()  # --days: the last N days
+        rules = manager.payroll_rules.compile(start, end)
+        return PAYROLL_REPORT_HEADER, rules.report_rows(manager.history(start, end, emp_id))
+    
+    logs = manager.history(start, end, emp_id)
+    if kind == 'daily':
+        return DAILY_REPORT_HEADER, (time_log.to_csv_row() for time_log in logs)
+    if kind == 'totals':
+        return TOTALS_HEADER, [[emp_id, data['name'], data['days_worked'],
+                                round(data['total_hours'], 2), round(data['total_etc'], 2)]
+                               for emp_id, data in sorted(logs.employee_totals().items())]
+    
+    # NumPy is only loaded for the summary reports
+    from aggregate import (DAILY_BREAKDOWN_HEADER, EMPLOYEE_STATS_HEADER,
+                           SHOP_SUMMARY_HEADER, PayrollAggregator)
+    aggregator = PayrollAggregator(logs)
+    if kind == 'breakdown':
+        return DAILY_BREAKDOWN_HEADER, aggregator.daily_breakdown_rows()
+    if kind == 'stats':
+        return EMPLOYEE_STATS_HEADER, aggregator.employee_stats_rows()
+    return SHOP_SUMMARY_HEADER, aggregator.shop_rows()
+
+
+def write_rows(output, header, rows):
+    """Stream a header and rows as CSV to a file, or to stdout for '-'"""
+    if output == '-':
+        writer = csv.writer(sys.stdout)
+        writer.writerow(header)
+        writer.writerows(rows)
+        sys.stdout.flush()
+        return
+    with open(output, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+
+def stats(manager, days):
+    """Counts and recent totals describing the database"""
+    history = manager.history()
+    start = report_window_start(days)
+    recent = manager.history(start).employee_totals()
+    return {
+        'employees': len(manager.employees),
+        'timed_in': len(manager.active_sessions),
+        'time_logs': len(history),
+        'first_date': history[0].date if len(history) else None,
+        'last_date': history[-1].date if len(history) else None,
+        'daily_report_rows': manager.daily_report.row_count(),
+        'window_days': days,
+        'window_start': str(start),
+        'window_employees': len(recent),
+        'window_shifts': sum(data['days_worked'] for data in recent.values()),
+        'window_hours': round(sum(data['total_hours'] for data in recent.values()), 2),
+        'window_etc': round(sum(data['total_etc'] for data in recent.values()), 2),
+    }
+
+
+def run(args):
+    """Run one parsed command; returns the process exit status"""
+    if args.command == 'report':
+        manager = open_manager(args)
+        try:
+            start, end = date_range(args)
+            header, rows = report_rows(manager, args.kind, start, end, args.emp_id)
+            write_rows(args.output, header, rows)
+        finally:
+            manager.close()
+        return 0
+    
+    if args.command == 'generate':
+        manager = open_manager(args)
+        try:
+            if args.kind == 'summary':
+                success, message = manager.generate_summary_reports(args.days or 30)
+            elif args.kind == 'payroll':
+                success, message = manager.generate_payroll_report(args.start, args.end)
+            elif args.kind == 'payslips':
+                success, message = manager.generate_payslips(args.start, args.end, args.output,
+                                                             args.formats or PAYSLIP_FORMATS)
+            else:
+                success, message = getattr(manager, f"generate_{args.kind}_report")()
+        finally:
+            manager.close()
+        print(message, file=sys.stderr)
+        return 0 if success else 1
+    
+    if args.command == 'import':
+        manager = open_manager(args, create=True)
+        try:
+            if args.kind == 'timelogs':
+                count, skipped = manager.storage.import_daily_report(args.file)
+                print(f"Imported {count} time logs from {args.file}"
+                      + (f" ({skipped} duplicates skipped)" if skipped else ""),
+                      file=sys.stderr)
+                return 0
+            result = manager.import_employees(args.file)
+        finally:
+            manager.close()
+        print(result.summary(), file=sys.stderr)
+        if result.errors:
+            errors_filename = args.errors or args.file + ".errors.csv"
+            result.write_errors(errors_filename)
+            print(f"Rejected rows written to {errors_filename}", file=sys.stderr)
+        return 0 if result.imported or not result.errors else 1
+    
+    if args.command == 'export':
+        manager = open_manager(args)
+        try:
+            success, message = manager.export_employees(args.file)
+        finally:
+            manager.close()
+        print(message, file=sys.stderr)
+        return 0 if success else 1
+    
+    manager = open_manager(args)
+    try:
+        result = stats(manager, args.days or 30)
+    finally:
+        manager.close()
+    if args.json:
+        print(json.dumps(result))
+    else:
+        for key, value in result.items():
+            print(f"{key:20} {value}")
+    return 0
+
+
+def main(argv=None):
+    """Parse the command line and run it"""
+    parser = argparse.ArgumentParser(description="Timekeeping & payroll command line (no GUI)")
+    parser.add_argument('--db', default="payroll.db")
+    parser.add_argument('--reports', default="reports", help="daily report partition directory")
+    commands = parser.add_subparsers(dest='command', required=True)
+    
+    report = commands.add_parser('report', help="write a report over a date range as CSV")
+    report.add_argument('kind', choices=REPORTS)
+    report.add_argument('--start', type=date.fromisoformat, help="first date (YYYY-MM-DD)")
+    report.add_argument('--end', type=date.fromisoformat, help="last date (YYYY-MM-DD)")
+    report.add_argument('--days', type=int, help="the last N days instead of --start")
+    report.add_argument('--emp-id', help="one employee only")
+    report.add_argument('-o', '--output', default='-', help="output file ('-' for stdout)")
+    
+    generate = commands.add_parser('generate', help="write the standard report files, as the Admin Panel does")
+    generate.add_argument('kind', choices=GENERATED_REPORTS)
+    generate.add_argument('--days', type=int, help="summary report window (default 30)")
+    generate.add_argument('--start', type=date.fromisoformat,
+                          help="payroll and payslip period start (default: the current pay period)")
+    generate.add_argument('--end', type=date.fromisoformat, help="payroll and payslip period end")
+    generate.add_argument('--format', dest='formats', action='append', choices=PAYSLIP_FORMATS,
+                          help="payslip format, repeatable (default: all)")
+    generate.add_argument('-o', '--output', default="payslips.zip",
+                          help="payslips .zip file, or a directory")
+    
+    import_ = commands.add_parser('import', help="bulk-load employees or time logs")
+    import_.add_argument('kind', choices=('employees', 'timelogs'))
+    import_.add_argument('file', help="CSV or JSON-lines roster, or a daily report CSV")
+    import_.add_argument('--errors', help="where to write rejected roster rows")
+    
+    export = commands.add_parser('export', help="write the roster as CSV or JSON lines")
+    export.add_argument('kind', choices=('employees',))
+    export.add_argument('file')
+    
+    stats_ = commands.add_parser('stats', help="print database counts and recent totals")
+    stats_.add_argument('--days', type=int, help="window for the recent totals (default 30)")
+    stats_.add_argument('--json', action='store_true')
+    
+    args = parser.parse_args(argv)
+    # A pay period is both dates or neither; a lone bound must not be swapped for the current period
+    if getattr(args, 'kind', None) in ('payroll', 'payslips') \
+            and (args.start is None) != (args.end is None):
+        parser.error("give both --start and --end, or neither for the current pay period")
+    try:
+        return run(args)
+    except BrokenPipeError:
+        # The reader (e.g. `head`) went away; stop quietly like other Unix tools
+        sys.stdout = open(os.devnull, 'w')
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,170 @@
+"""
+Client Module - Thin SystemManager stand-in that talks to the punch service
+"""
+import http.client
+import json
+from urllib.parse import urlencode, urlsplit
+from timelog import TimeLog
+from models import Employee, EmployeeNotFoundError, InvalidCredentialsError, TooManyAttemptsError
+
+ERRORS = {
+    'EmployeeNotFoundError': EmployeeNotFoundError,
+    'InvalidCredentialsError': InvalidCredentialsError,
+    'TooManyAttemptsError': TooManyAttemptsError,
+}
+
+
+class ServiceClient:
+    """Offers the SystemManager methods the GUI uses, over HTTP/JSON
+    
+    Logging in keeps the token the service issues: an employee's for their
+    own punches and summary, the admin's for everything else.
+    """
+    
+    def __init__(self, base_url="http://127.0.0.1:8765", timeout=10):
+        url = urlsplit(base_url)
+        self.host = url.hostname
+        self.port = url.port or 80
+        self.timeout = timeout
+        self._conn = None
+        self._tokens = {}  # emp_id -> token from /login
+        self._admin_token = None
+    
+    def verify_employee_login(self, emp_id, pin):
+        """Verify employee credentials"""
+        data = self._request('POST', '/login', {'emp_id': emp_id, 'pin': pin})
+        self._tokens[emp_id] = data['token']
+        employee = data['employee']
+        return Employee(employee['emp_id'], employee['name'], None, employee['hourly_rate'])
+    
+    def verify_admin_login(self, pin):
+        """Verify admin credentials"""
+        data = self._request('POST', '/admin/login', {'pin': pin})
+        if data['ok']:
+            self._admin_token = data['token']
+        return data['ok']
+    
+    def add_employee(self, emp_id, name, pin, hourly_rate):
+        """Add a new employee"""
+        return self._result(self._request('POST', '/employees', {
+            'emp_id': emp_id, 'name': name, 'pin': pin, 'hourly_rate': hourly_rate}))
+    
+    def import_employees(self, filename, progress=None, cancel=None):
+        """Roster files are read on the service host, not sent from a terminal"""
+        raise ValueError("Import employees on the service host!")
+    
+    def export_employees(self, filename):
+        """Roster files are written on the service host, not sent to a terminal"""
+        raise ValueError("Export employees on the service host!")
+    
+    def time_in_employee(self, emp_id):
+        """Record employee time in"""
+        return self._result(self._request('POST', '/time-in', {'emp_id': emp_id}, emp_id))
+    
+    def time_out_employee(self, emp_id):
+        """Record employee time out"""
+        return self._result(self._request('POST', '/time-out', {'emp_id': emp_id}, emp_id))
+    
+    def get_employee_summary(self, emp_id):
+        """Get current employee summary"""
+        return self._request('GET', '/summary?' + urlencode({'emp_id': emp_id}),
+                             emp_id=emp_id)['summary']
+    
+    def get_all_employees(self):
+        """Get list of all employees"""
+        return [Employee(data['emp_id'], data['name'], None, data['hourly_rate'])
+                for data in self._request('GET', '/employees')['employees']]
+    
+    def get_daily_report_data(self, offset=0, limit=None, date=None):
+        """Get a page of daily report rows"""
+        query = {'offset': offset}
+        if limit is not None:
+            query['limit'] = limit
+        if date is not None:
+            query['date'] = date
+        return self._request('GET', '/daily-report?' + urlencode(query))['rows']
+    
+    def get_live_totals(self):
+        """Get running totals per employee"""
+        return self._request('GET', '/live-totals')['totals']
+    
+    def auto_closed_sessions(self):
+        """Automatic time outs awaiting review, as (time log, reason) pairs"""
+        return [(TimeLog.from_epoch(data['emp_id'], data['emp_name'], data['hourly_rate'],
+                                    data['day'], data['time_in'], data['time_out'],
+                                    data['hours_worked'], data['etc']), data['reason'])
+                for data in self._request('GET', '/auto-closed')['sessions']]
+    
+    def mark_reviewed(self, emp_id, time_in_ts):
+        """Take an automatic time out off the review list"""
+        self._request('POST', '/auto-closed/reviewed', {'emp_id': emp_id, 'time_in': time_in_ts})
+    
+    def generate_weekly_report(self, progress=None, cancel=None):
+        """Generate weekly payroll report on the service host (progress and cancel are not relayed)"""
+        return self._result(self._request('POST', '/reports/weekly'))
+    
+    def generate_monthly_report(self, progress=None, cancel=None):
+        """Generate monthly payroll report on the service host (progress and cancel are not relayed)"""
+        return self._result(self._request('POST', '/reports/monthly'))
+    
+    def generate_summary_reports(self, progress=None, cancel=None):
+        """Generate summary reports on the service host (progress and cancel are not relayed)"""
+        return self._result(self._request('POST', '/reports/summary'))
+    
+    def generate_payroll_report(self, start=None, end=None, progress=None, cancel=None):
+        """Generate the pay-period payroll on the service host (progress and cancel are not relayed)"""
+        payload = {}
+        if start is not None and end is not None:
+            payload = {'start': str(start), 'end': str(end)}
+        return self._result(self._request('POST', '/reports/payroll', payload))
+    
+    def generate_payslips(self, start=None, end=None, formats=None, progress=None, cancel=None):
+        """Write the pay period's payslips on the service host (progress and cancel are not relayed)"""
+        payload = {}
+        if start is not None and end is not None:
+            payload = {'start': str(start), 'end': str(end)}
+        if formats is not None:
+            payload['formats'] = list(formats)
+        return self._result(self._request('POST', '/reports/payslips', payload))
+    
+    def close(self):
+        """Close the connection to the service"""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+    
+    def _request(self, method, path, payload=None, emp_id=None):
+        """Send one request over a kept-alive connection and decode the reply
+        
+        Sends the token of employee `emp_id` when there is one, otherwise
+        the admin's.
+        """
+        body = None if payload is None else json.dumps(payload)
+        headers = {'Content-Type': 'application/json'}
+        token = self._tokens.get(emp_id) or self._admin_token
+        if token is not None:
+            headers['Authorization'] = f"Bearer {token}"
+        for attempt in range(2):
+            if self._conn is None:
+                self._conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            try:
+                self._conn.request(method, path, body, headers)
+                response = self._conn.getresponse()
+                data = json.loads(response.read())
+                break
+            except (ConnectionError, http.client.HTTPException):
+                # The service may have dropped an idle connection; retry once
+                self.close()
+                if attempt:
+                    raise
+        
+        error = ERRORS.get(data.get('error_type'))
+        if error is not None:
+            raise error(data['error'])
+        if response.status >= 400:
+            raise ValueError(data.get('error', f"Service error {response.status}"))
+        return data
+    
+    @staticmethod
+    def _result(data):
+        return data['ok'], data.get('message', '')
\ No newline at end of file
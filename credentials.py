@@ -0,0 +1,153 @@
+"""
+Credentials Module - Salted PIN hashing, a verified-login cache and login rate limiting
+"""
+import hashlib
+import hmac
+import os
+import threading
+import time
+from collections import OrderedDict
+
+PBKDF2_ITERATIONS = 600_000
+HASH_SCHEME = "pbkdf2_sha256"
+
+
+def hash_pin(pin, salt=None, iterations=PBKDF2_ITERATIONS):
+    """Return a salted PBKDF2 hash of pin as 'pbkdf2_sha256$iterations$salt$hash'"""
+    salt = salt if salt is not None else os.urandom(16)
+    digest = hashlib.pbkdf2_hmac('sha256', pin.encode('utf-8'), salt, iterations)
+    return f"{HASH_SCHEME}${iterations}${salt.hex()}${digest.hex()}"
+
+
+def is_hashed(stored):
+    """Whether a stored PIN is a hash rather than legacy plaintext"""
+    return stored.startswith(HASH_SCHEME + "$")
+
+
+def needs_upgrade(stored):
+    """Whether a stored PIN should be re-hashed (plaintext or too few iterations)"""
+    return not is_hashed(stored) or int(stored.split("$")[1]) < PBKDF2_ITERATIONS
+
+
+def check_pin(pin, stored):
+    """Compare pin with a stored hash (or a legacy plaintext PIN) in constant time"""
+    if not is_hashed(stored):
+        return hmac.compare_digest(pin.encode('utf-8'), stored.encode('utf-8'))
+    _, iterations, salt, expected = stored.split("$")
+    digest = hashlib.pbkdf2_hmac('sha256', pin.encode('utf-8'), bytes.fromhex(salt), int(iterations))
+    return hmac.compare_digest(digest.hex(), expected)
+
+
+class VerifiedCache:
+    """LRU of recent successful verifications that expire after `ttl` seconds
+    
+    Keys are (ID, digest) where the digest is a keyed SHA-256 of the stored
+    hash and the presented PIN, so a hit costs one fast hash instead of the
+    KDF and a changed PIN never matches an old entry. PINs must be strings,
+    so that 1234 and "1234" can never share an entry. The digest key lives
+    only in this process.
+    """
+    
+    def __init__(self, ttl=300.0, maxsize=4096):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._secret = os.urandom(32)
+        self._entries = OrderedDict()  # (ID, digest) -> expiry time
+        self._lock = threading.Lock()
+    
+    def key(self, ident, pin, stored):
+        if not isinstance(pin, str):
+            raise TypeError(f"PIN must be a string, not {type(pin).__name__}")
+        digest = hmac.new(self._secret, f"{stored}\0{pin}".encode('utf-8'), hashlib.sha256).digest()
+        return ident, digest
+    
+    def __contains__(self, key):
+        with self._lock:
+            expires = self._entries.get(key)
+            if expires is None:
+                return False
+            if expires < time.monotonic():
+                del self._entries[key]
+                return False
+            self._entries.move_to_end(key)
+            return True
+    
+    def add(self, key):
+        """Remember a successful verification"""
+        with self._lock:
+            self._entries[key] = time.monotonic() + self.ttl
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+    
+    def discard(self, ident):
+        """Forget every cached verification for an ID"""
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == ident]:
+                del self._entries[key]
+
+
+class LoginRateLimiter:
+    """Token bucket per ID; each login attempt spends a token
+    
+    A bucket holds `capacity` tokens and regains one every `refill_seconds`.
+    A correct PIN refills the bucket, so only failures use it up. An ID with
+    an empty bucket is refused until a token comes back, which bounds
+    brute-force guessing without slowing down correct logins.
+    """
+    
+    def __init__(self, capacity=5, refill_seconds=30.0):
+        self.capacity = capacity
+        self.refill_seconds = refill_seconds
+        self._buckets = {}  # ID -> [tokens, last refill time]
+        self._lock = threading.Lock()
+    
+    def acquire(self, ident):
+        """Spend a token for an attempt; False when the bucket is empty"""
+        with self._lock:
+            tokens = self._refill(ident)
+            if tokens < 1:
+                return False
+            self._buckets[ident] = [tokens - 1, time.monotonic()]
+            return True
+    
+    def succeeded(self, ident):
+        """A correct PIN refills the bucket"""
+        with self._lock:
+            self._buckets.pop(ident, None)
+    
+    def _refill(self, ident):
+        bucket = self._buckets.get(ident)
+        if bucket is None:
+            return self.capacity
+        tokens, updated = bucket
+        now = time.monotonic()
+        tokens = min(self.capacity, tokens + (now - updated) / self.refill_seconds)
+        if tokens >= self.capacity:
+            del self._buckets[ident]  # Full buckets need no entry
+        else:
+            bucket[:] = [tokens, now]
+        return tokens
+
+
+class CredentialVerifier:
+    """Checks PINs against stored hashes through the cache and rate limiter"""
+    
+    def __init__(self, cache=None, limiter=None):
+        self.cache = cache if cache is not None else VerifiedCache()
+        self.limiter = limiter if limiter is not None else LoginRateLimiter()
+    
+    def allow(self, ident):
+        """Take a login attempt for ID; False when it has run out"""
+        return self.limiter.acquire(ident)
+    
+    def verify(self, ident, pin, stored):
+        """Check pin for ID; call allow() first"""
+        if not isinstance(pin, str):
+            return False  # Never equal to a stored PIN, whatever its text
+        key = self.cache.key(ident, pin, stored)
+        if key in self.cache or check_pin(pin, stored):
+            self.cache.add(key)
+            self.limiter.succeeded(ident)
+            return True
+        return False
\ No newline at end of file
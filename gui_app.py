@@ -1,42 +1,115 @@
 """
 GUI Application Module - Tkinter Interface
 """
+import time
+STARTED = time.perf_counter()  # Cold start is measured from here to the first idle login screen
+
 import tkinter as tk
-from tkinter import ttk, messagebox, scrolledtext
+from tkinter import ttk, messagebox
+from journal import Journal
 from manager import SystemManager
-from models import InvalidCredentialsError, EmployeeNotFoundError
+from storage import SQLiteStorage
+from models import InvalidCredentialsError, EmployeeNotFoundError, TooManyAttemptsError
+from reports import DAILY_REPORT_HEADER
+from report_jobs import ReportJobQueue
+
+def default_manager():
+    """The standalone kiosk's manager: SQLite storage with a punch journal"""
+    return SystemManager(SQLiteStorage("payroll.db", seed_report="daily_report.csv"),
+                         Journal("punches.journal"))
 
 class TimekeepingGUI:
-    """Main GUI Application"""
+    """Main GUI Application
+    
+    The login, employee and admin screens are each built once, on first
+    use, as a frame stacked in the same grid cell. Switching screens raises
+    the cached frame and refreshes only its dynamic fields, instead of
+    destroying and rebuilding every widget.
+    """
+    
+    WINDOW_SIZE = (500, 400)  # Smallest main window; screens with more on them grow it
+    DAILY_REPORT_PAGE_SIZE = 200
+    REPORT_POLL_MS = 100
+    SESSION_CHECK_MS = 30000
+    ATTENDANCE_POLL_MS = 250
+    ATTENDANCE_TICK_MS = 1000
     
-    def __init__(self):
-        self.manager = SystemManager()
+    def __init__(self, manager=None, metrics=None, scheduler=None):
+        # A ServiceClient can stand in for the manager to run as a thin client
+        if manager is None:
+            manager = default_manager()
+        if metrics is not None:
+            from metrics import instrument
+            instrument(manager, metrics)
+        self.manager = manager
+        self.metrics = metrics
+        # Forgotten time outs are closed from the Tk loop; a thin client's service does it instead
+        if scheduler is None and hasattr(manager, 'add_listener'):
+            from sessions import StaleSessionScheduler
+            scheduler = StaleSessionScheduler(manager)
+        self.scheduler = scheduler
         self.current_user = None
+        self.report_jobs = ReportJobQueue()
+        self.jobs_window = None
+        self.board_window = None
+        self.screens = {}  # name -> (frame, refresh)
+        self.screen_sizes = {}  # name -> window geometry fitting that screen
         self.root = tk.Tk()
         self.root.title("Coffee Shop - Timekeeping & Payroll System")
-        self.root.geometry("500x400")
+        self.root.geometry("{}x{}".format(*self.WINDOW_SIZE))
         self.root.resizable(False, False)
         
         # Configure style
         self.style = ttk.Style()
         self.style.theme_use('clam')
         
+        # Every screen's frame sits in the one cell of this container
+        self.container = ttk.Frame(self.root)
+        self.container.pack(expand=True, fill='both')
+        self.container.grid_rowconfigure(0, weight=1)
+        self.container.grid_columnconfigure(0, weight=1)
+        
+        if metrics is not None:
+            from metrics import instrument_gui
+            instrument_gui(self, metrics)
         self.show_login_screen()
+        if scheduler is not None:
+            self.root.after(self.SESSION_CHECK_MS, self.check_sessions)
+        if metrics is not None:
+            self.root.after_idle(lambda: metrics.observe('gui_cold_start_seconds',
+                                                         time.perf_counter() - STARTED))
     
-    def clear_window(self):
-        """Clear all widgets from window"""
-        for widget in self.root.winfo_children():
-            widget.destroy()
+    def show_screen(self, name, title):
+        """Raise a cached screen, building it on first use, and refresh its dynamic fields"""
+        start = time.perf_counter()
+        cached = name in self.screens
+        if not cached:
+            frame = ttk.Frame(self.container, padding="20")
+            frame.grid(row=0, column=0, sticky='nsew')
+            self.screens[name] = (frame, getattr(self, f"_build_{name}")(frame))
+            # Measured once: the admin panel's buttons do not fit the default size
+            self.root.update_idletasks()
+            self.screen_sizes[name] = (f"{max(self.WINDOW_SIZE[0], frame.winfo_reqwidth())}x"
+                                       f"{max(self.WINDOW_SIZE[1], frame.winfo_reqheight())}")
+        
+        frame, refresh = self.screens[name]
+        if refresh is not None:
+            refresh()
+        self.root.title(title)
+        self.root.geometry(self.screen_sizes[name])
+        frame.tkraise()
+        
+        if self.metrics is not None:
+            # Idle callbacks run after the pending redraw, so this covers the repaint too
+            self.root.after_idle(lambda: self.metrics.observe(
+                'gui_screen_switch_seconds', time.perf_counter() - start,
+                screen=name, cached='yes' if cached else 'no'))
     
     def show_login_screen(self):
         """Display login screen"""
-        self.clear_window()
-        self.root.title("Login - Coffee Shop Timekeeping System")
-        
-        # Main frame
-        main_frame = ttk.Frame(self.root, padding="20")
-        main_frame.pack(expand=True, fill='both')
-        
+        self.show_screen('login_screen', "Login - Coffee Shop Timekeeping System")
+    
+    def _build_login_screen(self, main_frame):
         # Title
         title_label = ttk.Label(main_frame, text="☕ Coffee Shop Timekeeping System", 
                                font=('Arial', 16, 'bold'))
@@ -59,12 +132,9 @@ class TimekeepingGUI:
     
     def show_employee_login(self):
         """Display employee login form"""
-        self.clear_window()
-        self.root.title("Employee Login")
-        
-        main_frame = ttk.Frame(self.root, padding="20")
-        main_frame.pack(expand=True, fill='both')
-        
+        self.show_screen('employee_login', "Employee Login")
+    
+    def _build_employee_login(self, main_frame):
         ttk.Label(main_frame, text="Employee Login", 
                  font=('Arial', 16, 'bold')).pack(pady=20)
         
@@ -96,20 +166,24 @@ class TimekeepingGUI:
                 employee = self.manager.verify_employee_login(emp_id, pin)
                 self.current_user = employee
                 self.show_employee_panel()
-            except (EmployeeNotFoundError, InvalidCredentialsError) as e:
+            except (EmployeeNotFoundError, InvalidCredentialsError, TooManyAttemptsError) as e:
                 messagebox.showerror("Login Failed", str(e))
         
+        def refresh():
+            # The cached form must not show the previous user's entries
+            emp_id_entry.delete(0, 'end')
+            pin_entry.delete(0, 'end')
+            emp_id_entry.focus_set()
+        
         ttk.Button(btn_frame, text="Login", command=login, width=15).pack(side='left', padx=5)
         ttk.Button(btn_frame, text="Back", command=self.show_login_screen, width=15).pack(side='left', padx=5)
+        return refresh
     
     def show_admin_login(self):
         """Display admin login form"""
-        self.clear_window()
-        self.root.title("Admin Login")
-        
-        main_frame = ttk.Frame(self.root, padding="20")
-        main_frame.pack(expand=True, fill='both')
-        
+        self.show_screen('admin_login', "Admin Login")
+    
+    def _build_admin_login(self, main_frame):
         ttk.Label(main_frame, text="Admin Login", 
                  font=('Arial', 16, 'bold')).pack(pady=20)
         
@@ -135,25 +209,27 @@ class TimekeepingGUI:
             try:
                 self.manager.verify_admin_login(pin)
                 self.show_admin_panel()
-            except InvalidCredentialsError as e:
+            except (InvalidCredentialsError, TooManyAttemptsError) as e:
                 messagebox.showerror("Login Failed", str(e))
         
+        def refresh():
+            pin_entry.delete(0, 'end')
+            pin_entry.focus_set()
+        
         ttk.Button(btn_frame, text="Login", command=login, width=15).pack(side='left', padx=5)
         ttk.Button(btn_frame, text="Back", command=self.show_login_screen, width=15).pack(side='left', padx=5)
+        return refresh
     
     def show_employee_panel(self):
         """Display employee control panel"""
-        self.clear_window()
-        self.root.title(f"Employee Panel - {self.current_user.name}")
-        
-        main_frame = ttk.Frame(self.root, padding="20")
-        main_frame.pack(expand=True, fill='both')
-        
-        ttk.Label(main_frame, text=f"Welcome, {self.current_user.name}!", 
-                 font=('Arial', 16, 'bold')).pack(pady=10)
+        self.show_screen('employee_panel', f"Employee Panel - {self.current_user.name}")
+    
+    def _build_employee_panel(self, main_frame):
+        welcome_label = ttk.Label(main_frame, font=('Arial', 16, 'bold'))
+        welcome_label.pack(pady=10)
         
-        ttk.Label(main_frame, text=f"Employee ID: {self.current_user.emp_id}",
-                 font=('Arial', 10)).pack()
+        emp_id_label = ttk.Label(main_frame, font=('Arial', 10))
+        emp_id_label.pack()
         
         # Summary frame
         summary_frame = ttk.LabelFrame(main_frame, text="Your Status", padding="15")
@@ -161,13 +237,19 @@ class TimekeepingGUI:
         
         summary_text = tk.Text(summary_frame, height=4, width=40, wrap='word')
         summary_text.pack()
-        summary_text.insert('1.0', self.manager.get_employee_summary(self.current_user.emp_id))
-        summary_text.config(state='disabled')
         
         # Action buttons
         btn_frame = ttk.Frame(main_frame)
         btn_frame.pack(pady=20)
         
+        def refresh():
+            welcome_label.config(text=f"Welcome, {self.current_user.name}!")
+            emp_id_label.config(text=f"Employee ID: {self.current_user.emp_id}")
+            summary_text.config(state='normal')
+            summary_text.delete('1.0', 'end')
+            summary_text.insert('1.0', self.manager.get_employee_summary(self.current_user.emp_id))
+            summary_text.config(state='disabled')
+        
         def time_in():
             success, message = self.manager.time_in_employee(self.current_user.emp_id)
             if success:
@@ -192,15 +274,13 @@ class TimekeepingGUI:
         ttk.Button(btn_frame, text="Time In", command=time_in, width=15).pack(pady=5)
         ttk.Button(btn_frame, text="Time Out", command=time_out, width=15).pack(pady=5)
         ttk.Button(btn_frame, text="Logout", command=self.show_login_screen, width=15).pack(pady=5)
+        return refresh
     
     def show_admin_panel(self):
         """Display admin control panel"""
-        self.clear_window()
-        self.root.title("Admin Panel")
-        
-        main_frame = ttk.Frame(self.root, padding="20")
-        main_frame.pack(expand=True, fill='both')
-        
+        self.show_screen('admin_panel', "Admin Panel")
+    
+    def _build_admin_panel(self, main_frame):
         ttk.Label(main_frame, text="Admin Panel", 
                  font=('Arial', 16, 'bold')).pack(pady=10)
         
@@ -208,17 +288,29 @@ class TimekeepingGUI:
         btn_frame = ttk.Frame(main_frame)
         btn_frame.pack(pady=20)
         
-        ttk.Button(btn_frame, text="Add Employee", 
-                  command=self.show_add_employee, width=25).pack(pady=5)
-        ttk.Button(btn_frame, text="View Employees", 
-                  command=self.show_employee_list, width=25).pack(pady=5)
-        ttk.Button(btn_frame, text="View Daily Report", 
-                  command=self.show_daily_report, width=25).pack(pady=5)
-        ttk.Button(btn_frame, text="Generate Weekly Report", 
-                  command=self.generate_weekly_report, width=25).pack(pady=5)
-        ttk.Button(btn_frame, text="Generate Monthly Report", 
-                  command=self.generate_monthly_report, width=25).pack(pady=5)
-        ttk.Button(btn_frame, text="Logout", 
+        actions = [
+            ("Add Employee", self.show_add_employee),
+            ("View Employees", self.show_employee_list),
+            ("View Daily Report", self.show_daily_report),
+            ("Generate Weekly Report", self.generate_weekly_report),
+            ("Generate Monthly Report", self.generate_monthly_report),
+            ("Generate Summary Reports", self.generate_summary_reports),
+            ("Generate Payroll", self.generate_payroll_report),
+            ("Generate Payslips", self.generate_payslips),
+            ("View Live Totals", self.show_live_totals),
+            ("Import Employees", self.import_employees),
+            ("Export Employees", self.export_employees),
+            ("Report Jobs", self.show_report_jobs),
+            ("Review Auto Time-Outs", self.show_auto_closed),
+        ]
+        # The board follows the manager's changes, which a thin client does not receive
+        if hasattr(self.manager, 'add_listener'):
+            actions.append(("Attendance Board", self.show_attendance_board))
+        for i, (text, command) in enumerate(actions):
+            ttk.Button(btn_frame, text=text, command=command,
+                      width=25).grid(row=i // 2, column=i % 2, padx=5, pady=5)
+        
+        ttk.Button(main_frame, text="Logout", 
                   command=self.show_login_screen, width=25).pack(pady=15)
     
     def show_add_employee(self):
@@ -281,6 +373,37 @@ class TimekeepingGUI:
         ttk.Button(btn_frame, text="Add Employee", command=add, width=15).pack(side='left', padx=5)
         ttk.Button(btn_frame, text="Cancel", command=add_window.destroy, width=15).pack(side='left', padx=5)
     
+    def import_employees(self):
+        """Queue a bulk employee import from a CSV or JSON-lines roster"""
+        from tkinter import filedialog
+        filename = filedialog.askopenfilename(
+            title="Import Employees",
+            filetypes=[("Roster files", "*.csv *.jsonl *.json"), ("All files", "*.*")])
+        if not filename:
+            return
+        
+        def generate(progress, cancel):
+            result = self.manager.import_employees(filename, progress, cancel)
+            message = result.summary()
+            if result.errors:
+                errors_filename = filename + ".errors.csv"
+                result.write_errors(errors_filename)
+                message += f" (see {errors_filename})"
+            return bool(result.imported) or not result.errors, message
+        
+        self.queue_report("Import Employees", generate)
+    
+    def export_employees(self):
+        """Queue a bulk employee export to CSV or JSON lines"""
+        from tkinter import filedialog
+        filename = filedialog.asksaveasfilename(
+            title="Export Employees", defaultextension=".csv",
+            filetypes=[("CSV", "*.csv"), ("JSON lines", "*.jsonl")])
+        if not filename:
+            return
+        self.queue_report("Export Employees",
+                          lambda progress, cancel: self.manager.export_employees(filename))
+    
     def show_employee_list(self):
         """Display list of all employees"""
         list_window = tk.Toplevel(self.root)
@@ -319,8 +442,164 @@ class TimekeepingGUI:
         
         ttk.Button(main_frame, text="Close", command=list_window.destroy, width=15).pack(pady=10)
     
+    def show_live_totals(self):
+        """Display running payroll totals without generating a report file"""
+        totals_window = tk.Toplevel(self.root)
+        totals_window.title("Live Totals")
+        totals_window.geometry("800x400")
+        
+        main_frame = ttk.Frame(totals_window, padding="20")
+        main_frame.pack(expand=True, fill='both')
+        
+        ttk.Label(main_frame, text="Live Payroll Totals", 
+                 font=('Arial', 14, 'bold')).pack(pady=10)
+        
+        tree_frame = ttk.Frame(main_frame)
+        tree_frame.pack(expand=True, fill='both')
+        
+        columns = [('emp_id', 'Employee ID', 90), ('name', 'Name', 150),
+                   ('today_hours', 'Hours Today', 90), ('today_etc', 'ETC Today', 90),
+                   ('week_hours', 'Hours (7 days)', 100), ('month_hours', 'Hours (30 days)', 100),
+                   ('month_etc', 'ETC (30 days)', 100), ('shifts', 'Shifts', 60)]
+        tree = ttk.Treeview(tree_frame, columns=[key for key, _, _ in columns], show='headings')
+        for key, title, width in columns:
+            tree.heading(key, text=title)
+            tree.column(key, width=width)
+        
+        scrollbar = ttk.Scrollbar(tree_frame, orient='vertical', command=tree.yview)
+        tree.configure(yscrollcommand=scrollbar.set)
+        tree.pack(side='left', expand=True, fill='both')
+        scrollbar.pack(side='right', fill='y')
+        
+        def refresh():
+            tree.delete(*tree.get_children())
+            for row in self.manager.get_live_totals():
+                tree.insert('', 'end', values=(
+                    row['emp_id'], row['name'],
+                    f"{row['today_hours']:.2f}", f"₱{row['today_etc']:.2f}",
+                    f"{row['week_hours']:.2f}", f"{row['month_hours']:.2f}",
+                    f"₱{row['month_etc']:.2f}", row['shifts']))
+        
+        refresh()
+        
+        btn_frame = ttk.Frame(main_frame)
+        btn_frame.pack(pady=10)
+        ttk.Button(btn_frame, text="Refresh", command=refresh, width=15).pack(side='left', padx=5)
+        ttk.Button(btn_frame, text="Close", command=totals_window.destroy, width=15).pack(side='left', padx=5)
+    
+    def show_attendance_board(self):
+        """Display who is timed in, updated from punches as they happen instead of reloaded"""
+        if self.board_window is not None and self.board_window.winfo_exists():
+            self.board_window.lift()
+            return
+        
+        from attendance import AttendanceBoard
+        board = AttendanceBoard(self.manager)
+        board_window = self.board_window = tk.Toplevel(self.root)
+        board_window.title("Attendance Board")
+        board_window.geometry("700x600")
+        
+        main_frame = ttk.Frame(board_window, padding="20")
+        main_frame.pack(expand=True, fill='both')
+        
+        count_label = ttk.Label(main_frame, text="", font=('Arial', 14, 'bold'))
+        count_label.pack(pady=10)
+        
+        def make_tree(title, columns, height):
+            ttk.Label(main_frame, text=title, font=('Arial', 11, 'bold')).pack(anchor='w')
+            tree_frame = ttk.Frame(main_frame)
+            tree_frame.pack(expand=True, fill='both', pady=(0, 10))
+            tree = ttk.Treeview(tree_frame, columns=[key for key, _, _ in columns],
+                                show='headings', height=height)
+            for key, title, width in columns:
+                tree.heading(key, text=title)
+                tree.column(key, width=width)
+            scrollbar = ttk.Scrollbar(tree_frame, orient='vertical', command=tree.yview)
+            tree.configure(yscrollcommand=scrollbar.set)
+            tree.pack(side='left', expand=True, fill='both')
+            scrollbar.pack(side='right', fill='y')
+            return tree
+        
+        active_tree = make_tree("Timed In", [('emp_id', 'Employee ID', 100), ('name', 'Name', 200),
+                                             ('time_in', 'Time In', 100), ('running', 'Running', 80)], 12)
+        completed_tree = make_tree("Finished Today", [
+            ('emp_id', 'Employee ID', 100), ('name', 'Name', 200), ('time_in', 'Time In', 80),
+            ('time_out', 'Time Out', 80), ('hours', 'Hours', 60), ('etc', 'ETC', 80)], 8)
+        
+        # Last running text shown per row, so a tick only touches rows whose minute changed
+        running = {}
+        
+        def running_text(time_log, now):
+            minutes = int(board.running_hours(time_log, now) * 60)
+            return f"{minutes // 60}:{minutes % 60:02d}"
+        
+        def show_in(time_log):
+            text = running[time_log.emp_id] = running_text(time_log, time.time())
+            values = (time_log.emp_id, time_log.emp_name, time_log.get_summary()['time_in'], text)
+            if active_tree.exists(time_log.emp_id):
+                active_tree.item(time_log.emp_id, values=values)
+            else:
+                active_tree.insert('', 'end', iid=time_log.emp_id, values=values)
+        
+        def show_out(time_log):
+            if time_log.emp_id in running and active_tree.exists(time_log.emp_id):
+                del running[time_log.emp_id]
+                active_tree.delete(time_log.emp_id)
+            summary = time_log.get_summary()
+            completed_tree.insert('', 0, iid="\0".join(map(str, board.key(time_log))), values=(
+                time_log.emp_id, time_log.emp_name, summary['time_in'], summary['time_out'],
+                f"{summary['hours_worked']:.2f}", f"₱{summary['etc']:.2f}"))
+        
+        def show_counts():
+            count_label.config(text=f"{len(board.active)} timed in, "
+                                    f"{len(board.completed)} finished today")
+        
+        def poll():
+            if not board_window.winfo_exists():
+                board.close()
+                return
+            diffs = board.changes()
+            for change, time_log in diffs:
+                if change == 'in':
+                    show_in(time_log)
+                elif change == 'out':
+                    show_out(time_log)
+                else:
+                    iid = "\0".join(map(str, board.key(time_log)))
+                    if completed_tree.exists(iid):
+                        completed_tree.delete(iid)
+            if diffs:
+                show_counts()
+            board_window.after(self.ATTENDANCE_POLL_MS, poll)
+        
+        def tick():
+            if not board_window.winfo_exists():
+                return
+            now = time.time()
+            for emp_id, time_log in board.active.items():
+                text = running_text(time_log, now)
+                if running.get(emp_id) != text:
+                    running[emp_id] = text
+                    active_tree.set(emp_id, 'running', text)
+            board_window.after(self.ATTENDANCE_TICK_MS, tick)
+        
+        def close():
+            board.close()
+            board_window.destroy()
+        
+        for time_log in board.active.values():
+            show_in(time_log)
+        for time_log in board.completed.values():
+            show_out(time_log)
+        show_counts()
+        
+        ttk.Button(main_frame, text="Close", command=close, width=15).pack()
+        board_window.protocol("WM_DELETE_WINDOW", close)
+        poll()
+        board_window.after(self.ATTENDANCE_TICK_MS, tick)
+    
     def show_daily_report(self):
-        """Display daily report"""
+        """Display daily report, loading rows a page at a time as the list scrolls"""
         report_window = tk.Toplevel(self.root)
         report_window.title("Daily Report")
         report_window.geometry("800x500")
@@ -331,41 +610,213 @@ class TimekeepingGUI:
         ttk.Label(main_frame, text="Daily Attendance Report", 
                  font=('Arial', 14, 'bold')).pack(pady=10)
         
-        # Text area with scrollbar
-        text_frame = ttk.Frame(main_frame)
-        text_frame.pack(expand=True, fill='both')
+        # Date filter
+        filter_frame = ttk.Frame(main_frame)
+        filter_frame.pack(fill='x', pady=5)
+        
+        ttk.Label(filter_frame, text="Date (YYYY-MM-DD):").pack(side='left', padx=5)
+        date_entry = ttk.Entry(filter_frame, width=15)
+        date_entry.pack(side='left', padx=5)
+        
+        # Treeview with scrollbar
+        tree_frame = ttk.Frame(main_frame)
+        tree_frame.pack(expand=True, fill='both')
+        
+        tree = ttk.Treeview(tree_frame, columns=DAILY_REPORT_HEADER, show='headings')
+        for column in DAILY_REPORT_HEADER:
+            tree.heading(column, text=column)
+            tree.column(column, width=100)
         
-        text_area = scrolledtext.ScrolledText(text_frame, wrap='word', width=90, height=20)
-        text_area.pack(expand=True, fill='both')
+        scrollbar = ttk.Scrollbar(tree_frame, orient='vertical', command=tree.yview)
+        tree.pack(side='left', expand=True, fill='both')
+        scrollbar.pack(side='right', fill='y')
         
-        # Load data
-        data = self.manager.get_daily_report_data()
-        if data:
-            for row in data:
-                text_area.insert('end', ' | '.join(str(cell) for cell in row) + '\n')
-        else:
-            text_area.insert('end', 'No data available.')
+        status_label = ttk.Label(main_frame, text="", font=('Arial', 9), foreground='gray')
+        status_label.pack()
+        
+        page = {'offset': 0, 'date': None, 'done': False}
+        
+        def load_page():
+            rows = self.manager.get_daily_report_data(page['offset'], self.DAILY_REPORT_PAGE_SIZE,
+                                                      page['date'])
+            for row in rows:
+                tree.insert('', 'end', values=row)
+            page['offset'] += len(rows)
+            page['done'] = len(rows) < self.DAILY_REPORT_PAGE_SIZE
+            if page['offset'] == 0:
+                status_label.config(text="No data available.")
+            else:
+                status_label.config(text=f"Showing {page['offset']} rows"
+                                         + ("" if page['done'] else " - scroll for more"))
         
-        text_area.config(state='disabled')
+        def on_scroll(first, last):
+            scrollbar.set(first, last)
+            # Fetch the next page once the view nears the end of what is loaded
+            if not page['done'] and float(last) >= 0.9:
+                load_page()
+        
+        def apply_filter():
+            page['date'] = date_entry.get().strip() or None
+            page['offset'] = 0
+            tree.delete(*tree.get_children())
+            load_page()
+        
+        tree.configure(yscrollcommand=on_scroll)
+        ttk.Button(filter_frame, text="Filter", command=apply_filter, width=10).pack(side='left', padx=5)
+        
+        load_page()
         
         ttk.Button(main_frame, text="Close", command=report_window.destroy, width=15).pack(pady=10)
     
     def generate_weekly_report(self):
-        """Generate weekly report"""
-        success, message = self.manager.generate_weekly_report()
-        if success:
-            messagebox.showinfo("Success", message)
-        else:
-            messagebox.showerror("Error", message)
+        """Queue weekly report generation"""
+        self.queue_report("Weekly Report", self.manager.generate_weekly_report)
     
     def generate_monthly_report(self):
-        """Generate monthly report"""
-        success, message = self.manager.generate_monthly_report()
-        if success:
-            messagebox.showinfo("Success", message)
-        else:
-            messagebox.showerror("Error", message)
+        """Queue monthly report generation"""
+        self.queue_report("Monthly Report", self.manager.generate_monthly_report)
+    
+    def generate_payroll_report(self):
+        """Queue payroll generation for the current pay period"""
+        self.queue_report("Payroll", self.manager.generate_payroll_report)
+    
+    def generate_payslips(self):
+        """Queue payslips for the current pay period, zipped into payslips.zip"""
+        self.queue_report("Payslips", self.manager.generate_payslips)
+    
+    def generate_summary_reports(self):
+        """Queue summary report generation"""
+        self.queue_report("Summary Reports", self.manager.generate_summary_reports)
+    
+    def queue_report(self, name, generate):
+        """Run a report on the job queue and show its progress"""
+        self.report_jobs.submit(name, generate)
+        self.show_report_jobs()
+    
+    def show_report_jobs(self):
+        """Display queued and finished report jobs, polled with root.after"""
+        if self.jobs_window is not None and self.jobs_window.winfo_exists():
+            self.jobs_window.lift()
+            return
+        
+        jobs_window = self.jobs_window = tk.Toplevel(self.root)
+        jobs_window.title("Report Jobs")
+        jobs_window.geometry("600x350")
+        
+        main_frame = ttk.Frame(jobs_window, padding="20")
+        main_frame.pack(expand=True, fill='both')
+        
+        columns = [('name', 'Report', 140), ('status', 'Status', 90),
+                   ('progress', 'Progress', 70), ('message', 'Message', 260)]
+        tree = ttk.Treeview(main_frame, columns=[key for key, _, _ in columns],
+                            show='headings', height=8)
+        for key, title, width in columns:
+            tree.heading(key, text=title)
+            tree.column(key, width=width)
+        tree.pack(expand=True, fill='both')
+        
+        progress_bar = ttk.Progressbar(main_frame, maximum=100)
+        progress_bar.pack(fill='x', pady=10)
+        
+        def poll():
+            if not jobs_window.winfo_exists():
+                return
+            shown = set(tree.get_children())
+            for job in self.report_jobs.jobs:
+                values = (job.name, job.status, f"{job.progress:.0%}", job.message)
+                iid = str(job.job_id)
+                if iid in shown:
+                    tree.item(iid, values=values)
+                else:
+                    tree.insert('', 'end', iid=iid, values=values)
+            running = [job for job in self.report_jobs.jobs if job.status == "Running"]
+            progress_bar['value'] = running[0].progress * 100 if running else 0
+            jobs_window.after(self.REPORT_POLL_MS, poll)
+        
+        def cancel_selected():
+            selected = set(tree.selection())
+            for job in self.report_jobs.jobs:
+                if str(job.job_id) in selected:
+                    job.cancel()
+        
+        def clear_finished():
+            self.report_jobs.clear_finished()
+            tree.delete(*tree.get_children())
+        
+        btn_frame = ttk.Frame(main_frame)
+        btn_frame.pack()
+        ttk.Button(btn_frame, text="Cancel Selected", command=cancel_selected, width=15).pack(side='left', padx=5)
+        ttk.Button(btn_frame, text="Clear Finished", command=clear_finished, width=15).pack(side='left', padx=5)
+        ttk.Button(btn_frame, text="Close", command=jobs_window.destroy, width=15).pack(side='left', padx=5)
+        
+        poll()
+    
+    def check_sessions(self):
+        """Time out sessions past their deadline, then check again later"""
+        self.scheduler.tick()
+        self.root.after(self.SESSION_CHECK_MS, self.check_sessions)
+    
+    def show_auto_closed(self):
+        """Display automatic time outs (and sessions flagged as overdue) for review"""
+        review_window = tk.Toplevel(self.root)
+        review_window.title("Auto Time-Outs")
+        review_window.geometry("850x400")
+        
+        main_frame = ttk.Frame(review_window, padding="20")
+        main_frame.pack(expand=True, fill='both')
+        
+        ttk.Label(main_frame, text="Automatic Time-Outs for Review", 
+                 font=('Arial', 14, 'bold')).pack(pady=10)
+        
+        tree_frame = ttk.Frame(main_frame)
+        tree_frame.pack(expand=True, fill='both')
+        
+        columns = [('status', 'Status', 90), ('emp_id', 'Employee ID', 90), ('name', 'Name', 130),
+                   ('date', 'Date', 90), ('time_in', 'Time In', 70), ('time_out', 'Time Out', 70),
+                   ('hours', 'Hours', 60), ('reason', 'Reason', 220)]
+        tree = ttk.Treeview(tree_frame, columns=[key for key, _, _ in columns], show='headings')
+        for key, title, width in columns:
+            tree.heading(key, text=title)
+            tree.column(key, width=width)
+        
+        scrollbar = ttk.Scrollbar(tree_frame, orient='vertical', command=tree.yview)
+        tree.configure(yscrollcommand=scrollbar.set)
+        tree.pack(side='left', expand=True, fill='both')
+        scrollbar.pack(side='right', fill='y')
+        
+        def refresh():
+            tree.delete(*tree.get_children())
+            for time_log, reason in self.manager.auto_closed_sessions():
+                summary = time_log.get_summary()
+                tree.insert('', 'end', iid=f"{time_log.emp_id}\0{time_log.time_in_ts}", values=(
+                    "Timed out", time_log.emp_id, time_log.emp_name, time_log.date,
+                    summary['time_in'], summary['time_out'], f"{summary['hours_worked']:.2f}", reason))
+            flagged = self.scheduler.flagged.values() if self.scheduler is not None else []
+            for time_log, reason in list(flagged):
+                summary = time_log.get_summary()
+                tree.insert('', 'end', values=(
+                    "Still in", time_log.emp_id, time_log.emp_name, time_log.date,
+                    summary['time_in'], "", "", reason))
+        
+        def mark_reviewed():
+            for iid in tree.selection():
+                emp_id, _, time_in_ts = iid.partition("\0")
+                if time_in_ts:
+                    self.manager.mark_reviewed(emp_id, int(time_in_ts))
+            refresh()
+        
+        refresh()
+        
+        btn_frame = ttk.Frame(main_frame)
+        btn_frame.pack(pady=10)
+        ttk.Button(btn_frame, text="Mark Reviewed", command=mark_reviewed, width=15).pack(side='left', padx=5)
+        ttk.Button(btn_frame, text="Refresh", command=refresh, width=15).pack(side='left', padx=5)
+        ttk.Button(btn_frame, text="Close", command=review_window.destroy, width=15).pack(side='left', padx=5)
     
     def run(self):
         """Run the application"""
-        self.root.mainloop()
\ No newline at end of file
+        self.root.mainloop()
+        self.report_jobs.close()
+        if self.scheduler is not None:
+            self.scheduler.close()
+        self.manager.close()
\ No newline at end of file
@@ -0,0 +1,167 @@
+"""
+Journal Module - Append-only write-ahead journal for time in/out events
+"""
+import json
+import os
+import threading
+import time
+
+
+class Journal:
+    """JSON-lines event journal with group commit
+    
+    Events go through one open file handle. A background flusher fsyncs at
+    most once per `fsync_interval` seconds and `append` waits for the fsync
+    covering its event, so a burst of punches shares a single disk flush.
+    An interval of 0 fsyncs every event inline. With wait_for_sync=False,
+    appends return immediately and callers use on_durable instead.
+    """
+    
+    def __init__(self, path="punches.journal", fsync_interval=0.01, wait_for_sync=True):
+        self.path = path
+        self.fsync_interval = fsync_interval
+        self.wait_for_sync = wait_for_sync
+        self._lock = threading.Lock()
+        self._fsync_lock = threading.Lock()  # Keeps the handle open while the flusher syncs it
+        self._synced = threading.Condition(self._lock)
+        self._written = 0
+        self._durable = 0
+        self._callbacks = []  # (seq, callback) waiting for an fsync
+        self._closed = False
+        self._file = open(path, 'a', encoding='utf-8')
+        
+        self._flusher = None
+        if fsync_interval > 0:
+            self._flusher = threading.Thread(target=self._flush_loop, name="journal-flusher",
+                                             daemon=True)
+            self._flusher.start()
+    
+    @property
+    def last_seq(self):
+        """Sequence number of the most recently written event"""
+        return self._written
+    
+    def append(self, event, wait=None):
+        """Write an event and return its sequence number
+        
+        Blocks until the event is on disk unless wait (default:
+        wait_for_sync) is False.
+        """
+        if wait is None:
+            wait = self.wait_for_sync
+        line = json.dumps(event, separators=(',', ':')) + '\n'
+        with self._lock:
+            self._file.write(line)
+            self._written += 1
+            seq = self._written
+            if self._flusher is None:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+                self._durable = seq
+                return seq
+            while wait and self._durable < seq and not self._closed:
+                self._synced.wait()
+        return seq
+    
+    def on_durable(self, seq, callback):
+        """Call callback() (from the flusher thread) once event seq is on disk"""
+        with self._lock:
+            if self._durable < seq and not self._closed:
+                self._callbacks.append((seq, callback))
+                return
+        callback()
+    
+    def record_time_in(self, time_log):
+        """Journal a time in before it is applied"""
+        return self.append({
+            'type': 'time_in',
+            'emp_id': time_log.emp_id,
+            'emp_name': time_log.emp_name,
+            'hourly_rate': time_log.hourly_rate,
+            'date': time_log.date,
+            'time_in': time_log.time_in_ts
+        })
+    
+    def record_time_out(self, time_log):
+        """Journal a time out before it is applied"""
+        return self.append({
+            'type': 'time_out',
+            'emp_id': time_log.emp_id,
+            'time_in': time_log.time_in_ts,
+            'time_out': time_log.time_out_ts
+        })
+    
+    def replay(self):
+        """Yield every event in the journal, ignoring a torn final line"""
+        with self._lock:
+            self._file.flush()
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    break  # Partial write from a crash; nothing valid follows
+    
+    def last_events(self):
+        """Return the most recent event per employee"""
+        latest = {}
+        for event in self.replay():
+            latest[event['emp_id']] = event
+        return latest
+    
+    def compact(self, events):
+        """Atomically replace the journal contents with the given events"""
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for event in events:
+                f.write(json.dumps(event, separators=(',', ':')) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        
+        with self._fsync_lock, self._lock:
+            self._file.close()
+            os.replace(tmp_path, self.path)
+            self._file = open(self.path, 'a', encoding='utf-8')
+    
+    def close(self):
+        """Flush outstanding events and close the file"""
+        with self._fsync_lock, self._lock:
+            if self._closed:
+                return
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._durable = self._written
+            self._closed = True
+            self._file.close()
+            self._synced.notify_all()
+            ready = [callback for _, callback in self._callbacks]
+            self._callbacks = []
+        
+        for callback in ready:
+            callback()
+    
+    def _flush_loop(self):
+        """Group commit: fsync everything written since the previous pass"""
+        while True:
+            time.sleep(self.fsync_interval)
+            with self._fsync_lock:
+                with self._lock:
+                    if self._closed:
+                        return
+                    if self._durable == self._written:
+                        continue
+                    self._file.flush()
+                    target = self._written
+                
+                # Writers keep appending while the disk flush runs
+                os.fsync(self._file.fileno())
+                
+                with self._lock:
+                    self._durable = max(self._durable, target)
+                    self._synced.notify_all()
+                    ready = [callback for seq, callback in self._callbacks if seq <= self._durable]
+                    self._callbacks = [(seq, callback) for seq, callback in self._callbacks
+                                       if seq > self._durable]
+            
+            for callback in ready:
+                callback()
\ No newline at end of file
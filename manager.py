@@ -2,72 +2,324 @@
 Manager Module - Handles employee management and report generation
 """
 import csv
+import itertools
 import os
-from datetime import datetime, timedelta
-from models import Employee, Admin, EmployeeNotFoundError, InvalidCredentialsError
+import threading
+import traceback
+from datetime import datetime
+from credentials import CredentialVerifier, hash_pin, needs_upgrade
+from models import (Employee, Admin, EmployeeNotFoundError, InvalidCredentialsError,
+                    ReportCancelledError, TooManyAttemptsError)
+from reports import DAILY_REPORT_HEADER, PartitionedDailyReport
+from payroll import PAYROLL_REPORT_HEADER, PayrollRules, pay_period
+from payslips import (PAYSLIP_BATCH, PAYSLIP_FORMATS, group_payslips, period_label,
+                      render_batch, write_payslips, written_files)
+from report_cache import ReportCache, file_signature
+from roster import RosterImport, export_roster
+from running_totals import RunningTotals
+from storage import Storage
 from timelog import TimeLog
+from timelog_store import TimeLogStore, date_key, report_window_start
+from writer import OutputWriter
+
+REPORT_CHUNK = 10000  # Rows handled between progress updates and cancel checks
+
+
+def report_checkpoint(progress, cancel, fraction):
+    """Report progress and stop the report if it has been cancelled"""
+    if cancel is not None and cancel.is_set():
+        raise ReportCancelledError("Report cancelled!")
+    if progress is not None:
+        progress(fraction)
+
+
+def report_steps(count, progress=None, cancel=None, first=0.0, last=1.0):
+    """Yield the start of each REPORT_CHUNK of `count` rows, with progress running first..last"""
+    for start in range(0, count, REPORT_CHUNK):
+        report_checkpoint(progress, cancel, first + (last - first) * start / count)
+        yield start
+
 
 class SystemManager:
-    """Main system manager for the payroll system"""
+    """Main system manager for the payroll system
     
-    def __init__(self):
-        self.employees = {}
+    Safe to call from several threads. Punches take a lock striped by
+    employee ID, so punches for different employees run in parallel while
+    the check-then-act on one employee's session cannot interleave. The
+    shared history (time logs and running totals) has its own lock, and all
+    report and file output goes through a single writer thread.
+    """
+    
+    PUNCH_LOCK_STRIPES = 64
+    ADMIN_ID = "\0admin"  # Credential key for the admin; no employee ID contains NUL
+    
+    def __init__(self, storage=None, journal=None, daily_report=None, payroll_rules=None):
+        self.storage = storage if storage is not None else Storage()
+        self.journal = journal
+        self.daily_report = daily_report if daily_report is not None else PartitionedDailyReport()
+        self.writer = OutputWriter()
         self.admin = Admin()
-        self.time_logs = []
-        self.active_sessions = {}  # Track active employee sessions
-        # No default data - empty employee list
+        self.payroll_rules = payroll_rules if payroll_rules is not None else PayrollRules()
+        self.credentials = CredentialVerifier()
+        self.report_cache = ReportCache()
+        # Bumped whenever a time log closes or an employee is added; keys the report cache
+        self.data_version = 0
+        self._versions = itertools.count(1)
+        self._punch_locks = [threading.Lock() for _ in range(self.PUNCH_LOCK_STRIPES)]
+        # Never acquire _load_lock while holding _history_lock
+        self._load_lock = threading.RLock()
+        self._history_lock = threading.Lock()
+        self._roster_lock = threading.Lock()
+        # Lets display reads skip the writer queue without seeing a half-written row
+        self._daily_report_lock = threading.Lock()
+        self._listeners = ()
+        self._write_ahead_listeners = ()
+        # State is loaded from storage on first use
+        self._employees = None
+        self._active_sessions = None
+        self._time_logs = None
+        self._running_totals = None
+        self._auto_closed = None
+    
+    @property
+    def employees(self):
+        """Registered employees keyed by ID"""
+        if self._employees is None:
+            with self._load_lock:
+                if self._employees is None:
+                    self._employees = {emp.emp_id: emp for emp in self.storage.load_employees()}
+        return self._employees
+    
+    @property
+    def active_sessions(self):
+        """Open time logs keyed by employee ID"""
+        if self._active_sessions is None:
+            with self._load_lock:
+                if self._active_sessions is None:
+                    sessions = {log.emp_id: log for log in self.storage.load_active_sessions()}
+                    if self.journal is not None:
+                        self._recover_from_journal(sessions)
+                    self._active_sessions = sessions
+        return self._active_sessions
+    
+    @property
+    def time_logs(self):
+        """Closed time logs indexed by date and employee"""
+        if self._time_logs is None:
+            with self._load_lock:
+                if self._time_logs is None:
+                    self._time_logs = TimeLogStore(self.storage.load_time_logs())
+        return self._time_logs
+    
+    @property
+    def running_totals(self):
+        """Rolling 30-day payroll totals, seeded from the time logs on first use"""
+        if self._running_totals is None:
+            with self._load_lock:
+                if self._running_totals is None:
+                    time_logs = self.time_logs
+                    running_totals = RunningTotals(30)
+                    with self._history_lock:
+                        for time_log in time_logs.query(start=report_window_start(30)):
+                            running_totals.add(time_log)
+                    self._running_totals = running_totals
+        return self._running_totals
+    
+    @property
+    def auto_closed(self):
+        """(time log, reason) for automatic time outs awaiting admin review"""
+        if self._auto_closed is None:
+            with self._load_lock:
+                if self._auto_closed is None:
+                    self._auto_closed = self.storage.load_auto_closed()
+        return self._auto_closed
+    
+    def _punch_lock(self, emp_id):
+        """Lock serializing punches for one employee (shared with other IDs in its stripe)"""
+        return self._punch_locks[hash(emp_id) % self.PUNCH_LOCK_STRIPES]
+    
+    def _recover_from_journal(self, sessions):
+        """Replay punches journaled before a crash over the stored sessions"""
+        open_events = []
+        for emp_id, event in self.journal.last_events().items():
+            time_in = int(event['time_in'])
+            session = sessions.get(emp_id)
+            
+            if event['type'] == 'time_in':
+                if session is None:
+                    session = TimeLog.from_epoch(emp_id, event['emp_name'], event['hourly_rate'],
+                                                 date_key(event['date']), time_in)
+                    self._write_ahead('time_in', session)
+                    self.storage.save_active_session(session)
+                    sessions[emp_id] = session
+                    self._publish('time_in', session)
+                open_events.append(event)
+            elif session is not None and session.time_in_ts == time_in:
+                # Time out reached the journal but was never applied
+                session.record_time_out(datetime.fromtimestamp(event['time_out']))
+                self._write_ahead('time_out', session)
+                self._add_closed_log(session)
+                del sessions[emp_id]
+                self._publish('time_out', session)
+                self.save_daily_report(session)
+        
+        # Only open shifts are needed to recover from the next crash
+        self.journal.compact(open_events)
+    
+    def _add_closed_log(self, time_log):
+        """Persist a closed time log and add it to the in-memory history"""
+        # Load history first, otherwise the log would be read back from storage and added twice
+        time_logs = self.time_logs
+        running_totals = self.running_totals
+        self.storage.close_session(time_log)
+        with self._history_lock:
+            running_totals.add(time_log)
+            time_logs.append(time_log)
+            self.data_version = next(self._versions)
+    
+    def add_listener(self, listener, write_ahead=False):
+        """Call listener(event_type, item) after each change
+        
+        event_type is 'time_in' or 'time_out' with the TimeLog, or
+        'employee_added' with the Employee. Listeners run on the thread that
+        made the change, in order per employee, so they must be quick.
+        
+        A write-ahead listener is called instead just before the change is
+        written to storage (after the journal), so a durable log it keeps
+        never lacks a change that storage has. Replaying the journal after a
+        crash may call it again for a change it already saw.
+        """
+        if write_ahead:
+            self._write_ahead_listeners = self._write_ahead_listeners + (listener,)
+        else:
+            self._listeners = self._listeners + (listener,)
+    
+    def remove_listener(self, listener):
+        """Stop calling a listener added with add_listener"""
+        self._listeners = tuple(l for l in self._listeners if l != listener)
+        self._write_ahead_listeners = tuple(l for l in self._write_ahead_listeners if l != listener)
+    
+    def _publish(self, event_type, item):
+        for listener in self._listeners:
+            listener(event_type, item)
+    
+    def _write_ahead(self, event_type, item):
+        for listener in self._write_ahead_listeners:
+            listener(event_type, item)
+    
+    def close(self):
+        """Flush and release the journal, daily report and storage"""
+        if self.journal is not None:
+            self.journal.close()
+        self.writer.close()
+        with self._daily_report_lock:
+            self.daily_report.close()
+        self.storage.close()
     
     def verify_employee_login(self, emp_id, pin):
         """Verify employee credentials"""
         if emp_id not in self.employees:
             raise EmployeeNotFoundError("Employee ID not found!")
         
-        if self.employees[emp_id].pin != pin:
+        emp = self.employees[emp_id]
+        if not self.credentials.allow(emp_id):
+            raise TooManyAttemptsError("Too many login attempts! Please try again later.")
+        if not self.credentials.verify(emp_id, pin, emp.pin):
             raise InvalidCredentialsError("Invalid PIN!")
         
-        return self.employees[emp_id]
+        if needs_upgrade(emp.pin):
+            # Plaintext (or weaker) PIN from an older database
+            emp.pin = hash_pin(pin)
+            self.storage.update_employee_pin(emp)
+        return emp
     
     def verify_admin_login(self, pin):
         """Verify admin credentials"""
-        if not self.admin.verify_pin(pin):
+        if not self.credentials.allow(self.ADMIN_ID):
+            raise TooManyAttemptsError("Too many login attempts! Please try again later.")
+        if not self.credentials.verify(self.ADMIN_ID, pin, self.admin.pin_hash):
             raise InvalidCredentialsError("Invalid Admin PIN!")
         return True
     
     def add_employee(self, emp_id, name, pin, hourly_rate):
         """Add a new employee"""
-        if emp_id in self.employees:
+        employees = self.employees
+        if emp_id in employees:
             return False, "Employee ID already exists!"
         
-        new_emp = Employee(emp_id, name, pin, hourly_rate)
-        self.employees[emp_id] = new_emp
+        pin_hash = hash_pin(pin)  # Slow on purpose; done outside the lock
+        with self._roster_lock:
+            if emp_id in employees:
+                return False, "Employee ID already exists!"
+            
+            new_emp = Employee(emp_id, name, pin_hash, hourly_rate)
+            self._write_ahead('employee_added', new_emp)
+            self.storage.save_employee(new_emp)
+            employees[emp_id] = new_emp
+            self.data_version = next(self._versions)
+            self._publish('employee_added', new_emp)
         return True, "Employee added successfully!"
     
+    def import_employees(self, filename, progress=None, cancel=None):
+        """Bulk-add employees from a CSV or JSON-lines roster
+        
+        Valid rows with new IDs are saved in one transaction; rejected rows
+        are listed in the returned RosterImport's errors. Cancelling rolls
+        the whole import back.
+        """
+        employees = self.employees
+        result = RosterImport(filename)
+        # Validate and hash every row first: holding the roster or storage lock
+        # through the PIN hashing would hold up every punch for the whole import
+        batches = list(result.batches(employees,
+                                      lambda fraction: report_checkpoint(progress, cancel, fraction)))
+        with self._roster_lock:
+            batches = result.drop_existing(batches, employees)
+            for employee in result.imported:
+                self._write_ahead('employee_added', employee)
+            self.storage.save_employees(batches)
+            for employee in result.imported:
+                employees[employee.emp_id] = employee
+                self._publish('employee_added', employee)
+            if result.imported:
+                self.data_version = next(self._versions)
+        report_checkpoint(progress, None, 1.0)
+        return result
+    
+    def export_employees(self, filename):
+        """Write the roster, with PIN hashes, as CSV or JSON lines"""
+        count = self.writer.run(export_roster, list(self.employees.values()), filename)
+        return True, f"Exported {count} employees to {filename}"
+    
     def time_in_employee(self, emp_id):
         """Record employee time in"""
-        if emp_id in self.active_sessions:
-            return False, "You are already timed in!"
-        
-        emp = self.employees[emp_id]
-        time_log = TimeLog(emp.emp_id, emp.name, emp.hourly_rate)
-        time_in_str = time_log.record_time_in()
-        
-        self.active_sessions[emp_id] = time_log
+        active_sessions = self.active_sessions
+        with self._punch_lock(emp_id):
+            if emp_id in active_sessions:
+                return False, "You are already timed in!"
+            
+            emp = self.employees[emp_id]
+            time_log = TimeLog(emp.emp_id, emp.name, emp.hourly_rate)
+            time_in_str = time_log.record_time_in()
+            if self.journal is not None:
+                self.journal.record_time_in(time_log)
+            self._write_ahead('time_in', time_log)
+            self.storage.save_active_session(time_log)
+            
+            active_sessions[emp_id] = time_log
+            self._publish('time_in', time_log)
         
         return True, f"Time In recorded at {time_in_str}"
     
-    def time_out_employee(self, emp_id):
-        """Record employee time out"""
-        if emp_id not in self.active_sessions:
-            return False, "You must time in first!"
-        
-        time_log = self.active_sessions[emp_id]
-        time_out_str = time_log.record_time_out()
-        
-        # Save to time logs
-        self.time_logs.append(time_log)
-        
-        # Remove from active sessions
-        del self.active_sessions[emp_id]
+    def time_out_employee(self, emp_id, at=None):
+        """Record employee time out (now, unless a time is given)"""
+        active_sessions = self.active_sessions
+        with self._punch_lock(emp_id):
+            if emp_id not in active_sessions:
+                return False, "You must time in first!"
+            
+            time_log = active_sessions[emp_id]
+            time_out_str = self._close_session(time_log, at)
         
         # Save to daily report
         self.save_daily_report(time_log)
@@ -77,10 +329,57 @@ class SystemManager:
                      f"Hours Worked: {summary['hours_worked']:.2f} hours\n"
                      f"ETC: ₱{summary['etc']:.2f}")
     
+    def auto_close_session(self, emp_id, time_in_ts, at, reason):
+        """Time out a forgotten session at `at` and list it for admin review
+        
+        Returns the closed TimeLog, or None when that session (matched by its
+        time in) was already timed out.
+        """
+        active_sessions = self.active_sessions
+        auto_closed = self.auto_closed
+        with self._punch_lock(emp_id):
+            time_log = active_sessions.get(emp_id)
+            if time_log is None or time_log.time_in_ts != time_in_ts:
+                return None
+            
+            self._close_session(time_log, at)
+            self.storage.save_auto_closed(time_log, reason)
+            auto_closed.append((time_log, reason))
+        
+        self.save_daily_report(time_log)
+        return time_log
+    
+    def auto_closed_sessions(self):
+        """Automatic time outs awaiting review, as (time log, reason) pairs"""
+        return list(self.auto_closed)
+    
+    def mark_reviewed(self, emp_id, time_in_ts):
+        """Take an automatic time out off the review list"""
+        self.storage.mark_reviewed(emp_id, time_in_ts)
+        auto_closed = self.auto_closed
+        for item in list(auto_closed):
+            if (item[0].emp_id, item[0].time_in_ts) == (emp_id, time_in_ts):
+                auto_closed.remove(item)  # In place: the scheduler may be appending
+    
+    def _close_session(self, time_log, at=None):
+        """Time out an active session (caller holds its punch lock); returns the time out text"""
+        time_out_str = time_log.record_time_out(at)
+        if self.journal is not None:
+            self.journal.record_time_out(time_log)
+        
+        # Save to time logs and roll into the running totals
+        self._write_ahead('time_out', time_log)
+        self._add_closed_log(time_log)
+        
+        # Remove from active sessions
+        del self.active_sessions[time_log.emp_id]
+        self._publish('time_out', time_log)
+        return time_out_str
+    
     def get_employee_summary(self, emp_id):
         """Get current employee summary"""
-        if emp_id in self.active_sessions:
-            time_log = self.active_sessions[emp_id]
+        time_log = self.active_sessions.get(emp_id)
+        if time_log is not None:
             summary = time_log.get_summary()
             return (f"Current Status: Timed In\n"
                    f"Time In: {summary['time_in']}\n"
@@ -95,90 +394,277 @@ class SystemManager:
         return list(self.employees.values())
     
     def save_daily_report(self, time_log):
-        """Save individual time log to daily report"""
-        filename = "daily_report.csv"
-        file_exists = os.path.isfile(filename)
-        
-        with open(filename, 'a', newline='') as f:
-            writer = csv.writer(f)
-            if not file_exists:
-                writer.writerow(['Employee ID', 'Employee Name', 'Date', 
-                               'Time In', 'Time Out', 'Hours Worked', 'ETC'])
-            writer.writerow(time_log.to_csv_row())
-    
-    def generate_weekly_report(self):
-        """Generate weekly payroll report"""
+        """Queue an individual time log for the daily report"""
+        future = self.writer.submit(self._append_daily_report, time_log.to_csv_row())
+        future.add_done_callback(self._daily_report_saved)
+        return future
+    
+    def _append_daily_report(self, row):
+        with self._daily_report_lock:
+            return self.daily_report.append(row)
+    
+    @staticmethod
+    def _daily_report_saved(future):
+        # Nobody waits on the future, so a failed append would otherwise go unseen
+        error = future.exception()
+        if error is not None:
+            traceback.print_exception(error)
+    
+    def history(self, start=None, end=None, emp_id=None):
+        """Snapshot of closed time logs dated between start and end (inclusive)"""
+        time_logs = self.time_logs
+        with self._history_lock:
+            return time_logs.query(start, end, emp_id)
+    
+    def live_employee_totals(self, days=None):
+        """Snapshot of the running totals over the last `days` days"""
+        running_totals = self.running_totals
+        with self._history_lock:
+            return running_totals.employee_totals(days)
+    
+    @staticmethod
+    def _write_csv(filename, header, rows, progress=None, cancel=None, first=0.0, last=1.0):
+        """Write a header and rows to a CSV file (runs on the writer thread)
+        
+        The file is replaced only once every row is written, so a cancelled
+        report leaves the previous file in place.
+        """
+        temp_filename = filename + ".tmp"
+        try:
+            with open(temp_filename, 'w', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(header)
+                for start in report_steps(len(rows), progress, cancel, first, last):
+                    writer.writerows(rows[start:start + REPORT_CHUNK])
+            os.replace(temp_filename, filename)
+        except BaseException:
+            if os.path.exists(temp_filename):
+                os.remove(temp_filename)
+            raise
+    
+    def _cached_report(self, key, filenames, progress, generate):
+        """Return generate()'s (success, message), or the cached result of an identical earlier run
+        
+        The key is extended with the data version, and a hit also requires
+        the report files to be exactly as that run wrote them. `filenames`
+        may instead be a function returning them, for output whose files are
+        only known once written. Only successful runs are cached.
+        """
+        key += (self.data_version,)
+        names = filenames if callable(filenames) else lambda: filenames
+        cached = self.report_cache.get(key, lambda value: value[1] == file_signature(names()))
+        if cached is not None:
+            report_checkpoint(progress, None, 1.0)
+            success, message = cached[0]
+            return success, message + " (unchanged since the last run)"
+        
+        result = generate()
+        if result[0]:
+            self.report_cache.put(key, (result, file_signature(names())))
+        return result
+    
+    def generate_weekly_report(self, progress=None, cancel=None):
+        """Generate weekly payroll report
+        
+        progress(fraction) is called as the report is built; setting the
+        `cancel` event stops it with ReportCancelledError. Reports are
+        cached: until a time log closes or an employee is added, asking
+        again returns the last result without rewriting the file.
+        """
+        return self._cached_report(('weekly', report_window_start(7)), ["weekly_report.csv"],
+                                   progress, lambda: self._weekly_report(progress, cancel))
+    
+    def _weekly_report(self, progress, cancel):
         if not self.time_logs:
             return False, "No time logs available!"
         
         filename = "weekly_report.csv"
         
         # Get logs from last 7 days
-        today = datetime.now()
-        week_ago = today - timedelta(days=7)
+        weekly_logs = self.history(start=report_window_start(7))
         
-        weekly_logs = [log for log in self.time_logs 
-                      if datetime.strptime(log.date, "%Y-%m-%d") >= week_ago]
-        
-        with open(filename, 'w', newline='') as f:
-            writer = csv.writer(f)
-            writer.writerow(['Employee ID', 'Employee Name', 'Date', 
-                           'Time In', 'Time Out', 'Hours Worked', 'ETC'])
-            
-            for log in weekly_logs:
-                writer.writerow(log.to_csv_row())
+        rows = []
+        for start in report_steps(len(weekly_logs), progress, cancel, 0.0, 0.5):
+            rows.extend(weekly_logs.to_csv_row(i)
+                        for i in range(start, min(start + REPORT_CHUNK, len(weekly_logs))))
+        self.writer.run(self._write_csv, filename, DAILY_REPORT_HEADER, rows,
+                        progress, cancel, 0.5, 1.0)
+        report_checkpoint(progress, None, 1.0)
         
         return True, f"Weekly report saved to {filename}"
     
-    def generate_monthly_report(self):
-        """Generate monthly payroll report"""
+    def generate_monthly_report(self, progress=None, cancel=None):
+        """Generate monthly payroll report (progress, cancel and caching as for the weekly report)"""
+        return self._cached_report(('monthly', report_window_start(30)), ["monthly_report.csv"],
+                                   progress, lambda: self._monthly_report(progress, cancel))
+    
+    def _monthly_report(self, progress, cancel):
         if not self.time_logs:
             return False, "No time logs available!"
         
         filename = "monthly_report.csv"
         
-        # Get logs from last 30 days
-        today = datetime.now()
-        month_ago = today - timedelta(days=30)
-        
-        monthly_logs = [log for log in self.time_logs 
-                       if datetime.strptime(log.date, "%Y-%m-%d") >= month_ago]
-        
-        # Calculate totals per employee
-        employee_totals = {}
-        for log in monthly_logs:
-            if log.emp_id not in employee_totals:
-                employee_totals[log.emp_id] = {
-                    'name': log.emp_name,
-                    'total_hours': 0,
-                    'total_etc': 0,
-                    'days_worked': 0
-                }
-            employee_totals[log.emp_id]['total_hours'] += log.hours_worked
-            employee_totals[log.emp_id]['total_etc'] += log.etc
-            employee_totals[log.emp_id]['days_worked'] += 1
-        
-        with open(filename, 'w', newline='') as f:
-            writer = csv.writer(f)
-            writer.writerow(['Employee ID', 'Employee Name', 'Days Worked',
-                           'Total Hours', 'Total ETC'])
-            
-            for emp_id, data in employee_totals.items():
-                writer.writerow([
-                    emp_id,
-                    data['name'],
-                    data['days_worked'],
-                    round(data['total_hours'], 2),
-                    round(data['total_etc'], 2)
-                ])
+        # Totals over the last 30 days are maintained as each time log closes
+        employee_totals = self.live_employee_totals()
+        
+        rows = []
+        for emp_id, data in employee_totals.items():
+            rows.append([
+                emp_id,
+                data['name'],
+                data['days_worked'],
+                round(data['total_hours'], 2),
+                round(data['total_etc'], 2)
+            ])
+        report_checkpoint(progress, cancel, 0.5)
+        self.writer.run(self._write_csv, filename, ['Employee ID', 'Employee Name', 'Days Worked',
+                                                    'Total Hours', 'Total ETC'], rows,
+                        progress, cancel, 0.5, 1.0)
+        report_checkpoint(progress, None, 1.0)
         
         return True, f"Monthly report saved to {filename}"
     
-    def get_daily_report_data(self):
-        """Get daily report data for display"""
-        if not os.path.isfile("daily_report.csv"):
-            return []
+    def generate_payroll_report(self, start=None, end=None, progress=None, cancel=None):
+        """Generate the payroll for a pay period (the current semi-monthly one by default)
+        
+        Applies the manager's payroll rules: overtime, night differential,
+        rest-day and holiday pay. progress, cancel and caching work as for
+        the weekly report.
+        """
+        if start is None or end is None:
+            start, end = pay_period()
+        # The rules are part of the key: changing them must not serve the old figures
+        key = ('payroll', date_key(start), date_key(end), self.payroll_rules.digest())
+        return self._cached_report(key, ["payroll_report.csv"], progress,
+                                   lambda: self._payroll_report(start, end, progress, cancel))
+    
+    def _payroll_report(self, start, end, progress, cancel):
+        logs = self.history(start, end)
+        if not logs:
+            return False, "No time logs in this pay period!"
+        
+        filename = "payroll_report.csv"
+        report_checkpoint(progress, cancel, 0.0)
+        rows = self.payroll_rules.compile(start, end).report_rows(logs)
+        report_checkpoint(progress, cancel, 0.8)
+        self.writer.run(self._write_csv, filename, PAYROLL_REPORT_HEADER, rows,
+                        progress, cancel, 0.8, 1.0)
+        report_checkpoint(progress, None, 1.0)
+        
+        return True, f"Payroll for {start} to {end} saved to {filename}"
+    
+    def generate_payslips(self, start=None, end=None, output="payslips.zip", formats=PAYSLIP_FORMATS,
+                          progress=None, cancel=None):
+        """Write every employee's payslip for a pay period (the current one by default)
+        
+        Logs are grouped by employee in one pass, then rendered in batches on
+        a process pool while the writer thread streams them into `output`, a
+        .zip file or a directory, with a manifest.csv. progress, cancel and
+        caching work as for the weekly report.
+        """
+        if start is None or end is None:
+            start, end = pay_period()
+        key = ('payslips', date_key(start), date_key(end), output, tuple(formats),
+               self.payroll_rules.digest())
+        # Every payslip file counts, so a deleted or edited one is written again
+        return self._cached_report(key, lambda: written_files(output), progress,
+                                   lambda: self._payslips(start, end, output, formats, progress, cancel))
+    
+    def _payslips(self, start, end, output, formats, progress, cancel):
+        unknown = set(formats) - set(PAYSLIP_FORMATS)
+        if unknown:
+            return False, f"Unknown payslip format: {', '.join(sorted(unknown))}!"
+        logs = self.history(start, end)
+        if not logs:
+            return False, "No time logs in this pay period!"
+        
+        report_checkpoint(progress, cancel, 0.0)
+        payslips = group_payslips(logs, self.payroll_rules.compile(start, end))
+        report_checkpoint(progress, cancel, 0.1)
+        period = period_label(start, end)
+        batches = [payslips[i:i + PAYSLIP_BATCH] for i in range(0, len(payslips), PAYSLIP_BATCH)]
+        
+        pool = None
+        try:
+            if len(batches) > 1:
+                from concurrent.futures import ProcessPoolExecutor  # Only large runs need it
+                pool = ProcessPoolExecutor()
+                rendered = pool.map(render_batch, batches, [period] * len(batches),
+                                    [formats] * len(batches))
+            else:
+                rendered = (render_batch(batch, period, formats) for batch in batches)
+            files = self.writer.run(write_payslips, output, rendered, len(payslips),
+                                    lambda fraction: report_checkpoint(progress, cancel,
+                                                                       0.1 + 0.9 * fraction))
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+        report_checkpoint(progress, None, 1.0)
+        
+        return True, (f"{len(payslips)} payslips for {start} to {end} saved to {output} "
+                      f"({files} files)")
+    
+    def generate_summary_reports(self, days=30, progress=None, cancel=None):
+        """Generate per-day breakdown, per-employee statistics and shop summary reports
         
-        with open("daily_report.csv", 'r') as f:
-            reader = csv.reader(f)
-            return list(reader)
\ No newline at end of file
+        progress, cancel and caching work as for the weekly report.
+        """
+        filenames = ["daily_breakdown_report.csv", "employee_stats_report.csv",
+                     "shop_summary_report.csv"]
+        return self._cached_report(('summary', report_window_start(days)), filenames, progress,
+                                   lambda: self._summary_reports(days, filenames, progress, cancel))
+    
+    def _summary_reports(self, days, filenames, progress, cancel):
+        try:
+            # Imported on first use: NumPy alone takes longer to load than the rest of the app
+            from aggregate import (DAILY_BREAKDOWN_HEADER, EMPLOYEE_STATS_HEADER,
+                                   SHOP_SUMMARY_HEADER, PayrollAggregator)
+        except ImportError:
+            return False, "Summary reports require NumPy to be installed!"
+        
+        logs = self.history(start=report_window_start(days))
+        if not logs:
+            return False, "No time logs available!"
+        
+        report_checkpoint(progress, cancel, 0.0)
+        aggregator = PayrollAggregator(logs)
+        report_checkpoint(progress, cancel, 0.2)
+        daily_breakdown_rows = aggregator.daily_breakdown_rows()
+        report_checkpoint(progress, cancel, 0.4)
+        employee_stats_rows = aggregator.employee_stats_rows()
+        report_checkpoint(progress, cancel, 0.5)
+        reports = list(zip(filenames,
+                           [DAILY_BREAKDOWN_HEADER, EMPLOYEE_STATS_HEADER, SHOP_SUMMARY_HEADER],
+                           [daily_breakdown_rows, employee_stats_rows, aggregator.shop_rows()]))
+        for i, (filename, header, rows) in enumerate(reports):
+            self.writer.run(self._write_csv, filename, header, rows, progress, cancel,
+                            0.5 + 0.5 * i / len(reports), 0.5 + 0.5 * (i + 1) / len(reports))
+        report_checkpoint(progress, None, 1.0)
+        
+        return True, "Summary reports saved to " + ", ".join(name for name, _, _ in reports)
+    
+    def get_live_totals(self):
+        """Get today's, 7-day and 30-day running totals per employee"""
+        today = self.live_employee_totals(1)
+        week = self.live_employee_totals(7)
+        month = self.live_employee_totals()
+        
+        rows = []
+        for emp_id, data in month.items():
+            rows.append({
+                'emp_id': emp_id,
+                'name': data['name'],
+                'today_hours': today.get(emp_id, {}).get('total_hours', 0.0),
+                'today_etc': today.get(emp_id, {}).get('total_etc', 0.0),
+                'week_hours': week.get(emp_id, {}).get('total_hours', 0.0),
+                'month_hours': data['total_hours'],
+                'month_etc': data['total_etc'],
+                'shifts': data['days_worked']
+            })
+        return rows
+    
+    def get_daily_report_data(self, offset=0, limit=None, date=None):
+        """Get a page of daily report rows (without the header) for display"""
+        # Not through the writer, which may have whole reports queued ahead of the read
+        with self._daily_report_lock:
+            return list(self.daily_report.read(offset, limit, date))
\ No newline at end of file
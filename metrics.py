@@ -0,0 +1,316 @@
+"""
+Metrics Module - Opt-in latency histograms, counters and I/O byte totals
+
+Nothing is measured unless instrument() (or instrument_gui()) is called, so
+an uninstrumented manager runs its original methods with no added cost.
+"""
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Upper bounds in seconds, from sub-millisecond punches to multi-second reports
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+                   0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+MANAGER_CALLS = ('verify_employee_login', 'verify_admin_login', 'add_employee',
+                 'import_employees', 'export_employees', 'time_in_employee',
+                 'time_out_employee', 'get_employee_summary', 'get_daily_report_data',
+                 'get_live_totals', 'generate_weekly_report', 'generate_monthly_report',
+                 'generate_payroll_report', 'generate_payslips', 'generate_summary_reports')
+GUI_CALLBACK_PREFIXES = ('show_', 'generate_', 'import_', 'export_')
+GUI_CALLBACK_EXCLUDED = {'show_screen'}  # Dispatcher the show_* screens call; timing it counts them twice
+GUI_LAG_INTERVAL_MS = 250
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus layout"""
+    
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # Last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+    
+    def observe(self, value):
+        """Record one value"""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+    
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-th quantile (None when empty)"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float('inf')
+    
+    def to_dict(self):
+        return {'count': self.count, 'sum': self.sum,
+                'p50': self.quantile(0.5), 'p99': self.quantile(0.99),
+                'buckets': dict(zip([str(bound) for bound in self.buckets] + ['+Inf'],
+                                    self.counts))}
+
+
+class Metrics:
+    """Registry of counters and histograms, keyed by name and labels
+    
+    Updates take one lock, so the punch threads, the writer thread and the
+    Tk thread can all record into the same registry.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}    # (name, labels) -> value
+        self._histograms = {}  # (name, labels) -> Histogram
+        self.started = time.time()
+    
+    def inc(self, name, amount=1, **labels):
+        """Add to a counter"""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+    
+    def observe(self, name, value, **labels):
+        """Record a value (normally seconds) in a histogram"""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(value)
+    
+    def counter(self, name, **labels):
+        """Current value of a counter"""
+        with self._lock:
+            return self._counters.get((name, tuple(sorted(labels.items()))), 0)
+    
+    def timed(self, name, func, on_result=None, on_error=None, **labels):
+        """Wrap func so each call's latency is recorded in histogram `name`"""
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                self.observe(name, time.perf_counter() - start, **labels)
+                if on_error is not None:
+                    on_error(e, *args)
+                raise
+            self.observe(name, time.perf_counter() - start, **labels)
+            if on_result is not None:
+                on_result(result, *args)
+            return result
+        return wrapper
+    
+    def snapshot(self):
+        """Plain-dict copy of every metric, for JSON"""
+        with self._lock:
+            counters = [{'name': name, 'labels': dict(labels), 'value': value}
+                        for (name, labels), value in sorted(self._counters.items())]
+            histograms = [{'name': name, 'labels': dict(labels), **histogram.to_dict()}
+                          for (name, labels), histogram in sorted(self._histograms.items())]
+        return {'timestamp': time.time(), 'uptime_seconds': time.time() - self.started,
+                'counters': counters, 'histograms': histograms}
+    
+    def render_prometheus(self):
+        """Every metric in the Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            typed = set()
+            for (name, labels), value in sorted(self._counters.items()):
+                if name not in typed:
+                    typed.add(name)
+                    lines.append(f"# TYPE {name} counter")
+                lines.append(f"{name}{self._labels(labels)} {value}")
+            
+            for (name, labels), histogram in sorted(self._histograms.items()):
+                if name not in typed:
+                    typed.add(name)
+                    lines.append(f"# TYPE {name} histogram")
+                cumulative = 0
+                for bound, count in zip(histogram.buckets + ('+Inf',), histogram.counts):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{self._labels(labels + (('le', bound),))} {cumulative}")
+                lines.append(f"{name}_sum{self._labels(labels)} {histogram.sum}")
+                lines.append(f"{name}_count{self._labels(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+    
+    def dump_json(self, filename):
+        """Write a snapshot to filename, replacing it atomically"""
+        temp_filename = filename + ".tmp"
+        with open(temp_filename, 'w') as f:
+            json.dump(self.snapshot(), f, indent=2)
+        os.replace(temp_filename, filename)
+    
+    @staticmethod
+    def _labels(labels):
+        if not labels:
+            return ""
+        return "{" + ",".join(f'{key}="{value}"' for key, value in labels) + "}"
+
+
+def instrument(manager, metrics):
+    """Wrap a SystemManager's (or ServiceClient's) hot paths to record into metrics
+    
+    Records call latency per method, punches and failed logins, report
+    cache hits and misses, and the rows and bytes written by the daily
+    report and report CSVs. Returns the manager, whose methods are
+    replaced on the instance only.
+    """
+    def punched(result, emp_id):
+        success, _ = result
+        metrics.inc('punches_total' if success else 'punches_rejected_total')
+    
+    def login_failed(error, *args):
+        metrics.inc('logins_failed_total', reason=type(error).__name__)
+    
+    def admin_result(result, pin):
+        if not result:
+            metrics.inc('logins_failed_total', reason='InvalidCredentialsError')
+    
+    hooks = {
+        'time_in_employee': {'on_result': punched},
+        'time_out_employee': {'on_result': punched},
+        'verify_employee_login': {'on_error': login_failed},
+        'verify_admin_login': {'on_error': login_failed, 'on_result': admin_result},
+    }
+    for name in MANAGER_CALLS:
+        method = getattr(manager, name, None)
+        if method is not None:
+            setattr(manager, name, metrics.timed('manager_call_seconds', method,
+                                                 method=name, **hooks.get(name, {})))
+    
+    daily_report = getattr(manager, 'daily_report', None)
+    if daily_report is not None:
+        def appended(size, row):
+            metrics.inc('rows_written_total', file='daily_report')
+            metrics.inc('bytes_written_total', size or 0, file='daily_report')
+        daily_report.append = metrics.timed('daily_report_append_seconds', daily_report.append,
+                                            on_result=appended)
+    
+    write_csv = getattr(manager, '_write_csv', None)
+    if write_csv is not None:
+        def written(result, filename, header, rows, *args):
+            metrics.inc('rows_written_total', len(rows), file=os.path.basename(filename))
+            metrics.inc('bytes_written_total', os.path.getsize(filename),
+                        file=os.path.basename(filename))
+        manager._write_csv = metrics.timed('report_write_seconds', write_csv, on_result=written)
+    
+    report_cache = getattr(manager, 'report_cache', None)
+    if report_cache is not None:
+        def looked_up(value, *args):
+            metrics.inc('report_cache_hits_total' if value is not None else 'report_cache_misses_total')
+        report_cache.get = metrics.timed('report_cache_lookup_seconds', report_cache.get,
+                                         on_result=looked_up)
+    
+    manager.metrics = metrics
+    return manager
+
+
+def instrument_gui(gui, metrics):
+    """Time a TimekeepingGUI's screens and actions, and how late the Tk event loop runs
+    
+    Call before the first screen is built so its buttons bind the wrapped
+    methods. Event loop lag is the delay of a GUI_LAG_INTERVAL_MS timer past
+    its due time: a redraw or callback that blocks Tk shows up there.
+    """
+    for name in dir(type(gui)):
+        if name.startswith(GUI_CALLBACK_PREFIXES) and name not in GUI_CALLBACK_EXCLUDED \
+                and callable(getattr(gui, name)):
+            setattr(gui, name, metrics.timed('gui_callback_seconds', getattr(gui, name),
+                                             callback=name))
+    
+    def tick(due):
+        metrics.observe('gui_event_loop_lag_seconds', max(0.0, time.perf_counter() - due))
+        gui.root.after(GUI_LAG_INTERVAL_MS, tick, time.perf_counter() + GUI_LAG_INTERVAL_MS / 1000)
+    
+    gui.root.after(GUI_LAG_INTERVAL_MS, tick, time.perf_counter() + GUI_LAG_INTERVAL_MS / 1000)
+    return gui
+
+
+class MetricsServer:
+    """Serves GET /metrics in the Prometheus text format (and /metrics.json) on a thread"""
+    
+    def __init__(self, metrics, host="127.0.0.1", port=9108):
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == '/metrics':
+                    body, content_type = metrics.render_prometheus(), 'text/plain; version=0.0.4'
+                elif self.path == '/metrics.json':
+                    body, content_type = json.dumps(metrics.snapshot()), 'application/json'
+                else:
+                    self.send_error(404)
+                    return
+                data = body.encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+            
+            def log_message(self, format, *args):
+                pass  # Scrapes are not worth a line each on the console
+        
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        name="metrics-server", daemon=True)
+        self._thread.start()
+    
+    def close(self):
+        """Stop serving"""
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class MetricsDumper:
+    """Writes a JSON snapshot to a file every `interval` seconds, and once more on close"""
+    
+    def __init__(self, metrics, filename="metrics.json", interval=60):
+        self.metrics = metrics
+        self.filename = filename
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="metrics-dumper", daemon=True)
+        self._thread.start()
+    
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.metrics.dump_json(self.filename)
+    
+    def close(self):
+        """Stop and write the final snapshot"""
+        self._stop.set()
+        self._thread.join()
+        self.metrics.dump_json(self.filename)
+
+
+def add_arguments(parser):
+    """Add the --metrics-* options shared by the GUI and the punch service"""
+    parser.add_argument('--metrics-port', type=int,
+                        help="serve Prometheus metrics on http://127.0.0.1:PORT/metrics")
+    parser.add_argument('--metrics-json', metavar='FILE', help="dump metrics as JSON to FILE")
+    parser.add_argument('--metrics-interval', type=float, default=60,
+                        help="seconds between JSON dumps (default 60)")
+
+
+def start_exporters(args):
+    """Metrics and their exporters for parsed --metrics-* options; (None, []) when not asked for"""
+    if args.metrics_port is None and args.metrics_json is None:
+        return None, []
+    metrics = Metrics()
+    exporters = []
+    if args.metrics_port is not None:
+        exporters.append(MetricsServer(metrics, port=args.metrics_port))
+    if args.metrics_json is not None:
+        exporters.append(MetricsDumper(metrics, args.metrics_json, args.metrics_interval))
+    return metrics, exporters
\ No newline at end of file
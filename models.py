@@ -1,18 +1,26 @@
 """
 Models Module - Employee and Admin Classes
 """
+from credentials import check_pin, hash_pin, is_hashed
+
+# Hash of the default admin PIN, admin123
+DEFAULT_ADMIN_PIN_HASH = ("pbkdf2_sha256$600000$1197e361778a129598e11f4af252b6c2$"
+                          "aeae714d25a674eb88254518c4a1c80814897339e9094d4ccf863416af928ca2")
 
 class Employee:
-    """Employee class to store employee information"""
+    """Employee class to store employee information
+    
+    `pin` holds a salted hash from credentials.hash_pin; plaintext PINs
+    from older databases are re-hashed on the employee's next login.
+    """
+    
+    __slots__ = ('emp_id', 'name', 'pin', 'hourly_rate')
     
     def __init__(self, emp_id, name, pin, hourly_rate=60.0):
         self.emp_id = emp_id
         self.name = name
         self.pin = pin
         self.hourly_rate = hourly_rate
-        self.is_timed_in = False
-        self.time_in = None
-        self.time_out = None
     
     def __str__(self):
         return f"Employee(ID: {self.emp_id}, Name: {self.name}, Rate: ₱{self.hourly_rate}/hr)"
@@ -30,12 +38,13 @@ class Employee:
 class Admin:
     """Admin class for administrative access"""
     
-    def __init__(self, admin_pin="admin123"):
-        self.admin_pin = admin_pin
+    def __init__(self, admin_pin=DEFAULT_ADMIN_PIN_HASH):
+        # A plaintext PIN is hashed so it is never kept in memory as is
+        self.pin_hash = admin_pin if is_hashed(admin_pin) else hash_pin(admin_pin)
     
     def verify_pin(self, pin):
         """Verify admin PIN"""
-        return pin == self.admin_pin
+        return check_pin(pin, self.pin_hash)
 
 
 class TimeInNotFoundError(Exception):
@@ -50,4 +59,14 @@ class EmployeeNotFoundError(Exception):
 
 class InvalidCredentialsError(Exception):
     """Custom exception for invalid login credentials"""
+    pass
+
+
+class ReportCancelledError(Exception):
+    """Custom exception for when a report job is cancelled before it finishes"""
+    pass
+
+
+class TooManyAttemptsError(Exception):
+    """Custom exception for when an ID has run out of login attempts"""
     pass
\ No newline at end of file
@@ -0,0 +1,191 @@
+"""
+Payroll Module - Pay-period payroll with overtime, night differential and holiday rules
+"""
+import calendar
+import hashlib
+from bisect import bisect_right
+from datetime import date, datetime, time
+from timelog_store import TimeLogTable, date_key
+
+PAYROLL_REPORT_HEADER = ['Employee ID', 'Employee Name', 'Hourly Rate', 'Shifts',
+                         'Regular Hours', 'Overtime Hours', 'Night Hours',
+                         'Rest Day Hours', 'Holiday Hours', 'Regular Pay',
+                         'Overtime Pay', 'Night Differential', 'Gross Pay']
+
+# Accumulator slots per employee
+SHIFTS, REGULAR, OVERTIME, NIGHT, REST_DAY, HOLIDAY, REGULAR_PAY, OVERTIME_PAY, NIGHT_PAY = range(9)
+
+
+def pay_period(day=None):
+    """Semi-monthly pay period (first, last date) containing a date: 1-15 or 16-end"""
+    day = day or date.today()
+    if day.day <= 15:
+        return day.replace(day=1), day.replace(day=15)
+    return day.replace(day=16), day.replace(day=calendar.monthrange(day.year, day.month)[1])
+
+
+class PayrollRules:
+    """Pay rules for a shop
+    
+    Hours past `regular_hours` in a workday (the time-in date) are overtime.
+    Hours between `night_start` and `night_end` earn a night differential on
+    top of their pay. Rest days (weekday numbers, Monday is 0) and holidays
+    ({date: 'regular' or 'special'}) multiply the pay of the hours that fall
+    on that calendar day; a holiday on a rest day gets both multipliers.
+    """
+    
+    def __init__(self, regular_hours=8, overtime_multiplier=1.25,
+                 night_start=22, night_end=6, night_differential=0.10,
+                 rest_days=(6,), rest_day_multiplier=1.30, holidays=None,
+                 holiday_multipliers=None):
+        self.regular_hours = regular_hours
+        self.overtime_multiplier = overtime_multiplier
+        self.night_start = night_start
+        self.night_end = night_end
+        self.night_differential = night_differential
+        self.rest_days = frozenset(rest_days)
+        self.rest_day_multiplier = rest_day_multiplier
+        self.holidays = {date_key(day): kind for day, kind in (holidays or {}).items()}
+        self.holiday_multipliers = holiday_multipliers or {'regular': 2.0, 'special': 1.30}
+    
+    def digest(self):
+        """Hash of every setting, so cached pay figures can be tied to the rules that made them"""
+        settings = (self.regular_hours, self.overtime_multiplier, self.night_start, self.night_end,
+                    self.night_differential, sorted(self.rest_days), self.rest_day_multiplier,
+                    sorted(self.holidays.items()), sorted(self.holiday_multipliers.items()))
+        return hashlib.sha256(repr(settings).encode('utf-8')).hexdigest()
+    
+    def compile(self, first_day, last_day):
+        """Precompute the day and night intervals covering days first_day..last_day"""
+        return CompiledRules(self, date_key(first_day), date_key(last_day))
+
+
+class CompiledRules:
+    """A rule set laid out as a sorted list of intervals over the pay period
+    
+    Every calendar day is cut at midnight, night_end and night_start into
+    intervals (local epoch starts, so DST days are handled). Each interval
+    carries its pay multiplier and flags, so splitting a shift into segments
+    is a bisect plus a walk over the few intervals it spans.
+    """
+    
+    def __init__(self, rules, first_day, last_day):
+        self.rules = rules
+        self.first_day = first_day
+        self.last_day = last_day
+        self.starts = []     # Interval start, epoch seconds; the last entry only closes the list
+        self.intervals = []  # (multiplier, is_night, is_rest_day, is_holiday)
+        self._next_day = first_day
+        # Shifts may run into the day after the period ends
+        self._add_days(last_day + 1)
+    
+    def _add_days(self, last_day):
+        """Lay out intervals for the days up to last_day"""
+        rules = self.rules
+        if self.starts:
+            self.starts.pop()
+        for day in range(self._next_day, last_day + 1):
+            weekday = date.fromordinal(day).weekday()
+            is_rest_day = weekday in rules.rest_days
+            holiday = rules.holidays.get(day)
+            multiplier = rules.holiday_multipliers[holiday] if holiday else 1.0
+            if is_rest_day:
+                multiplier *= rules.rest_day_multiplier
+            
+            cuts = sorted({0, rules.night_end, rules.night_start} - {24})
+            for hour in cuts:
+                is_night = hour >= rules.night_start or hour < rules.night_end
+                self.starts.append(self._epoch(day, hour))
+                self.intervals.append((multiplier, is_night, is_rest_day, holiday is not None))
+        self._next_day = last_day + 1
+        self.starts.append(self._epoch(self._next_day, 0))
+    
+    @staticmethod
+    def _epoch(day, hour):
+        return int(datetime.combine(date.fromordinal(day), time(hour)).timestamp())
+    
+    def evaluate(self, time_logs):
+        """Return {emp_id: (name, hourly rate, accumulator)} for the closed time logs in the period
+        
+        Accumulator slots are indexed by SHIFTS, REGULAR, ... NIGHT_PAY.
+        
+        Accepts a TimeLogTable (used as is) or any iterable of TimeLogs.
+        Logs whose time-in date is outside the period are ignored.
+        """
+        table = time_logs if isinstance(time_logs, TimeLogTable) else self._table(time_logs)
+        if len(table) and max(table.time_out_ts) > self.starts[-1]:
+            self._add_days(datetime.fromtimestamp(max(table.time_out_ts)).toordinal())
+        rules = self.rules
+        starts = self.starts
+        intervals = self.intervals
+        regular_seconds = rules.regular_hours * 3600
+        overtime_multiplier = rules.overtime_multiplier
+        night_differential = rules.night_differential
+        
+        totals = {}
+        employees = {}
+        workday_seconds = {}  # (emp_id, day) -> seconds worked so far that workday
+        people = table.people
+        columns = (table.person, table.day, table.time_in_ts, table.time_out_ts, table.hourly_rate)
+        # Shifts in time-in order, so overtime goes to the later shifts of a workday
+        for person, day, time_in, time_out, rate in sorted(zip(*columns), key=lambda row: row[2]):
+            if day < self.first_day or day > self.last_day or time_out <= time_in:
+                continue
+            emp_id, emp_name = people[person]
+            employees[emp_id] = (emp_name, rate)  # Latest name and rate win
+            accumulator = totals.get(emp_id)
+            if accumulator is None:
+                accumulator = totals[emp_id] = [0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0]
+            accumulator[SHIFTS] += 1
+            
+            key = (emp_id, day)
+            worked = workday_seconds.get(key, 0)
+            workday_seconds[key] = worked + time_out - time_in
+            overtime_from = time_in + max(regular_seconds - worked, 0)
+            
+            # Walk the intervals the shift spans, splitting once more where overtime starts
+            i = bisect_right(starts, time_in) - 1
+            position = time_in
+            while position < time_out:
+                end = min(starts[i + 1], time_out)
+                if position < overtime_from < end:
+                    end = overtime_from
+                multiplier, is_night, is_rest_day, is_holiday = intervals[i]
+                hours = (end - position) / 3600
+                pay = hours * rate * multiplier
+                
+                if position >= overtime_from:
+                    accumulator[OVERTIME] += hours
+                    pay *= overtime_multiplier
+                    accumulator[OVERTIME_PAY] += pay
+                else:
+                    accumulator[REGULAR] += hours
+                    accumulator[REGULAR_PAY] += pay
+                if is_night:
+                    accumulator[NIGHT] += hours
+                    accumulator[NIGHT_PAY] += pay * night_differential
+                if is_rest_day:
+                    accumulator[REST_DAY] += hours
+                if is_holiday:
+                    accumulator[HOLIDAY] += hours
+                
+                position = end
+                if position == starts[i + 1]:
+                    i += 1
+        return {emp_id: (*employees[emp_id], accumulator) for emp_id, accumulator in totals.items()}
+    
+    def report_rows(self, time_logs):
+        """Rows in PAYROLL_REPORT_HEADER order, by employee ID"""
+        rows = []
+        for emp_id, (emp_name, rate, values) in sorted(self.evaluate(time_logs).items()):
+            gross = values[REGULAR_PAY] + values[OVERTIME_PAY] + values[NIGHT_PAY]
+            rows.append([emp_id, emp_name, rate, values[SHIFTS],
+                         *(round(value, 2) for value in values[REGULAR:]), round(gross, 2)])
+        return rows
+    
+    @staticmethod
+    def _table(time_logs):
+        table = TimeLogTable()
+        for time_log in time_logs:
+            table.append(time_log)
+        return table
\ No newline at end of file
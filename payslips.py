@@ -0,0 +1,271 @@
+"""
+Payslips Module - Per-employee payslips for a pay period as text, HTML and PDF
+"""
+import csv
+import hashlib
+import html
+import io
+import os
+import re
+import zipfile
+from datetime import date, datetime
+from payroll import (SHIFTS, REGULAR, OVERTIME, NIGHT, REST_DAY, HOLIDAY,
+                     REGULAR_PAY, OVERTIME_PAY, NIGHT_PAY)
+
+PAYSLIP_FORMATS = ('txt', 'html', 'pdf')
+PAYSLIP_BATCH = 100  # Payslips rendered per worker task
+MANIFEST_HEADER = ['Employee ID', 'Employee Name', 'Shifts', 'Total Hours', 'Gross Pay',
+                   'Format', 'File', 'Bytes', 'SHA-256']
+SHIFT_HEADER = ['Date', 'Time In', 'Time Out', 'Hours', 'ETC']
+PAY_LINES = [('Regular Hours', REGULAR), ('Overtime Hours', OVERTIME), ('Night Hours', NIGHT),
+             ('Rest Day Hours', REST_DAY), ('Holiday Hours', HOLIDAY)]
+PAY_AMOUNTS = [('Regular Pay', REGULAR_PAY), ('Overtime Pay', OVERTIME_PAY),
+               ('Night Differential', NIGHT_PAY)]
+
+# PDF page layout in points (A4), Courier so the text payslip lines up as is
+PDF_PAGE_SIZE = (595, 842)
+PDF_FONT_SIZE = 9
+PDF_LEADING = 12
+PDF_MARGIN = 50
+PDF_LINES_PER_PAGE = (PDF_PAGE_SIZE[1] - 2 * PDF_MARGIN) // PDF_LEADING
+
+
+def group_payslips(table, rules):
+    """Payslip data per employee for a period's closed logs, by employee ID
+    
+    `table` is the period's TimeLogTable (as returned by history()) and
+    `rules` the CompiledRules for the period. Shifts are grouped by
+    employee in one pass over the table's columns; pay comes from the same
+    rules evaluation as the payroll report, so the two always agree. Each
+    payslip is a plain dict, cheap to send to a worker process.
+    """
+    shifts = {}
+    people = table.people
+    columns = (table.person, table.day, table.time_in_ts, table.time_out_ts,
+               table.hours_worked, table.etc)
+    for person, day, time_in, time_out, hours, etc in zip(*columns):
+        if day < rules.first_day or day > rules.last_day or time_out <= time_in:
+            continue  # Not paid by the rules either
+        emp_shifts = shifts.get(people[person][0])
+        if emp_shifts is None:
+            emp_shifts = shifts[people[person][0]] = []
+        emp_shifts.append((time_in, time_out, hours, etc))
+    
+    payslips = []
+    for emp_id, (emp_name, rate, values) in sorted(rules.evaluate(table).items()):
+        emp_shifts = sorted(shifts[emp_id])
+        payslips.append({
+            'emp_id': emp_id,
+            'name': emp_name,
+            'hourly_rate': rate,
+            'shifts': emp_shifts,
+            'total_hours': sum(shift[2] for shift in emp_shifts),
+            'total_etc': sum(shift[3] for shift in emp_shifts),
+            'pay': values,
+            'gross_pay': values[REGULAR_PAY] + values[OVERTIME_PAY] + values[NIGHT_PAY],
+        })
+    return payslips
+
+
+def shift_rows(payslip):
+    """Formatted SHIFT_HEADER rows for a payslip's shifts"""
+    rows = []
+    for time_in, time_out, hours, etc in payslip['shifts']:
+        started = datetime.fromtimestamp(time_in)
+        rows.append([started.strftime("%Y-%m-%d"), started.strftime("%I:%M %p"),
+                     datetime.fromtimestamp(time_out).strftime("%I:%M %p"),
+                     f"{hours:.2f}", f"₱{etc:,.2f}"])
+    return rows
+
+
+def render_text(payslip, period):
+    """Plain-text payslip"""
+    start, end = period
+    lines = ["COFFEE SHOP PAYSLIP", "",
+             f"Employee:    {payslip['emp_id']} - {payslip['name']}",
+             f"Pay Period:  {start} to {end}",
+             f"Hourly Rate: ₱{payslip['hourly_rate']:,.2f}", "",
+             "{:<12}{:<10}{:<10}{:>7}{:>14}".format(*SHIFT_HEADER)]
+    for row in shift_rows(payslip):
+        lines.append("{:<12}{:<10}{:<10}{:>7}{:>14}".format(*row))
+    lines += [f"{'Total':<32}{payslip['total_hours']:>7.2f}{'₱' + format(payslip['total_etc'], ',.2f'):>14}",
+              "", f"Shifts: {payslip['pay'][SHIFTS]}"]
+    values = payslip['pay']
+    lines += [f"{label + ':':<22}{values[slot]:>10.2f}" for label, slot in PAY_LINES]
+    lines.append("")
+    lines += [f"{label + ':':<22}{'₱' + format(values[slot], ',.2f'):>16}" for label, slot in PAY_AMOUNTS]
+    lines.append(f"{'GROSS PAY:':<22}{'₱' + format(payslip['gross_pay'], ',.2f'):>16}")
+    return "\n".join(lines) + "\n"
+
+
+def render_html(payslip, period):
+    """Standalone HTML payslip"""
+    start, end = period
+    escape = html.escape
+    values = payslip['pay']
+    shifts = "".join("<tr>" + "".join(f"<td>{escape(cell)}</td>" for cell in row) + "</tr>"
+                     for row in shift_rows(payslip))
+    hours = "".join(f"<tr><th>{label}</th><td>{values[slot]:.2f}</td></tr>"
+                    for label, slot in PAY_LINES)
+    amounts = "".join(f"<tr><th>{label}</th><td>₱{values[slot]:,.2f}</td></tr>"
+                      for label, slot in PAY_AMOUNTS)
+    return (
+        "<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\">"
+        f"<title>Payslip {escape(payslip['emp_id'])} {start} to {end}</title>"
+        "<style>body{font-family:Arial,sans-serif}table{border-collapse:collapse;margin:8px 0}"
+        "td,th{border:1px solid #999;padding:2px 8px;text-align:left}</style></head><body>"
+        "<h1>Coffee Shop Payslip</h1>"
+        f"<p>Employee: {escape(payslip['emp_id'])} - {escape(payslip['name'])}<br>"
+        f"Pay Period: {start} to {end}<br>Hourly Rate: ₱{payslip['hourly_rate']:,.2f}</p>"
+        "<table><tr>" + "".join(f"<th>{column}</th>" for column in SHIFT_HEADER) + "</tr>"
+        f"{shifts}<tr><th colspan=\"3\">Total</th><td>{payslip['total_hours']:.2f}</td>"
+        f"<td>₱{payslip['total_etc']:,.2f}</td></tr></table>"
+        f"<table><tr><th>Shifts</th><td>{values[SHIFTS]}</td></tr>{hours}</table>"
+        f"<table>{amounts}<tr><th>Gross Pay</th><td><b>₱{payslip['gross_pay']:,.2f}</b></td></tr>"
+        "</table></body></html>\n")
+
+
+def render_pdf(payslip, period):
+    """PDF payslip: the text payslip set in Courier, written without a PDF library"""
+    # The standard fonts have no peso sign
+    lines = render_text(payslip, period).replace("₱", "PHP ").splitlines()
+    pages = [lines[i:i + PDF_LINES_PER_PAGE] for i in range(0, len(lines), PDF_LINES_PER_PAGE)]
+    width, height = PDF_PAGE_SIZE
+    
+    # Objects: 1 catalog, 2 page tree, 3 font, then a page and its content per page
+    page_ids = [4 + 2 * i for i in range(len(pages))]
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>",
+               b"<< /Type /Pages /Kids [" + b" ".join(b"%d 0 R" % i for i in page_ids)
+               + b"] /Count %d >>" % len(pages),
+               b"<< /Type /Font /Subtype /Type1 /BaseFont /Courier /Encoding /WinAnsiEncoding >>"]
+    for page_id, page in zip(page_ids, pages):
+        text = "\n".join(f"({_pdf_string(line)}) '" for line in page)
+        stream = (f"BT /F1 {PDF_FONT_SIZE} Tf {PDF_LEADING} TL "
+                  f"{PDF_MARGIN} {height - PDF_MARGIN} Td\n{text}\nET").encode('cp1252', 'replace')
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] " % (width, height)
+                       + b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % (page_id + 1))
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+    
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    out.write(b"".join(b"%010d 00000 n \n" % offset for offset in offsets))
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n"
+              % (len(objects) + 1, xref))
+    return out.getvalue()
+
+
+def _pdf_string(text):
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+RENDERERS = {'txt': render_text, 'html': render_html, 'pdf': render_pdf}
+
+
+def payslip_filename(payslip, fmt):
+    """File name for a payslip, with characters unsafe in paths replaced
+    
+    An ID that needed replacing gets a short hash of the real ID appended,
+    so two IDs that sanitize alike (e.g. "A/1" and "A:1") never share a
+    file, in whichever batch they are rendered.
+    """
+    emp_id = payslip['emp_id']
+    name = re.sub(r'[^A-Za-z0-9_.-]', '_', emp_id)
+    if name != emp_id:
+        name += "-" + hashlib.sha256(emp_id.encode('utf-8')).hexdigest()[:8]
+    return f"{name}.{fmt}"
+
+
+def render_batch(payslips, period, formats):
+    """Render payslips in every format (runs in a worker process)
+    
+    Returns (payslip, [(format, file name, data)]) per payslip, the data
+    as bytes ready to write.
+    """
+    rendered = []
+    for payslip in payslips:
+        files = []
+        for fmt in formats:
+            data = RENDERERS[fmt](payslip, period)
+            files.append((fmt, payslip_filename(payslip, fmt),
+                          data if isinstance(data, bytes) else data.encode('utf-8')))
+        rendered.append((payslip, files))
+    return rendered
+
+
+def write_payslips(output, batches, count, checkpoint=None):
+    """Write rendered batches and a manifest.csv to a .zip file or a directory
+    
+    `batches` yields render_batch() results and `count` is the number of
+    payslips they hold; checkpoint(fraction) is called after each batch.
+    A zip file replaces `output` only once it is complete. Returns the
+    number of files written, manifest included.
+    """
+    if not output.lower().endswith('.zip'):
+        os.makedirs(output, exist_ok=True)
+        
+        def write_file(name, data):
+            with open(os.path.join(output, name), 'wb') as f:
+                f.write(data)
+        return _write_files(write_file, batches, count, checkpoint)
+    
+    temp_output = output + ".tmp"
+    try:
+        with zipfile.ZipFile(temp_output, 'w', zipfile.ZIP_DEFLATED) as archive:
+            written = _write_files(archive.writestr, batches, count, checkpoint)
+        os.replace(temp_output, output)
+    except BaseException:
+        if os.path.exists(temp_output):
+            os.remove(temp_output)
+        raise
+    return written
+
+
+def written_files(output):
+    """Paths of the files a payslip run wrote to `output`, from its manifest
+    
+    A zip file is a single file; for a directory it is manifest.csv and
+    every payslip it lists. A missing or unreadable manifest gives just the
+    manifest path, which a file signature then reports as missing.
+    """
+    if output.lower().endswith('.zip'):
+        return [output]
+    manifest = os.path.join(output, "manifest.csv")
+    try:
+        with open(manifest, 'r', newline='', encoding='utf-8') as f:
+            reader = csv.reader(f)
+            next(reader, None)  # Skip header
+            names = [row[MANIFEST_HEADER.index('File')] for row in reader if row]
+    except (OSError, IndexError, UnicodeDecodeError):
+        return [manifest]
+    return [manifest] + [os.path.join(output, name) for name in names]
+
+
+def _write_files(write, batches, count, checkpoint):
+    manifest = io.StringIO()
+    writer = csv.writer(manifest)
+    writer.writerow(MANIFEST_HEADER)
+    written = done = 0
+    for rendered in batches:
+        for payslip, files in rendered:
+            for fmt, name, data in files:
+                write(name, data)
+                writer.writerow([payslip['emp_id'], payslip['name'], payslip['pay'][SHIFTS],
+                                 round(payslip['total_hours'], 2), round(payslip['gross_pay'], 2),
+                                 fmt, name, len(data), hashlib.sha256(data).hexdigest()])
+                written += 1
+            done += 1
+        if checkpoint is not None:
+            checkpoint(done / count)
+    write("manifest.csv", manifest.getvalue().encode('utf-8'))
+    return written + 1
+
+
+def period_label(start, end):
+    """(start, end) as ISO date strings for the payslip headers"""
+    return tuple(day.isoformat() if isinstance(day, date) else str(day) for day in (start, end))
\ No newline at end of file
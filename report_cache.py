@@ -0,0 +1,68 @@
+"""
+Report Cache Module - Memoized report results, keyed on the data version they were built from
+"""
+import os
+import threading
+from collections import OrderedDict
+
+
+def file_signature(filenames):
+    """(name, modification time, size) of each file, or None when one is missing"""
+    signature = []
+    for filename in filenames:
+        try:
+            stat = os.stat(filename)
+        except OSError:
+            return None
+        signature.append((filename, stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+
+class ReportCache:
+    """LRU of report results keyed by (report type, window..., data version)
+    
+    The manager bumps its data version whenever a time log closes or an
+    employee is added, so an entry can only be hit while the data it was
+    built from is unchanged; stale entries are never hit again and age out
+    once `maxsize` newer ones have been stored.
+    """
+    
+    def __init__(self, maxsize=32):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()  # key -> value
+        self._lock = threading.Lock()
+    
+    def get(self, key, valid=None):
+        """Cached value for key, or None; entries failing valid(value) are dropped as misses"""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None and (valid is None or valid(value)):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            self._entries.pop(key, None)
+            self.misses += 1
+            return None
+    
+    def put(self, key, value):
+        """Store a value, evicting the least recently used entries past maxsize"""
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+    
+    def clear(self):
+        """Forget every cached result"""
+        with self._lock:
+            self._entries.clear()
+    
+    def stats(self):
+        """Hit, miss and eviction counts and the current number of entries"""
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                    'entries': len(self._entries)}
\ No newline at end of file
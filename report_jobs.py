@@ -0,0 +1,80 @@
+"""
+Report Jobs Module - Queue of report jobs run off the GUI thread
+"""
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from models import ReportCancelledError
+
+
+class ReportJob:
+    """One queued report; its fields are read by the GUI while a worker updates them"""
+    
+    def __init__(self, job_id, name, generate):
+        self.job_id = job_id
+        self.name = name
+        self.generate = generate
+        self.status = "Queued"
+        self.progress = 0.0
+        self.message = ""
+        self.cancel_event = threading.Event()
+    
+    @property
+    def finished(self):
+        return self.status in ("Done", "Failed", "Cancelled")
+    
+    def cancel(self):
+        """Ask the job to stop; a queued job is skipped when its turn comes"""
+        self.cancel_event.set()
+    
+    def set_progress(self, fraction):
+        self.progress = fraction
+    
+    def run(self):
+        """Run the report, recording its outcome instead of raising"""
+        if self.cancel_event.is_set():
+            self.status = "Cancelled"
+            return
+        self.status = "Running"
+        try:
+            success, self.message = self.generate(progress=self.set_progress,
+                                                  cancel=self.cancel_event)
+            self.status = "Done" if success else "Failed"
+        except ReportCancelledError as e:
+            self.status, self.message = "Cancelled", str(e)
+        except Exception as e:
+            self.status, self.message = "Failed", str(e)
+
+
+class ReportJobQueue:
+    """Runs report jobs in submission order on a worker thread
+    
+    The GUI polls the jobs with root.after, so the Tk main loop never waits
+    on a report and employees can keep punching while reports are built.
+    """
+    
+    def __init__(self, workers=1):
+        self._executor = ThreadPoolExecutor(workers, thread_name_prefix="report-job")
+        self._ids = itertools.count(1)
+        self.jobs = []
+    
+    def submit(self, name, generate):
+        """Queue generate(progress=..., cancel=...) and return its ReportJob"""
+        job = ReportJob(next(self._ids), name, generate)
+        self.jobs.append(job)
+        self._executor.submit(job.run)
+        return job
+    
+    def active(self):
+        """Jobs that are queued or running"""
+        return [job for job in self.jobs if not job.finished]
+    
+    def clear_finished(self):
+        """Forget jobs that have finished"""
+        self.jobs = self.active()
+    
+    def close(self):
+        """Cancel outstanding jobs and wait for the running one to stop"""
+        for job in self.jobs:
+            job.cancel()
+        self._executor.shutdown(wait=True)
\ No newline at end of file
@@ -0,0 +1,263 @@
+"""
+Reports Module - Daily report partitioned into one CSV file per date
+"""
+import csv
+import gzip
+import io
+import json
+import os
+import shutil
+from datetime import date, timedelta
+
+try:
+    import zstandard
+except ImportError:  # zstd compression is optional; gzip is always available
+    zstandard = None
+
+DAILY_REPORT_HEADER = ['Employee ID', 'Employee Name', 'Date',
+                       'Time In', 'Time Out', 'Hours Worked', 'ETC']
+COMPRESSED_SUFFIXES = {'gzip': '.gz', 'zstd': '.zst'}
+
+
+class PartitionedDailyReport:
+    """Daily report rows stored as `<root>/YYYY/MM/YYYY-MM-DD.csv`
+    
+    A manifest (`<root>/manifest.json`) lists every partition with its row
+    count, so paged reads skip whole days without opening them and date or
+    range reads open only the days asked for. Partitions older than
+    `compress_after_days` are compressed (gzip, or zstd when the zstandard
+    package is installed) when a new day starts; reads decompress them
+    transparently. An existing single-file daily report is split into
+    partitions the first time the manifest is created; the old file is
+    left in place. With `read_only` the report is only read: nothing under
+    `root` is created or rewritten, and a missing manifest reads as empty.
+    """
+    
+    def __init__(self, root="reports", legacy_filename="daily_report.csv",
+                 compress_after_days=None, compression='gzip', read_only=False):
+        if compression == 'zstd' and zstandard is None:
+            raise ValueError("zstd compression requires the zstandard package")
+        self.root = root
+        self.manifest_filename = os.path.join(root, "manifest.json")
+        self.legacy_filename = legacy_filename
+        self.compress_after_days = compress_after_days
+        self.compression = compression
+        self.read_only = read_only
+        self._manifest = None
+        self._file = None  # Append handle of the newest partition
+        self._file_date = None
+    
+    def append(self, row):
+        """Append one data row to its date's partition; returns the bytes written"""
+        if self.read_only:
+            raise ValueError(f"{self.root} was opened read-only")
+        manifest = self._load_manifest()
+        row_date = str(row[2])
+        if row_date != self._file_date:
+            self._open_partition(row_date)
+        
+        buffer = io.StringIO()
+        csv.writer(buffer).writerow(row)
+        data = buffer.getvalue().encode('utf-8')
+        self._file.write(data)
+        self._file.flush()
+        
+        partition = manifest['partitions'][row_date]
+        partition['rows'] += 1
+        partition['size'] += len(data)
+        return len(data)
+    
+    def read(self, offset=0, limit=None, date=None):
+        """Yield up to `limit` data rows starting at row `offset`, optionally for one date"""
+        if date is not None:
+            dates = [date] if date in self._load_manifest()['partitions'] else []
+        else:
+            dates = self.dates()
+        
+        produced = 0
+        for partition_date in dates:
+            if limit is not None and produced >= limit:
+                return
+            rows = self._load_manifest()['partitions'][partition_date]['rows']
+            if offset >= rows:
+                offset -= rows  # Skip the whole day without opening it
+                continue
+            for row in self._read_partition(partition_date):
+                if offset:
+                    offset -= 1
+                    continue
+                yield row
+                produced += 1
+                if limit is not None and produced >= limit:
+                    return
+    
+    def read_range(self, start=None, end=None):
+        """Yield data rows dated between start and end (inclusive ISO dates)"""
+        for partition_date in self.dates():
+            if (start is None or partition_date >= str(start)) and \
+                    (end is None or partition_date <= str(end)):
+                yield from self._read_partition(partition_date)
+    
+    def dates(self):
+        """Dates that have a partition, ascending"""
+        return sorted(self._load_manifest()['partitions'])
+    
+    def row_count(self):
+        """Number of data rows in the report"""
+        return sum(partition['rows'] for partition in self._load_manifest()['partitions'].values())
+    
+    def compress_partitions(self, before):
+        """Compress every uncompressed partition dated before `before` (ISO date)"""
+        if self.read_only:
+            raise ValueError(f"{self.root} was opened read-only")
+        self._load_manifest()
+        changed = False
+        for partition_date, partition in self._manifest['partitions'].items():
+            if partition_date < before and partition['compression'] is None \
+                    and partition_date != self._file_date:
+                self._compress(partition)
+                changed = True
+        if changed:
+            self._save_manifest()
+    
+    def close(self):
+        """Close the append handle and save the manifest"""
+        self._close_file()
+        if self._manifest is not None and not self.read_only:
+            self._save_manifest()
+    
+    def _open_partition(self, row_date):
+        """Point the append handle at a date's partition, creating it if needed"""
+        self._close_file()
+        partitions = self._manifest['partitions']
+        partition = partitions.get(row_date)
+        if partition is None:
+            year, month, _ = row_date.split('-')
+            partition = partitions[row_date] = {
+                'file': os.path.join(year, month, f"{row_date}.csv"),
+                'rows': 0, 'size': 0, 'compression': None}
+            os.makedirs(os.path.join(self.root, year, month), exist_ok=True)
+        elif partition['compression'] is not None:
+            self._decompress(partition)  # A late row for an old day
+        
+        path = os.path.join(self.root, partition['file'])
+        self._file = open(path, 'ab')
+        if partition['size'] == 0:
+            header = io.StringIO()
+            csv.writer(header).writerow(DAILY_REPORT_HEADER)
+            data = header.getvalue().encode('utf-8')
+            self._file.write(data)
+            partition['size'] = len(data)
+        self._file_date = row_date
+        
+        # A new day is when older partitions roll over to compressed storage
+        if self.compress_after_days is not None:
+            cutoff = date.fromisoformat(row_date) - timedelta(days=self.compress_after_days)
+            self.compress_partitions(cutoff.isoformat())
+        self._save_manifest()
+    
+    def _close_file(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._file_date = None
+    
+    def _read_partition(self, partition_date):
+        """Yield the data rows of one partition"""
+        partition = self._manifest['partitions'][partition_date]
+        path = os.path.join(self.root, partition['file'])
+        with self._open_text(path, partition['compression']) as f:
+            reader = csv.reader(f)
+            next(reader, None)  # Skip header
+            for row in reader:
+                if row:
+                    yield row
+    
+    @staticmethod
+    def _open_text(path, compression):
+        """Open a partition for reading as text, decompressing if needed"""
+        if compression == 'gzip':
+            return gzip.open(path + COMPRESSED_SUFFIXES['gzip'], 'rt', newline='', encoding='utf-8')
+        if compression == 'zstd':
+            reader = zstandard.ZstdDecompressor().stream_reader(
+                open(path + COMPRESSED_SUFFIXES['zstd'], 'rb'), closefd=True)
+            return io.TextIOWrapper(reader, encoding='utf-8', newline='')
+        return open(path, 'r', newline='', encoding='utf-8')
+    
+    def _compress(self, partition):
+        """Replace a partition's CSV with its compressed copy"""
+        path = os.path.join(self.root, partition['file'])
+        target = path + COMPRESSED_SUFFIXES[self.compression]
+        with open(path, 'rb') as source, open(target + ".tmp", 'wb') as raw:
+            if self.compression == 'zstd':
+                with zstandard.ZstdCompressor().stream_writer(raw, closefd=False) as out:
+                    shutil.copyfileobj(source, out)
+            else:
+                with gzip.GzipFile(fileobj=raw, mode='wb') as out:
+                    shutil.copyfileobj(source, out)
+        os.replace(target + ".tmp", target)
+        os.remove(path)
+        partition['compression'] = self.compression
+    
+    def _decompress(self, partition):
+        """Turn a compressed partition back into a plain CSV so rows can be appended"""
+        path = os.path.join(self.root, partition['file'])
+        with self._open_text(path, partition['compression']) as source, \
+                open(path + ".tmp", 'w', newline='', encoding='utf-8') as out:
+            shutil.copyfileobj(source, out)
+        os.replace(path + ".tmp", path)
+        os.remove(path + COMPRESSED_SUFFIXES[partition['compression']])
+        partition['compression'] = None
+    
+    def _load_manifest(self):
+        """Load the manifest, creating it (and migrating a legacy report) on first use"""
+        if self._manifest is not None:
+            return self._manifest
+        
+        if os.path.isfile(self.manifest_filename):
+            with open(self.manifest_filename, 'r') as f:
+                self._manifest = json.load(f)
+            self._recount_stale()
+            return self._manifest
+        
+        if self.read_only:
+            self._manifest = {'partitions': {}}
+            return self._manifest
+        os.makedirs(self.root, exist_ok=True)
+        self._manifest = {'partitions': {}}
+        if self.legacy_filename and os.path.isfile(self.legacy_filename):
+            self._migrate_legacy()
+        self._save_manifest()
+        return self._manifest
+    
+    def _migrate_legacy(self):
+        """Split the single-file daily report into date partitions"""
+        with open(self.legacy_filename, 'r', newline='', encoding='utf-8') as f:
+            reader = csv.reader(f)
+            next(reader, None)  # Skip header
+            for row in reader:
+                if row:
+                    self.append(row)
+        self._close_file()
+        self._manifest['migrated_from'] = self.legacy_filename
+    
+    def _recount_stale(self):
+        """Recount partitions appended to after the manifest was last saved"""
+        for partition in self._manifest['partitions'].values():
+            if partition['compression'] is not None:
+                continue
+            path = os.path.join(self.root, partition['file'])
+            size = os.path.getsize(path) if os.path.isfile(path) else 0
+            if size == partition['size']:
+                continue
+            partition['rows'] = 0
+            if size:
+                with open(path, 'r', newline='', encoding='utf-8') as f:
+                    partition['rows'] = sum(1 for row in csv.reader(f) if row) - 1
+            partition['size'] = size
+    
+    def _save_manifest(self):
+        """Write the manifest atomically"""
+        with open(self.manifest_filename + ".tmp", 'w') as f:
+            json.dump(self._manifest, f)
+        os.replace(self.manifest_filename + ".tmp", self.manifest_filename)
\ No newline at end of file
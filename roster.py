@@ -0,0 +1,236 @@
+"""
+Roster Module - Bulk employee import and export as CSV or JSON lines
+"""
+import codecs
+import csv
+import json
+import os
+from credentials import hash_pin, is_hashed
+from models import Employee
+
+ROSTER_HEADER = ['Employee ID', 'Employee Name', 'PIN', 'Hourly Rate']
+ROSTER_FIELDS = ['emp_id', 'name', 'pin', 'hourly_rate']
+HEADER_FIELDS = dict(zip(ROSTER_HEADER, ROSTER_FIELDS))
+IMPORT_BATCH = 1000
+ERROR_REPORT_HEADER = ['Line', 'Employee ID', 'Error']
+
+
+def is_json_lines(filename):
+    """Rosters ending in .jsonl or .json hold one JSON object per line; others are CSV"""
+    return filename.lower().endswith(('.jsonl', '.json'))
+
+
+def read_roster(filename):
+    """Yield (line number, record, error, fraction of the file read) for each roster row
+    
+    Records are dicts keyed by ROSTER_FIELDS; a row that cannot be parsed
+    (including one that is not valid UTF-8, e.g. saved from Excel as
+    cp1252) comes back with record None and an error message. A CSV header
+    naming none of the roster columns is reported once, as line 1. The
+    file is streamed, so memory does not grow with its size.
+    """
+    size = os.path.getsize(filename) or 1
+    position = 0
+    invalid = False  # Whether a line of the current row was not valid UTF-8
+    
+    with open(filename, 'rb') as f:
+        if f.read(len(codecs.BOM_UTF8)) != codecs.BOM_UTF8:
+            f.seek(0)
+        
+        def lines():
+            nonlocal position, invalid
+            for line in f:
+                position += len(line)
+                try:
+                    yield line.decode('utf-8')
+                except UnicodeDecodeError:
+                    # Keep parsing so the rest of the file is still read; the row is rejected
+                    invalid = True
+                    yield line.decode('utf-8', 'replace')
+        
+        if is_json_lines(filename):
+            for line_number, line in enumerate(lines(), 1):
+                if invalid:
+                    invalid = False
+                    yield line_number, None, "Invalid UTF-8", position / size
+                    continue
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    yield line_number, None, "Invalid JSON", position / size
+                    continue
+                if not isinstance(record, dict):
+                    yield line_number, None, "Expected a JSON object", position / size
+                    continue
+                yield line_number, record, None, position / size
+            return
+        
+        reader = csv.reader(lines())
+        header = next(reader, None)
+        if header is None:
+            return
+        columns = [HEADER_FIELDS.get(name.strip(), name.strip()) for name in header]
+        if invalid or not set(columns) & set(ROSTER_FIELDS):
+            yield (1, None, "Unrecognized header; expected the columns " + ", ".join(ROSTER_HEADER),
+                   position / size)
+            return
+        for row in reader:
+            if invalid:
+                invalid = False
+                yield reader.line_num, None, "Invalid UTF-8", position / size
+                continue
+            if not row:
+                continue
+            if len(row) != len(columns):
+                yield (reader.line_num, None, f"Expected {len(columns)} columns, got {len(row)}",
+                       position / size)
+                continue
+            yield reader.line_num, dict(zip(columns, row)), None, position / size
+
+
+def parse_employee(record):
+    """Validate a roster record and build its Employee (PIN not hashed yet)"""
+    emp_id = str(record.get('emp_id') or '').strip()
+    name = str(record.get('name') or '').strip()
+    pin = str(record.get('pin') or '').strip()
+    rate = record.get('hourly_rate')
+    
+    if not emp_id:
+        raise ValueError("Missing employee ID")
+    if not name:
+        raise ValueError("Missing employee name")
+    if not pin:
+        raise ValueError("Missing PIN")
+    if rate is None or str(rate).strip() == '':
+        hourly_rate = 60.0
+    else:
+        try:
+            hourly_rate = float(rate)
+        except ValueError:
+            raise ValueError(f"Invalid hourly rate: {rate}") from None
+        if not hourly_rate > 0:
+            raise ValueError(f"Hourly rate must be positive: {rate}")
+    return Employee(emp_id, name, pin, hourly_rate)
+
+
+class RosterImport:
+    """One bulk import: the employees it added and the rows it rejected
+    
+    batches() streams the roster and yields validated employees in batches
+    of IMPORT_BATCH for the storage backend to insert in one transaction.
+    Plaintext PINs are hashed on a process pool; PINs that are already
+    hashes (as written by export_roster) are kept as they are. Hashing is
+    slow on purpose, so the batches are meant to be prepared before any
+    lock is taken; drop_existing() then rejects IDs added in the meantime.
+    """
+    
+    def __init__(self, filename):
+        self.filename = filename
+        self.rows = 0
+        self.imported = []
+        self.errors = []  # (line number, employee ID, message)
+        self._lines = {}  # emp_id -> line number, for errors found after batches()
+    
+    def batches(self, existing, checkpoint=None):
+        """Yield lists of new employees, skipping IDs already in `existing` or earlier rows"""
+        seen = set()
+        batch = []
+        pool = None
+        try:
+            for line_number, record, error, fraction in read_roster(self.filename):
+                self.rows += 1
+                if error is not None:
+                    self.errors.append((line_number, '', error))
+                    continue
+                try:
+                    employee = parse_employee(record)
+                except ValueError as e:
+                    self.errors.append((line_number, str(record.get('emp_id') or ''), str(e)))
+                    continue
+                if employee.emp_id in existing or employee.emp_id in seen:
+                    self.errors.append((line_number, employee.emp_id, "Duplicate employee ID"))
+                    continue
+                
+                seen.add(employee.emp_id)
+                self._lines[employee.emp_id] = line_number
+                batch.append(employee)
+                if len(batch) >= IMPORT_BATCH:
+                    pool = self._hash_pins(batch, pool)
+                    self.imported.extend(batch)
+                    yield batch
+                    batch = []
+                    if checkpoint is not None:
+                        checkpoint(fraction)
+            
+            if batch:
+                pool = self._hash_pins(batch, pool)
+                self.imported.extend(batch)
+                yield batch
+        finally:
+            if pool is not None:
+                pool.shutdown()
+    
+    def drop_existing(self, batches, existing):
+        """Batches without employees whose IDs are now in `existing`, which are rejected"""
+        kept = []
+        for batch in batches:
+            batch = [employee for employee in batch if not self._reject_existing(employee, existing)]
+            if batch:
+                kept.append(batch)
+        self.imported = [employee for batch in kept for employee in batch]
+        return kept
+    
+    def _reject_existing(self, employee, existing):
+        if employee.emp_id not in existing:
+            return False
+        self.errors.append((self._lines[employee.emp_id], employee.emp_id, "Duplicate employee ID"))
+        return True
+    
+    @staticmethod
+    def _hash_pins(batch, pool):
+        """Replace plaintext PINs in a batch with hashes; returns the pool (created on demand)"""
+        plaintext = [employee for employee in batch if not is_hashed(employee.pin)]
+        if len(plaintext) == 1:
+            plaintext[0].pin = hash_pin(plaintext[0].pin)
+        elif plaintext:
+            if pool is None:
+                from concurrent.futures import ProcessPoolExecutor  # Only large imports need it
+                pool = ProcessPoolExecutor()
+            for employee, pin_hash in zip(plaintext, pool.map(hash_pin, [e.pin for e in plaintext])):
+                employee.pin = pin_hash
+        return pool
+    
+    def summary(self):
+        """One-line outcome for the UI"""
+        message = f"Imported {len(self.imported)} of {self.rows} employees from {self.filename}"
+        if self.errors:
+            message += f"; {len(self.errors)} rows rejected"
+        return message
+    
+    def write_errors(self, filename):
+        """Write the per-row error report as CSV"""
+        with open(filename, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(ERROR_REPORT_HEADER)
+            writer.writerows(self.errors)
+
+
+def export_roster(employees, filename):
+    """Write employees (with PIN hashes) as CSV or JSON lines; returns the row count"""
+    count = 0
+    temp_filename = filename + ".tmp"
+    with open(temp_filename, 'w', newline='', encoding='utf-8') as f:
+        if is_json_lines(filename):
+            for employee in employees:
+                f.write(json.dumps(employee.to_dict()) + "\n")
+                count += 1
+        else:
+            writer = csv.writer(f)
+            writer.writerow(ROSTER_HEADER)
+            for employee in employees:
+                writer.writerow([employee.emp_id, employee.name, employee.pin, employee.hourly_rate])
+                count += 1
+    os.replace(temp_filename, filename)
+    return count
\ No newline at end of file
@@ -0,0 +1,81 @@
+"""
+Running Totals Module - Rolling payroll totals updated as each time log closes
+"""
+from bisect import insort
+from timelog_store import date_key, report_window_start
+
+
+class RunningTotals:
+    """Per-employee, per-day accumulators over a rolling window of days
+    
+    Each closed time log is added once. Days that fall out of the window
+    are evicted and subtracted as the calendar rolls, so window totals cost
+    O(employees) instead of a pass over the logs.
+    """
+    
+    def __init__(self, window_days=30):
+        self.window_days = window_days
+        self._day_order = []  # Day numbers with a bucket, ascending
+        self._days = {}       # day number -> {emp_id: [hours, etc, shifts]}
+        self._totals = {}     # emp_id -> [hours, etc, shifts] over the whole window
+        self._names = {}
+    
+    def add(self, time_log):
+        """Accumulate a closed time log"""
+        self._roll()
+        day = time_log.day
+        if day < self._window_start():
+            return
+        
+        if day not in self._days:
+            self._days[day] = {}
+            insort(self._day_order, day)
+        self._names[time_log.emp_id] = time_log.emp_name
+        
+        for accumulator in (self._days[day].setdefault(time_log.emp_id, [0.0, 0.0, 0]),
+                            self._totals.setdefault(time_log.emp_id, [0.0, 0.0, 0])):
+            accumulator[0] += time_log.hours_worked
+            accumulator[1] += time_log.etc
+            accumulator[2] += 1
+    
+    def employee_totals(self, days=None):
+        """Return {emp_id: {'name', 'total_hours', 'total_etc', 'days_worked'}}
+        
+        Covers the whole window by default, or the last `days` days of it.
+        """
+        self._roll()
+        if days is None or days >= self.window_days:
+            totals = self._totals
+        else:
+            start = date_key(report_window_start(days))
+            totals = {}
+            for day in reversed(self._day_order):
+                if day < start:
+                    break
+                for emp_id, (hours, etc, shifts) in self._days[day].items():
+                    accumulator = totals.setdefault(emp_id, [0.0, 0.0, 0])
+                    accumulator[0] += hours
+                    accumulator[1] += etc
+                    accumulator[2] += shifts
+        
+        return {emp_id: {'name': self._names[emp_id],
+                         'total_hours': hours,
+                         'total_etc': etc,
+                         'days_worked': shifts}
+                for emp_id, (hours, etc, shifts) in totals.items()}
+    
+    def _window_start(self):
+        """Day number of the oldest day inside the window"""
+        return date_key(report_window_start(self.window_days))
+    
+    def _roll(self):
+        """Evict days that have dropped out of the window"""
+        start = self._window_start()
+        while self._day_order and self._day_order[0] < start:
+            for emp_id, (hours, etc, shifts) in self._days.pop(self._day_order.pop(0)).items():
+                accumulator = self._totals[emp_id]
+                accumulator[0] -= hours
+                accumulator[1] -= etc
+                accumulator[2] -= shifts
+                if accumulator[2] == 0:
+                    del self._totals[emp_id]
\ No newline at end of file
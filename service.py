@@ -0,0 +1,428 @@
+"""
+Service Module - Asyncio HTTP/JSON punch service in front of SystemManager
+
+To run: python service.py --host 0.0.0.0 --port 8765
+
+Only /login, /admin/login and /metrics are open. Punches and employee
+summaries need the employee's PIN or the token /login returns; every
+other route needs the token /admin/login returns, sent as
+"Authorization: Bearer <token>". PINs are only taken from the JSON body,
+never the query string, which ends up in access logs and proxies.
+"""
+import argparse
+import asyncio
+import json
+import secrets
+import time
+import traceback
+from urllib.parse import parse_qsl, urlsplit
+from changes import ChangeFeed
+from journal import Journal
+from manager import SystemManager
+from metrics import add_arguments, instrument, start_exporters
+from payslips import PAYSLIP_FORMATS
+from reports import PartitionedDailyReport
+from sessions import add_session_arguments, session_scheduler
+from models import EmployeeNotFoundError, InvalidCredentialsError, TooManyAttemptsError
+from storage import SQLiteStorage
+
+STATUS_TEXT = {200: 'OK', 400: 'Bad Request', 401: 'Unauthorized',
+               404: 'Not Found', 405: 'Method Not Allowed', 429: 'Too Many Requests',
+               500: 'Internal Server Error'}
+PUBLIC_ROUTES = {('POST', '/login'), ('POST', '/admin/login'), ('GET', '/metrics')}
+EMPLOYEE_ROUTES = {('POST', '/time-in'), ('POST', '/time-out'), ('GET', '/summary')}
+SESSION_SECONDS = 12 * 3600  # How long a login token stays valid
+
+
+class PunchService:
+    """HTTP/JSON API over one SystemManager shared by every terminal
+    
+    Calls that only read the manager's memory run on the event loop.
+    Anything that writes SQLite or files, hashes a PIN or waits on the
+    writer thread (punches, logins, employee adds, reviews, reports, daily
+    report pages and change feed reads) runs in a worker thread, so one
+    slow write never holds up the other terminals. Punches for the same
+    employee are serialized by a per-employee lock that is held until the
+    punch is durable in the journal; punches for different employees share
+    the journal's group commit.
+    """
+    
+    def __init__(self, manager, change_feed=None):
+        self.manager = manager
+        self.change_feed = change_feed
+        self._locks = {}
+        self._sessions = {}  # token -> (emp_id, or None for the admin; expiry time)
+        self.routes = {
+            ('POST', '/login'): self.login,
+            ('POST', '/admin/login'): self.admin_login,
+            ('POST', '/time-in'): self.time_in,
+            ('POST', '/time-out'): self.time_out,
+            ('GET', '/summary'): self.summary,
+            ('GET', '/employees'): self.list_employees,
+            ('POST', '/employees'): self.add_employee,
+            ('GET', '/daily-report'): self.daily_report,
+            ('GET', '/live-totals'): self.live_totals,
+            ('POST', '/reports/weekly'): self.weekly_report,
+            ('POST', '/reports/monthly'): self.monthly_report,
+            ('POST', '/reports/summary'): self.summary_reports,
+            ('POST', '/reports/payroll'): self.payroll_report,
+            ('POST', '/reports/payslips'): self.payslips,
+            ('GET', '/metrics'): self.metrics,
+            ('GET', '/changes'): self.changes,
+            ('GET', '/auto-closed'): self.auto_closed,
+            ('POST', '/auto-closed/reviewed'): self.mark_reviewed,
+        }
+    
+    async def serve(self, host="127.0.0.1", port=8765):
+        """Start listening; returns the asyncio server"""
+        return await asyncio.start_server(self.handle_connection, host, port)
+    
+    async def handle_connection(self, reader, writer):
+        """Serve keep-alive HTTP/1.1 requests on one connection"""
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                except ValueError as e:
+                    # The rest of the stream cannot be trusted, so answer and hang up
+                    await self._respond(writer, 400, {'ok': False, 'error': f"Bad request: {e}"}, False)
+                    break
+                if request is None:
+                    break
+                method, target, headers, body = request
+                status, payload = await self.dispatch(method, target, body, headers)
+                
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+    
+    @staticmethod
+    async def _respond(writer, status, payload, keep_alive):
+        data = json.dumps(payload).encode('utf-8')
+        writer.write(f"HTTP/1.1 {status} {STATUS_TEXT.get(status, 'OK')}\r\n"
+                     f"Content-Type: application/json\r\n"
+                     f"Content-Length: {len(data)}\r\n"
+                     f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+                     f"\r\n".encode('latin-1') + data)
+        await writer.drain()
+    
+    async def dispatch(self, method, target, body, headers=None):
+        """Route a request and turn manager errors into HTTP statuses"""
+        url = urlsplit(target)
+        handler = self.routes.get((method, url.path))
+        if handler is None:
+            known_path = any(path == url.path for _, path in self.routes)
+            return (405 if known_path else 404), {'ok': False, 'error': "Not found"}
+        
+        try:
+            params = dict(parse_qsl(url.query))
+            if 'pin' in params:
+                raise ValueError("send the PIN in the request body, not the URL")
+            if body:
+                payload = json.loads(body)
+                if not isinstance(payload, dict):
+                    raise ValueError("the request body must be a JSON object")
+                params.update(payload)
+            if (method, url.path) not in PUBLIC_ROUTES:
+                authorization = (headers or {}).get('authorization', '')
+                await self._authorize((method, url.path), params, authorization)
+            return 200, await handler(params)
+        except EmployeeNotFoundError as e:
+            return 404, {'ok': False, 'error': str(e), 'error_type': 'EmployeeNotFoundError'}
+        except InvalidCredentialsError as e:
+            return 401, {'ok': False, 'error': str(e), 'error_type': 'InvalidCredentialsError'}
+        except TooManyAttemptsError as e:
+            return 429, {'ok': False, 'error': str(e), 'error_type': 'TooManyAttemptsError'}
+        except (KeyError, ValueError) as e:
+            return 400, {'ok': False, 'error': f"Bad request: {e}"}
+        except Exception:
+            # A storage or manager failure fails this request, not the terminal's connection
+            traceback.print_exc()
+            return 500, {'ok': False, 'error': STATUS_TEXT[500]}
+    
+    async def login(self, params):
+        # PIN hashing is slow on purpose, so it runs off the event loop
+        employee = await asyncio.to_thread(self.manager.verify_employee_login,
+                                           self._text(params, 'emp_id'), self._text(params, 'pin'))
+        return {'ok': True, 'employee': self._employee_dict(employee),
+                'token': self._issue_token(employee.emp_id)}
+    
+    async def admin_login(self, params):
+        if not await asyncio.to_thread(self.manager.verify_admin_login, self._text(params, 'pin')):
+            return {'ok': False}
+        return {'ok': True, 'token': self._issue_token(None)}
+    
+    async def time_in(self, params):
+        return await self._punch(self.manager.time_in_employee, self._text(params, 'emp_id'))
+    
+    async def time_out(self, params):
+        return await self._punch(self.manager.time_out_employee, self._text(params, 'emp_id'))
+    
+    async def summary(self, params):
+        emp_id = self._text(params, 'emp_id')
+        self._require_employee(emp_id)
+        return {'ok': True, 'summary': self.manager.get_employee_summary(emp_id)}
+    
+    async def list_employees(self, params):
+        return {'ok': True, 'employees': [self._employee_dict(emp)
+                                          for emp in self.manager.get_all_employees()]}
+    
+    async def add_employee(self, params):
+        # Hashing the new PIN is slow on purpose, as for logins
+        success, message = await asyncio.to_thread(self.manager.add_employee,
+                                                   self._text(params, 'emp_id'),
+                                                   self._text(params, 'name'),
+                                                   self._text(params, 'pin'),
+                                                   self._number(params, 'hourly_rate', float))
+        return {'ok': success, 'message': message}
+    
+    async def daily_report(self, params):
+        rows = await asyncio.to_thread(self.manager.get_daily_report_data,
+                                       self._number(params, 'offset', int, 0),
+                                       self._number(params, 'limit', int, None),
+                                       self._text(params, 'date', None))
+        return {'ok': True, 'rows': rows}
+    
+    async def live_totals(self, params):
+        return {'ok': True, 'totals': self.manager.get_live_totals()}
+    
+    async def weekly_report(self, params):
+        return self._result(await asyncio.to_thread(self.manager.generate_weekly_report))
+    
+    async def monthly_report(self, params):
+        return self._result(await asyncio.to_thread(self.manager.generate_monthly_report))
+    
+    async def summary_reports(self, params):
+        return self._result(await asyncio.to_thread(self.manager.generate_summary_reports))
+    
+    async def payroll_report(self, params):
+        start, end = self._text(params, 'start', None), self._text(params, 'end', None)
+        return self._result(await asyncio.to_thread(self.manager.generate_payroll_report, start, end))
+    
+    async def payslips(self, params):
+        start, end = self._text(params, 'start', None), self._text(params, 'end', None)
+        formats = params.get('formats') or PAYSLIP_FORMATS
+        if not isinstance(formats, (list, tuple)) or not all(isinstance(f, str) for f in formats):
+            raise ValueError("formats must be a list of strings")
+        return self._result(await asyncio.to_thread(self.manager.generate_payslips, start, end,
+                                                    formats=tuple(formats)))
+    
+    async def metrics(self, params):
+        metrics = getattr(self.manager, 'metrics', None)
+        if metrics is None:
+            raise ValueError("metrics are not enabled")
+        return {'ok': True, 'metrics': metrics.snapshot()}
+    
+    async def auto_closed(self, params):
+        # The review list is loaded from storage on first use
+        sessions = await asyncio.to_thread(self.manager.auto_closed_sessions)
+        return {'ok': True, 'sessions': [
+            {'emp_id': log.emp_id, 'emp_name': log.emp_name, 'hourly_rate': log.hourly_rate,
+             'day': log.day, 'time_in': log.time_in_ts, 'time_out': log.time_out_ts,
+             'hours_worked': log.hours_worked, 'etc': log.etc, 'reason': reason}
+            for log, reason in sessions]}
+    
+    async def mark_reviewed(self, params):
+        emp_id, time_in = self._text(params, 'emp_id'), self._number(params, 'time_in', int)
+        await asyncio.to_thread(self.manager.mark_reviewed, emp_id, time_in)
+        return {'ok': True}
+    
+    async def changes(self, params):
+        """Up to `limit` change feed events from byte `position`, with the position to ask for next"""
+        if self.change_feed is None:
+            raise ValueError("the change feed is not enabled")
+        position = self._number(params, 'position', int, 0)
+        limit = self._number(params, 'limit', int, 1000)
+        
+        def read():
+            nonlocal position
+            events = []
+            for event, next_position in self.change_feed.read(position):
+                events.append(event)
+                position = next_position
+                if len(events) >= limit:
+                    break
+            return events
+        events = await asyncio.to_thread(read)
+        return {'ok': True, 'events': events, 'position': position}
+    
+    def _issue_token(self, emp_id):
+        """New session token for an employee (None for the admin), dropping expired ones"""
+        now = time.monotonic()
+        for token in [token for token, (_, expires) in self._sessions.items() if expires < now]:
+            del self._sessions[token]
+        token = secrets.token_urlsafe(32)
+        self._sessions[token] = (emp_id, now + SESSION_SECONDS)
+        return token
+    
+    async def _authorize(self, route, params, authorization):
+        """Raise InvalidCredentialsError unless the request may use the route
+        
+        An admin token opens every route. Employee routes also take that
+        employee's token, or their PIN in the request.
+        """
+        scheme, _, token = authorization.partition(' ')
+        session = self._sessions.get(token) if scheme.lower() == 'bearer' else None
+        if session is not None and session[1] < time.monotonic():
+            del self._sessions[token]
+            session = None
+        if session is not None and session[0] is None:
+            return
+        if route in EMPLOYEE_ROUTES:
+            emp_id = self._text(params, 'emp_id')
+            if session is not None and session[0] == emp_id:
+                return
+            if session is None and 'pin' in params:
+                await asyncio.to_thread(self.manager.verify_employee_login, emp_id,
+                                        self._text(params, 'pin'))
+                return
+        raise InvalidCredentialsError("Log in first!" if session is None else "Not allowed!")
+    
+    async def _punch(self, punch, emp_id):
+        """Apply a punch under the employee's lock and reply once it is durable"""
+        self._require_employee(emp_id)
+        lock = self._locks.get(emp_id)
+        if lock is None:
+            lock = self._locks[emp_id] = asyncio.Lock()
+        
+        async with lock:
+            # The punch writes the journal and SQLite; the lock keeps this employee's in order
+            result = await asyncio.to_thread(punch, emp_id)
+            await self._journal_synced()
+        return self._result(result)
+    
+    async def _journal_synced(self):
+        """Wait for the journal's group commit to cover everything written so far"""
+        journal = self.manager.journal
+        if journal is None:
+            return
+        loop = asyncio.get_running_loop()
+        synced = loop.create_future()
+        
+        def done():
+            loop.call_soon_threadsafe(lambda: synced.done() or synced.set_result(None))
+        
+        journal.on_durable(journal.last_seq, done)
+        await synced
+    
+    @staticmethod
+    def _text(params, name, default=KeyError):
+        """A string parameter, so mistyped JSON is a 400 and not a TypeError deep in a handler"""
+        if name not in params and default is not KeyError:
+            return default
+        value = params[name]
+        if not isinstance(value, str):
+            raise ValueError(f"{name} must be a string")
+        return value
+    
+    @staticmethod
+    def _number(params, name, kind, default=KeyError):
+        """A numeric parameter converted with kind (int or float); query strings give text"""
+        if params.get(name) is None and default is not KeyError:
+            return default
+        value = params[name]
+        if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+            raise ValueError(f"{name} must be a number")
+        try:
+            return kind(value)
+        except OverflowError:
+            raise ValueError(f"{name} is out of range") from None
+    
+    def _require_employee(self, emp_id):
+        if emp_id not in self.manager.employees:
+            raise EmployeeNotFoundError("Employee ID not found!")
+    
+    @staticmethod
+    def _result(result):
+        success, message = result
+        return {'ok': success, 'message': message}
+    
+    @staticmethod
+    def _employee_dict(employee):
+        return {'emp_id': employee.emp_id, 'name': employee.name,
+                'hourly_rate': employee.hourly_rate}
+    
+    @staticmethod
+    async def _read_request(reader):
+        """Read one request; returns None when the client closed the connection"""
+        try:
+            head = await reader.readuntil(b'\r\n\r\n')
+        except asyncio.IncompleteReadError as e:
+            if e.partial.strip():
+                raise
+            return None
+        
+        lines = head.decode('latin-1').split('\r\n')
+        request_line = lines[0].split(' ')
+        if len(request_line) != 3 or not request_line[1].startswith('/'):
+            raise ValueError(f"malformed request line {lines[0][:100]!r}")
+        method, target, _ = request_line
+        headers = {}
+        for line in lines[1:]:
+            if line:
+                name, _, value = line.partition(':')
+                headers[name.strip().lower()] = value.strip()
+        
+        try:
+            length = int(headers.get('content-length', 0))
+        except ValueError:
+            raise ValueError("invalid Content-Length") from None
+        if length < 0:
+            raise ValueError("invalid Content-Length")
+        body = await reader.readexactly(length) if length else b''
+        return method, target, headers, body
+
+
+def main():
+    """Run the punch service until interrupted"""
+    parser = argparse.ArgumentParser(description="Timekeeping punch service")
+    parser.add_argument('--host', default="127.0.0.1")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--db', default="payroll.db")
+    parser.add_argument('--journal', default="punches.journal")
+    parser.add_argument('--reports', default="reports", help="daily report partition directory")
+    parser.add_argument('--compress-after-days', type=int, default=None,
+                        help="compress daily report partitions older than this many days")
+    parser.add_argument('--change-feed', metavar='FILE',
+                        help="publish punches and employee adds to this change log")
+    add_session_arguments(parser)
+    add_arguments(parser)
+    args = parser.parse_args()
+    metrics, exporters = start_exporters(args)
+    
+    manager = SystemManager(SQLiteStorage(args.db, seed_report="daily_report.csv"),
+                            Journal(args.journal, wait_for_sync=False),
+                            PartitionedDailyReport(args.reports,
+                                                   compress_after_days=args.compress_after_days))
+    if metrics is not None:
+        instrument(manager, metrics)
+    change_feed = ChangeFeed(args.change_feed).attach(manager) if args.change_feed else None
+    service = PunchService(manager, change_feed)
+    scheduler = session_scheduler(manager, args).start()
+    
+    async def run():
+        server = await service.serve(args.host, args.port)
+        print(f"Punch service listening on http://{args.host}:{args.port}")
+        async with server:
+            await server.serve_forever()
+    
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        scheduler.close()
+        manager.close()
+        if change_feed is not None:
+            change_feed.close()
+        for exporter in exporters:
+            exporter.close()
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
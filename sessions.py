@@ -0,0 +1,150 @@
+"""
+Sessions Module - Deadline scheduler that times out forgotten sessions
+"""
+import heapq
+import threading
+import time
+from datetime import datetime, timedelta
+
+DEFAULT_MAX_SHIFT_HOURS = 16
+
+
+class StaleSessionScheduler:
+    """Min-heap of active session deadlines for one SystemManager
+    
+    A session's deadline is the earlier of time in + `max_shift_hours` and
+    the first `closing_time` after time in. Pushing a time in and popping a
+    due deadline are O(log n); time outs are not removed from the heap but
+    skipped when their deadline comes up, by matching the session's time in.
+    
+    Once a deadline plus `grace_minutes` has passed the session is timed
+    out at the deadline and listed for admin review (action='close'), or
+    only listed in `flagged` while it stays open (action='flag'). Run it
+    with start() on a background thread, or call tick() from a Tk `after`
+    loop.
+    """
+    
+    def __init__(self, manager, max_shift_hours=DEFAULT_MAX_SHIFT_HOURS, closing_time=None,
+                 grace_minutes=0, action='close'):
+        if action not in ('close', 'flag'):
+            raise ValueError(f"Unknown stale session action: {action}")
+        self.manager = manager
+        self.max_shift_hours = max_shift_hours
+        self.closing_time = closing_time
+        self.grace_seconds = grace_minutes * 60
+        self.action = action
+        self.flagged = {}  # emp_id -> (time log, reason), open sessions past their deadline
+        self._heap = []    # (due, emp_id, time_in_ts, deadline, reason)
+        self._changed = threading.Condition()
+        self._thread = None
+        self._stopped = False
+        
+        manager.add_listener(self._on_change)
+        for time_log in list(manager.active_sessions.values()):
+            self.push(time_log)
+    
+    def deadline(self, time_log):
+        """Return (timestamp the session should have ended by, reason)"""
+        time_in = time_log.time_in_ts
+        deadline = time_in + self.max_shift_hours * 3600
+        reason = f"Shift longer than {self.max_shift_hours:g} hours"
+        if self.closing_time is not None:
+            started = datetime.fromtimestamp(time_in)
+            closing = datetime.combine(started.date(), self.closing_time)
+            if closing <= started:
+                closing += timedelta(days=1)
+            if closing.timestamp() < deadline:
+                deadline = int(closing.timestamp())
+                reason = f"Still timed in at closing ({self.closing_time:%H:%M})"
+        return deadline, reason
+    
+    def push(self, time_log):
+        """Schedule an active session's deadline"""
+        deadline, reason = self.deadline(time_log)
+        entry = (deadline + self.grace_seconds, time_log.emp_id, time_log.time_in_ts, deadline, reason)
+        with self._changed:
+            heapq.heappush(self._heap, entry)
+            if self._heap[0] is entry:
+                self._changed.notify()  # Earlier than what the thread is sleeping towards
+    
+    def next_due(self):
+        """When the earliest scheduled deadline falls due (None when nothing is scheduled)"""
+        with self._changed:
+            return self._heap[0][0] if self._heap else None
+    
+    def tick(self, now=None):
+        """Handle every session due by `now`; returns the (time log, reason) pairs acted on"""
+        now = time.time() if now is None else now
+        due = []
+        with self._changed:
+            while self._heap and self._heap[0][0] <= now:
+                due.append(heapq.heappop(self._heap))
+        
+        # The manager is called without our lock held: its listeners call back into push()
+        handled = []
+        for _, emp_id, time_in_ts, deadline, reason in due:
+            if self.action == 'close':
+                time_log = self.manager.auto_close_session(emp_id, time_in_ts,
+                                                           datetime.fromtimestamp(deadline), reason)
+            else:
+                time_log = self.manager.active_sessions.get(emp_id)
+                if time_log is None or time_log.time_in_ts != time_in_ts:
+                    time_log = None
+                else:
+                    self.flagged[emp_id] = (time_log, reason)
+            if time_log is not None:
+                handled.append((time_log, reason))
+        return handled
+    
+    def start(self):
+        """Handle deadlines on a background thread as they fall due"""
+        self._thread = threading.Thread(target=self._run, name="stale-sessions", daemon=True)
+        self._thread.start()
+        return self
+    
+    def close(self):
+        """Stop the background thread and stop following the manager"""
+        self.manager.remove_listener(self._on_change)
+        with self._changed:
+            self._stopped = True
+            self._changed.notify()
+        if self._thread is not None:
+            self._thread.join()
+    
+    def _run(self):
+        while True:
+            with self._changed:
+                if self._stopped:
+                    return
+                due = self._heap[0][0] if self._heap else None
+                if due is None or due > time.time():
+                    self._changed.wait(None if due is None else due - time.time())
+                    continue
+            self.tick()
+    
+    def _on_change(self, event_type, item):
+        if event_type == 'time_in':
+            self.push(item)
+        elif event_type == 'time_out':
+            flagged = self.flagged.get(item.emp_id)
+            if flagged is not None and flagged[0] is item:
+                del self.flagged[item.emp_id]
+
+
+def add_session_arguments(parser):
+    """Add the stale session options shared by the GUI and the punch service"""
+    parser.add_argument('--max-shift-hours', type=float, default=DEFAULT_MAX_SHIFT_HOURS,
+                        help=f"time out sessions open this long (default {DEFAULT_MAX_SHIFT_HOURS})")
+    parser.add_argument('--closing-time', type=lambda value: datetime.strptime(value, "%H:%M").time(),
+                        help="time out sessions still open at store closing (HH:MM)")
+    parser.add_argument('--grace-minutes', type=float, default=0,
+                        help="wait this long past a session's deadline before acting (default 0)")
+    parser.add_argument('--flag-stale-sessions', action='store_true',
+                        help="only flag overdue sessions for review instead of timing them out")
+
+
+def session_scheduler(manager, args):
+    """StaleSessionScheduler configured from parsed session options"""
+    return StaleSessionScheduler(manager, args.max_shift_hours, args.closing_time,
+                                 grace_minutes=args.grace_minutes,
+                                 action='flag' if args.flag_stale_sessions else 'close')
\ No newline at end of file
@@ -0,0 +1,266 @@
+"""
+Storage Module - Pluggable persistence for employees, active sessions and time logs
+"""
+import csv
+import os
+import sqlite3
+import threading
+from models import Employee
+from timelog import TimeLog
+from timelog_store import date_key
+
+
+class Storage:
+    """Storage interface; this base class keeps nothing (in-memory system)"""
+    
+    def load_employees(self):
+        """Return all stored employees"""
+        return []
+    
+    def load_active_sessions(self):
+        """Return time logs that are timed in but not yet timed out"""
+        return []
+    
+    def load_time_logs(self, start=None, end=None):
+        """Return closed time logs dated between start and end (inclusive)"""
+        return []
+    
+    def save_employee(self, employee):
+        """Persist a new employee"""
+    
+    def save_employees(self, batches):
+        """Persist batches of new employees in one transaction; returns the count"""
+        return sum(len(batch) for batch in batches)
+    
+    def save_time_logs(self, time_logs):
+        """Persist closed time logs in one transaction (bulk loads); returns the count"""
+        return len(list(time_logs))
+    
+    def employee_totals(self, start=None, end=None):
+        """Return {emp_id: {'name', 'total_hours', 'total_etc', 'days_worked'}} for logs
+        dated between start and end, computed by the store"""
+        return {}
+    
+    def update_employee_pin(self, employee):
+        """Persist a changed PIN hash"""
+    
+    def save_active_session(self, time_log):
+        """Persist a time in"""
+    
+    def close_session(self, time_log):
+        """Persist a time out: drop the active session and store the closed log"""
+    
+    def save_auto_closed(self, time_log, reason):
+        """Record that a closed time log was timed out automatically"""
+    
+    def load_auto_closed(self):
+        """Return (time log, reason) for automatic time outs not yet reviewed"""
+        return []
+    
+    def mark_reviewed(self, emp_id, time_in_ts):
+        """Take an automatic time out off the review list"""
+    
+    def close(self):
+        """Release any resources held by the backend"""
+
+
+class SQLiteStorage(Storage):
+    """SQLite backend running in WAL mode
+    
+    All statements are fixed SQL strings, so sqlite3 prepares each one once
+    and reuses it from its statement cache. The connection is shared between
+    threads, so every statement runs under one lock.
+    """
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS employees (
+            emp_id TEXT PRIMARY KEY,
+            name TEXT NOT NULL,
+            pin TEXT NOT NULL,
+            hourly_rate REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS active_sessions (
+            emp_id TEXT PRIMARY KEY,
+            emp_name TEXT NOT NULL,
+            hourly_rate REAL NOT NULL,
+            date TEXT NOT NULL,
+            time_in INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS time_logs (
+            id INTEGER PRIMARY KEY,
+            emp_id TEXT NOT NULL,
+            emp_name TEXT NOT NULL,
+            hourly_rate REAL NOT NULL,
+            date TEXT NOT NULL,
+            time_in INTEGER NOT NULL,
+            time_out INTEGER NOT NULL,
+            hours_worked REAL NOT NULL,
+            etc REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_time_logs_emp_date ON time_logs (emp_id, date);
+        CREATE INDEX IF NOT EXISTS idx_time_logs_date ON time_logs (date);
+        CREATE TABLE IF NOT EXISTS auto_closed (
+            emp_id TEXT NOT NULL,
+            time_in INTEGER NOT NULL,
+            time_out INTEGER NOT NULL,
+            reason TEXT NOT NULL,
+            reviewed INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (emp_id, time_in)
+        );
+    """
+    
+    INSERT_EMPLOYEE = "INSERT INTO employees (emp_id, name, pin, hourly_rate) VALUES (?, ?, ?, ?)"
+    UPDATE_EMPLOYEE_PIN = "UPDATE employees SET pin = ? WHERE emp_id = ?"
+    INSERT_SESSION = ("INSERT OR REPLACE INTO active_sessions "
+                      "(emp_id, emp_name, hourly_rate, date, time_in) VALUES (?, ?, ?, ?, ?)")
+    DELETE_SESSION = "DELETE FROM active_sessions WHERE emp_id = ?"
+    INSERT_TIME_LOG = ("INSERT INTO time_logs (emp_id, emp_name, hourly_rate, date, time_in, "
+                       "time_out, hours_worked, etc) VALUES (?, ?, ?, ?, ?, ?, ?, ?)")
+    # Same, unless the employee already has a log starting then (uses idx_time_logs_emp_date)
+    INSERT_NEW_TIME_LOG = ("INSERT INTO time_logs (emp_id, emp_name, hourly_rate, date, time_in, "
+                           "time_out, hours_worked, etc) SELECT ?1, ?2, ?3, ?4, ?5, ?6, ?7, ?8 "
+                           "WHERE NOT EXISTS (SELECT 1 FROM time_logs "
+                           "WHERE emp_id = ?1 AND date = ?4 AND time_in = ?5)")
+    SELECT_EMPLOYEES = "SELECT emp_id, name, pin, hourly_rate FROM employees"
+    SELECT_SESSIONS = "SELECT emp_id, emp_name, hourly_rate, date, time_in FROM active_sessions"
+    SELECT_TIME_LOGS = ("SELECT emp_id, emp_name, hourly_rate, date, time_in, time_out, "
+                        "hours_worked, etc FROM time_logs "
+                        "WHERE date >= ? AND date <= ? ORDER BY date, time_in")
+    INSERT_AUTO_CLOSED = ("INSERT OR REPLACE INTO auto_closed (emp_id, time_in, time_out, reason) "
+                          "VALUES (?, ?, ?, ?)")
+    SELECT_AUTO_CLOSED = ("SELECT t.emp_id, t.emp_name, t.hourly_rate, t.date, t.time_in, t.time_out, "
+                          "t.hours_worked, t.etc, a.reason FROM auto_closed a JOIN time_logs t "
+                          "ON t.emp_id = a.emp_id AND t.time_in = a.time_in AND t.time_out = a.time_out "
+                          "WHERE a.reviewed = 0 ORDER BY t.time_out")
+    UPDATE_REVIEWED = "UPDATE auto_closed SET reviewed = 1 WHERE emp_id = ? AND time_in = ?"
+    SELECT_EMPLOYEE_TOTALS = ("SELECT emp_id, MAX(emp_name), SUM(hours_worked), SUM(etc), COUNT(*) "
+                              "FROM time_logs WHERE date >= ? AND date <= ? GROUP BY emp_id")
+    
+    def __init__(self, path="payroll.db", seed_report=None):
+        self.path = path
+        is_new = not os.path.isfile(path)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(self.SCHEMA)
+        
+        # Carry over history written before the database existed
+        if is_new and seed_report and os.path.isfile(seed_report):
+            self.import_daily_report(seed_report)
+    
+    def import_daily_report(self, filename):
+        """Load closed time logs from an existing daily report CSV
+        
+        Logs whose employee already has one starting at the same time (from
+        an earlier import of the same file, say) are skipped, so importing
+        twice does not double anyone's hours. Returns (imported, skipped).
+        """
+        with open(filename, 'r', newline='') as f:
+            reader = csv.reader(f)
+            next(reader, None)  # Skip header
+            rows = [self._time_log_row(TimeLog.from_csv_row(row)) for row in reader if row]
+        with self._lock, self.conn:
+            before = self.conn.total_changes
+            self.conn.executemany(self.INSERT_NEW_TIME_LOG, rows)
+            imported = self.conn.total_changes - before
+        return imported, len(rows) - imported
+    
+    def load_employees(self):
+        with self._lock:
+            rows = self.conn.execute(self.SELECT_EMPLOYEES).fetchall()
+        return [Employee(emp_id, name, pin, hourly_rate)
+                for emp_id, name, pin, hourly_rate in rows]
+    
+    def load_active_sessions(self):
+        with self._lock:
+            rows = self.conn.execute(self.SELECT_SESSIONS).fetchall()
+        return [TimeLog.from_epoch(emp_id, emp_name, hourly_rate, date_key(date), int(time_in))
+                for emp_id, emp_name, hourly_rate, date, time_in in rows]
+    
+    def load_time_logs(self, start=None, end=None):
+        start = str(start) if start is not None else ''
+        end = str(end) if end is not None else '9999-12-31'
+        days = {}
+        time_logs = []
+        with self._lock:
+            for emp_id, emp_name, hourly_rate, date, time_in, time_out, hours_worked, etc \
+                    in self.conn.execute(self.SELECT_TIME_LOGS, (start, end)):
+                day = days.get(date)
+                if day is None:
+                    day = days[date] = date_key(date)
+                time_logs.append(TimeLog.from_epoch(emp_id, emp_name, hourly_rate, day,
+                                                    int(time_in), int(time_out), hours_worked, etc))
+        return time_logs
+    
+    def employee_totals(self, start=None, end=None):
+        start = str(start) if start is not None else ''
+        end = str(end) if end is not None else '9999-12-31'
+        with self._lock:
+            rows = self.conn.execute(self.SELECT_EMPLOYEE_TOTALS, (start, end)).fetchall()
+        return {emp_id: {'name': name, 'total_hours': hours, 'total_etc': etc, 'days_worked': shifts}
+                for emp_id, name, hours, etc, shifts in rows}
+    
+    def save_employee(self, employee):
+        with self._lock, self.conn:
+            self.conn.execute(self.INSERT_EMPLOYEE, (employee.emp_id, employee.name,
+                                                     employee.pin, employee.hourly_rate))
+    
+    def save_time_logs(self, time_logs):
+        rows = [self._time_log_row(time_log) for time_log in time_logs]
+        with self._lock, self.conn:
+            self.conn.executemany(self.INSERT_TIME_LOG, rows)
+        return len(rows)
+    
+    def save_employees(self, batches):
+        count = 0
+        with self._lock, self.conn:
+            for batch in batches:
+                self.conn.executemany(self.INSERT_EMPLOYEE, [
+                    (employee.emp_id, employee.name, employee.pin, employee.hourly_rate)
+                    for employee in batch])
+                count += len(batch)
+        return count
+    
+    def update_employee_pin(self, employee):
+        with self._lock, self.conn:
+            self.conn.execute(self.UPDATE_EMPLOYEE_PIN, (employee.pin, employee.emp_id))
+    
+    def save_active_session(self, time_log):
+        with self._lock, self.conn:
+            self.conn.execute(self.INSERT_SESSION, (time_log.emp_id, time_log.emp_name,
+                                                    time_log.hourly_rate, time_log.date,
+                                                    time_log.time_in_ts))
+    
+    def close_session(self, time_log):
+        with self._lock, self.conn:
+            self.conn.execute(self.DELETE_SESSION, (time_log.emp_id,))
+            self.conn.execute(self.INSERT_TIME_LOG, self._time_log_row(time_log))
+    
+    def save_auto_closed(self, time_log, reason):
+        with self._lock, self.conn:
+            self.conn.execute(self.INSERT_AUTO_CLOSED, (time_log.emp_id, time_log.time_in_ts,
+                                                        time_log.time_out_ts, reason))
+    
+    def load_auto_closed(self):
+        with self._lock:
+            rows = self.conn.execute(self.SELECT_AUTO_CLOSED).fetchall()
+        return [(TimeLog.from_epoch(emp_id, emp_name, hourly_rate, date_key(date), int(time_in),
+                                    int(time_out), hours_worked, etc), reason)
+                for emp_id, emp_name, hourly_rate, date, time_in, time_out, hours_worked, etc, reason
+                in rows]
+    
+    def mark_reviewed(self, emp_id, time_in_ts):
+        with self._lock, self.conn:
+            self.conn.execute(self.UPDATE_REVIEWED, (emp_id, time_in_ts))
+    
+    def close(self):
+        with self._lock:
+            self.conn.close()
+    
+    @staticmethod
+    def _time_log_row(time_log):
+        """Convert a closed time log to INSERT_TIME_LOG parameters"""
+        return (time_log.emp_id, time_log.emp_name, time_log.hourly_rate, time_log.date,
+                time_log.time_in_ts, time_log.time_out_ts,
+                time_log.hours_worked, time_log.etc)
\ No newline at end of file
@@ -1,37 +1,113 @@
 """
 Time Log Module - Handles time tracking logic
 """
-from datetime import datetime
+from datetime import datetime, timedelta
 from models import TimeInNotFoundError
 
 class TimeLog:
-    """Class to handle time in/out records"""
+    """Class to handle time in/out records
+    
+    Slotted, with the date kept as a day number and times as integer epoch
+    seconds; `date`, `time_in` and `time_out` convert on access.
+    """
+    
+    __slots__ = ('emp_id', 'emp_name', 'hourly_rate', 'day',
+                 'time_in_ts', 'time_out_ts', 'hours_worked', 'etc')
     
     def __init__(self, emp_id, emp_name, hourly_rate):
         self.emp_id = emp_id
         self.emp_name = emp_name
         self.hourly_rate = hourly_rate
-        self.date = datetime.now().strftime("%Y-%m-%d")
-        self.time_in = None
-        self.time_out = None
+        self.day = datetime.now().toordinal()
+        self.time_in_ts = None
+        self.time_out_ts = None
         self.hours_worked = 0.0
         self.etc = 0.0
     
-    def record_time_in(self):
-        """Record time in"""
-        self.time_in = datetime.now()
+    @property
+    def date(self):
+        """Date of the time in as 'YYYY-MM-DD'"""
+        return datetime.fromordinal(self.day).strftime("%Y-%m-%d")
+    
+    @date.setter
+    def date(self, value):
+        self.day = datetime.strptime(value, "%Y-%m-%d").toordinal()
+    
+    @property
+    def time_in(self):
+        """Time in as a datetime, or None"""
+        return None if self.time_in_ts is None else datetime.fromtimestamp(self.time_in_ts)
+    
+    @time_in.setter
+    def time_in(self, value):
+        self.time_in_ts = None if value is None else int(value.timestamp())
+    
+    @property
+    def time_out(self):
+        """Time out as a datetime, or None"""
+        return None if self.time_out_ts is None else datetime.fromtimestamp(self.time_out_ts)
+    
+    @time_out.setter
+    def time_out(self, value):
+        self.time_out_ts = None if value is None else int(value.timestamp())
+    
+    @classmethod
+    def restore(cls, emp_id, emp_name, hourly_rate, date, time_in,
+                time_out=None, hours_worked=0.0, etc=0.0):
+        """Rebuild a time log from stored values"""
+        time_log = cls(emp_id, emp_name, hourly_rate)
+        time_log.date = date
+        time_log.time_in = time_in
+        time_log.time_out = time_out
+        time_log.hours_worked = hours_worked
+        time_log.etc = etc
+        return time_log
+    
+    @classmethod
+    def from_epoch(cls, emp_id, emp_name, hourly_rate, day, time_in_ts,
+                   time_out_ts=None, hours_worked=0.0, etc=0.0):
+        """Rebuild a time log from a day number and epoch seconds without conversions"""
+        time_log = cls.__new__(cls)
+        time_log.emp_id = emp_id
+        time_log.emp_name = emp_name
+        time_log.hourly_rate = hourly_rate
+        time_log.day = day
+        time_log.time_in_ts = time_in_ts
+        time_log.time_out_ts = time_out_ts
+        time_log.hours_worked = hours_worked
+        time_log.etc = etc
+        return time_log
+    
+    @classmethod
+    def from_csv_row(cls, row):
+        """Rebuild a closed time log from a daily report CSV row"""
+        emp_id, emp_name, date, time_in, time_out, hours_worked, etc = row[:7]
+        hours_worked = float(hours_worked)
+        etc = float(etc)
+        hourly_rate = etc / hours_worked if hours_worked else 0.0
+        
+        time_in = datetime.strptime(f"{date} {time_in}", "%Y-%m-%d %I:%M %p")
+        time_out = datetime.strptime(f"{date} {time_out}", "%Y-%m-%d %I:%M %p")
+        if time_out < time_in:
+            time_out += timedelta(days=1)  # Shift crossed midnight
+        
+        return cls.restore(emp_id, emp_name, hourly_rate, date, time_in,
+                           time_out, hours_worked, etc)
+    
+    def record_time_in(self, at=None):
+        """Record time in (now, unless a time is given)"""
+        self.time_in = at or datetime.now()
         return self.time_in.strftime("%I:%M %p")
     
-    def record_time_out(self):
-        """Record time out and calculate hours worked"""
+    def record_time_out(self, at=None):
+        """Record time out (now, unless a time is given) and calculate hours worked"""
         if self.time_in is None:
             raise TimeInNotFoundError("Cannot time out without timing in first!")
         
-        self.time_out = datetime.now()
+        self.time_out = at or datetime.now()
         
         # Calculate hours worked
-        time_diff = self.time_out - self.time_in
-        self.hours_worked = time_diff.total_seconds() / 3600
+        self.hours_worked = (self.time_out_ts - self.time_in_ts) / 3600
         
         # Calculate ETC (Estimated Time Compensation)
         self.etc = self.hours_worked * self.hourly_rate
@@ -0,0 +1,186 @@
+"""
+Time Log Store Module - Indexed storage for closed time logs
+"""
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, time, timedelta
+from timelog import TimeLog
+
+
+def date_key(value):
+    """Convert a date, datetime or 'YYYY-MM-DD' string to a sortable day number"""
+    if isinstance(value, str):
+        return date.fromisoformat(value).toordinal()
+    if isinstance(value, datetime):
+        return value.date().toordinal()
+    if isinstance(value, date):
+        return value.toordinal()
+    return int(value)
+
+
+def report_window_start(days):
+    """First log date falling within the last `days` days"""
+    cutoff = datetime.now() - timedelta(days=days)
+    start = cutoff.date()
+    if cutoff.time() != time.min:
+        start += timedelta(days=1)
+    return start
+
+
+class TimeLogTable:
+    """Struct-of-arrays container for closed time logs
+    
+    Each field is a typed `array` column, and employee ID/name pairs are
+    interned once. Supports append, indexing, slicing and iteration like a
+    list of TimeLog objects, which are materialized on access.
+    """
+    
+    COLUMNS = (('person', 'l'), ('hourly_rate', 'd'), ('day', 'l'), ('time_in_ts', 'q'),
+               ('time_out_ts', 'q'), ('hours_worked', 'd'), ('etc', 'd'))
+    
+    def __init__(self, people=None, person_index=None):
+        self.people = people if people is not None else []  # (emp_id, emp_name) pairs
+        self._person_index = person_index if person_index is not None else {}
+        for name, typecode in self.COLUMNS:
+            setattr(self, name, array(typecode))
+    
+    def append(self, time_log):
+        """Add a closed time log at the end"""
+        for name, value in zip(self._column_names(), self._values(time_log)):
+            getattr(self, name).append(value)
+    
+    def insert(self, position, time_log):
+        """Add a closed time log before `position`"""
+        for name, value in zip(self._column_names(), self._values(time_log)):
+            getattr(self, name).insert(position, value)
+    
+    def take(self, positions):
+        """Return a new table holding the rows at the given positions"""
+        table = TimeLogTable(self.people, self._person_index)
+        for name, typecode in self.COLUMNS:
+            column = getattr(self, name)
+            setattr(table, name, array(typecode, [column[i] for i in positions]))
+        return table
+    
+    def to_csv_row(self, position):
+        """Convert one row to daily report CSV format"""
+        return self[position].to_csv_row()
+    
+    def __len__(self):
+        return len(self.day)
+    
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            table = TimeLogTable(self.people, self._person_index)
+            for name, _ in self.COLUMNS:
+                setattr(table, name, getattr(self, name)[position])
+            return table
+        emp_id, emp_name = self.people[self.person[position]]
+        return TimeLog.from_epoch(emp_id, emp_name, self.hourly_rate[position], self.day[position],
+                                  self.time_in_ts[position], self.time_out_ts[position],
+                                  self.hours_worked[position], self.etc[position])
+    
+    def __iter__(self):
+        people = self.people
+        for person, *values in zip(*(getattr(self, name) for name in self._column_names())):
+            yield TimeLog.from_epoch(*people[person], *values)
+    
+    def employee_totals(self):
+        """Return {emp_id: {'name', 'total_hours', 'total_etc', 'days_worked'}} over every row"""
+        totals = {}
+        for person, hours, etc in zip(self.person, self.hours_worked, self.etc):
+            emp_id, name = self.people[person]
+            data = totals.get(emp_id)
+            if data is None:
+                data = totals[emp_id] = {'name': name, 'total_hours': 0.0,
+                                         'total_etc': 0.0, 'days_worked': 0}
+            data['total_hours'] += hours
+            data['total_etc'] += etc
+            data['days_worked'] += 1
+        return totals
+    
+    @property
+    def nbytes(self):
+        """Bytes held by the column arrays"""
+        return sum(getattr(self, name).buffer_info()[1] * getattr(self, name).itemsize
+                   for name, _ in self.COLUMNS)
+    
+    def _column_names(self):
+        return [name for name, _ in self.COLUMNS]
+    
+    def _values(self, time_log):
+        """Column values for a time log, interning its employee"""
+        key = (time_log.emp_id, time_log.emp_name)
+        person = self._person_index.get(key)
+        if person is None:
+            person = self._person_index[key] = len(self.people)
+            self.people.append(key)
+        return (person, time_log.hourly_rate, time_log.day, time_log.time_in_ts,
+                time_log.time_out_ts, time_log.hours_worked, time_log.etc)
+
+
+class TimeLogStore:
+    """Closed time logs with a date index and a per-employee secondary index
+    
+    Rows live in a TimeLogTable kept sorted by day number; each employee has
+    an array of row positions. Date-range queries bisect both, costing
+    O(log n + k) instead of a scan over the whole history. Iteration yields
+    logs in date order.
+    """
+    
+    def __init__(self, logs=()):
+        self._table = TimeLogTable()
+        self._by_employee = {}
+        self.extend(logs)
+    
+    def append(self, time_log):
+        """Add a closed time log to both indexes"""
+        day = time_log.day
+        positions = self._by_employee.get(time_log.emp_id)
+        if positions is None:
+            positions = self._by_employee[time_log.emp_id] = array('l')
+        
+        if not len(self._table) or day >= self._table.day[-1]:
+            positions.append(len(self._table))
+            self._table.append(time_log)
+            return
+        
+        # Out-of-order log: insert it and shift every later row position
+        position = bisect_right(self._table.day, day)
+        self._table.insert(position, time_log)
+        for emp_positions in self._by_employee.values():
+            for i in range(bisect_left(emp_positions, position), len(emp_positions)):
+                emp_positions[i] += 1
+        positions.insert(bisect_left(positions, position), position)
+    
+    def extend(self, time_logs):
+        """Add several closed time logs"""
+        for time_log in time_logs:
+            self.append(time_log)
+    
+    def query(self, start=None, end=None, emp_id=None):
+        """Return a TimeLogTable of logs dated between start and end (inclusive),
+        optionally for one employee"""
+        start = None if start is None else date_key(start)
+        end = None if end is None else date_key(end)
+        days = self._table.day
+        
+        if emp_id is None:
+            lo = 0 if start is None else bisect_left(days, start)
+            hi = len(days) if end is None else bisect_right(days, end)
+            return self._table[lo:hi]
+        
+        positions = self._by_employee.get(emp_id, array('l'))
+        lo = 0 if start is None else bisect_left(positions, start, key=days.__getitem__)
+        hi = len(positions) if end is None else bisect_right(positions, end, key=days.__getitem__)
+        return self._table.take(positions[lo:hi])
+    
+    def employee_ids(self):
+        """Return IDs of employees that have at least one log"""
+        return list(self._by_employee)
+    
+    def __len__(self):
+        return len(self._table)
+    
+    def __iter__(self):
+        return iter(self._table)
\ No newline at end of file
@@ -0,0 +1,91 @@
+"""
+Workload Module - Synthetic rosters and time log history for benchmarks
+"""
+import random
+from datetime import date, datetime, time, timedelta
+from credentials import hash_pin
+from models import Employee
+from timelog import TimeLog
+
+
+class ShiftProfile:
+    """How one kind of employee works: shift start window, shift length and days worked"""
+    
+    def __init__(self, start_hours=(7, 9), mean_hours=8.0, sd_hours=1.0,
+                 min_hours=2.0, max_hours=13.0, days_per_week=5.5):
+        self.start_hours = start_hours
+        self.mean_hours = mean_hours
+        self.sd_hours = sd_hours
+        self.min_hours = min_hours
+        self.max_hours = max_hours
+        self.days_per_week = days_per_week
+    
+    def shift(self, rng, day_start):
+        """Random (time in, time out) epoch seconds for a shift on the day starting at day_start"""
+        start = rng.uniform(*self.start_hours) * 3600
+        hours = min(max(rng.gauss(self.mean_hours, self.sd_hours), self.min_hours), self.max_hours)
+        time_in = day_start + int(start) // 60 * 60
+        return time_in, time_in + int(hours * 3600)
+
+
+# A coffee shop's mix: openers, mid shifts, closers, a few overnight and part-timers
+SHIFT_PROFILES = {
+    'opening': ShiftProfile((5.5, 7.0)),
+    'mid': ShiftProfile((10.0, 12.0)),
+    'closing': ShiftProfile((14.0, 16.0), mean_hours=8.5),
+    'night': ShiftProfile((21.0, 23.0), mean_hours=9.0, sd_hours=1.5),
+    'part_time': ShiftProfile((8.0, 17.0), mean_hours=4.5, sd_hours=1.0, days_per_week=3.0),
+}
+SHIFT_MIX = {'opening': 0.25, 'mid': 0.25, 'closing': 0.25, 'night': 0.1, 'part_time': 0.15}
+
+
+def parse_shift_mix(text):
+    """Parse 'opening=0.3,closing=0.7' into a SHIFT_MIX-style dict"""
+    mix = {}
+    for item in text.split(','):
+        name, _, weight = item.partition('=')
+        if name.strip() not in SHIFT_PROFILES:
+            raise ValueError(f"Unknown shift profile: {name.strip()}")
+        mix[name.strip()] = float(weight)
+    return mix
+
+
+def synthetic_roster(count, seed=0, pin="1234", shift_mix=None):
+    """Return (employees, {emp_id: shift profile name}); every employee shares one PIN hash"""
+    rng = random.Random(seed)
+    shift_mix = shift_mix or SHIFT_MIX
+    names, weights = zip(*shift_mix.items())
+    pin_hash = hash_pin(pin)
+    employees = []
+    profiles = {}
+    for i in range(count):
+        emp_id = f"{i + 1:05d}"
+        employees.append(Employee(emp_id, f"Employee {i + 1}", pin_hash,
+                                  float(rng.choice((60, 65, 70, 75, 80, 90, 100, 120)))))
+        profiles[emp_id] = rng.choices(names, weights)[0]
+    return employees, profiles
+
+
+def synthetic_history(employees, profiles, days, end=None, seed=0):
+    """Closed time logs for every employee over the `days` days before `end`, in date order
+    
+    `end` defaults to today, so the history finishes yesterday and the
+    weekly and monthly report windows are full.
+    """
+    rng = random.Random(seed)
+    end = end or date.today()
+    time_logs = []
+    for offset in range(days, 0, -1):
+        day = end - timedelta(days=offset)
+        day_start = int(datetime.combine(day, time.min).timestamp())
+        ordinal = day.toordinal()
+        for employee in employees:
+            profile = SHIFT_PROFILES[profiles[employee.emp_id]]
+            if rng.random() * 7 >= profile.days_per_week:
+                continue
+            time_in, time_out = profile.shift(rng, day_start)
+            hours = (time_out - time_in) / 3600
+            time_logs.append(TimeLog.from_epoch(employee.emp_id, employee.name, employee.hourly_rate,
+                                                ordinal, time_in, time_out, hours,
+                                                hours * employee.hourly_rate))
+    return time_logs
\ No newline at end of file
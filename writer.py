@@ -0,0 +1,52 @@
+"""
+Writer Module - Single thread that performs all report and file output
+"""
+import queue
+import threading
+from concurrent.futures import Future
+
+
+class OutputWriter:
+    """Runs file output jobs one at a time, in submission order, on one thread
+    
+    Report files are not safe to write from several threads at once, so every
+    write goes through this queue instead of being locked at each call site.
+    """
+    
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="output-writer", daemon=True)
+        self._thread.start()
+    
+    def submit(self, func, *args):
+        """Queue func(*args); returns a Future for its result"""
+        future = Future()
+        self._queue.put((future, func, args))
+        return future
+    
+    def run(self, func, *args):
+        """Queue func(*args) and wait for its result"""
+        return self.submit(func, *args).result()
+    
+    def flush(self):
+        """Wait until every job queued so far has finished"""
+        self.run(lambda: None)
+    
+    def close(self):
+        """Finish the queued jobs and stop the writer thread"""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+    
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            future, func, args = job
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(func(*args))
+            except BaseException as e:
+                future.set_exception(e)
\ No newline at end of file